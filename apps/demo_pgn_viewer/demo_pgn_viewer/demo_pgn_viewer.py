@@ -1,5 +1,8 @@
 import reflex as rx
 from reflex_chess_viewer import chess_viewer
+from reflex_chessboard import chessboard
+
+from .frame_meter import frame_meter
 
 
 def index():
@@ -10,5 +13,26 @@ def index():
     )
 
 
+def resize():
+    # Drag the corner: the board follows the container every frame and remounts
+    # once the resize settles; the meter shows what a drag costs per frame.
+    return rx.vstack(
+        rx.heading("Responsive board", size="4"),
+        frame_meter(),
+        rx.box(
+            chessboard(options={"responsive": True}),
+            width="420px",
+            height="420px",
+            min_width="160px",
+            min_height="160px",
+            style={"resize": "both", "overflow": "hidden"},
+            border="1px solid rgba(0,0,0,0.2)",
+        ),
+        padding="16px",
+        spacing="3",
+    )
+
+
 app = rx.App()
 app.add_page(index, route="/")
+app.add_page(resize, route="/resize")
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import reflex as rx
+from reflex.utils.imports import ImportVar
+
+
+class FrameMeter(rx.Component):
+    """Frame-time readout (requestAnimationFrame deltas, refreshed twice a second)."""
+
+    tag = "DemoFrameMeter"
+
+    def add_imports(self):
+        return {
+            "react": [ImportVar(tag="useEffect"), ImportVar(tag="useState")],
+            "@emotion/react": [ImportVar(tag="jsx")],
+        }
+
+    def _get_custom_code(self) -> str:
+        return r"""
+function DemoFrameMeter() {
+  const [text, setText] = useState("measuring…");
+  useEffect(() => {
+    const budget = 1000 / 60;
+    let raf = 0;
+    let last = performance.now();
+    let shownAt = last;
+    let frames = [];
+    const tick = (now) => {
+      frames.push(now - last);
+      last = now;
+      if (now - shownAt >= 500) {
+        const worst = Math.max(...frames);
+        const avg = frames.reduce((a, b) => a + b, 0) / frames.length;
+        const slow = frames.filter((f) => f > budget * 1.5).length;
+        setText(`frame avg ${avg.toFixed(1)} ms · worst ${worst.toFixed(1)} ms · slow ${slow}/${frames.length}`);
+        frames = [];
+        shownAt = now;
+      }
+      raf = requestAnimationFrame(tick);
+    };
+    raf = requestAnimationFrame(tick);
+    return () => cancelAnimationFrame(raf);
+  }, []);
+  return jsx("code", { children: text });
+}
+"""
+
+
+frame_meter = FrameMeter.create
@@ -0,0 +1,60 @@
+"""Benchmark: binary PackedGameTree codec vs json/orjson (size, encode, decode).
+
+    uv run python packages/reflex-chess-model/benchmarks/bench_codec.py
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+from reflex_chess_model import decode_compact, decode_tree, encode_tree
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "reflex-chess-viewer" / "benchmarks"))
+
+from reflex_chess_viewer import GameTreeBuilder  # noqa: E402
+from synthetic import variation_heavy_pgn  # noqa: E402
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+
+def _ms(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    for plies in (120, 240):
+        tree = GameTreeBuilder().build(variation_heavy_pgn(plies=plies))
+        print(f"\n{plies} plies, {len(tree['nodes'])} nodes")
+        print(f"{'codec':<22} {'size KB':>9} {'gzip KB':>9} {'encode ms':>10} {'decode ms':>10}")
+
+        rows = []
+        js = json.dumps(tree, separators=(",", ":")).encode("utf-8")
+        rows.append(("json", js, lambda: json.dumps(tree), lambda: json.loads(js)))  # noqa: B023
+        if orjson is not None:
+            oj = orjson.dumps(tree)
+            rows.append(("orjson", oj, lambda: orjson.dumps(tree), lambda: orjson.loads(oj)))  # noqa: B023
+        bn = encode_tree(tree)
+        rows.append(("binary -> dict", bn, lambda: encode_tree(tree), lambda: decode_tree(bn)))  # noqa: B023
+        rows.append(("binary -> lazy view", bn, lambda: encode_tree(tree), lambda: decode_compact(bn).as_mapping()))  # noqa: B023
+
+        for name, data, enc, dec in rows:
+            print(
+                f"{name:<22} {len(data) / 1024:>9.1f} {len(gzip.compress(data)) / 1024:>9.1f} "
+                f"{_ms(enc):>10.2f} {_ms(dec):>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
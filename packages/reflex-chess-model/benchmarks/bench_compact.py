@@ -0,0 +1,62 @@
+"""Benchmark: retained memory of a PackedGameTree dict vs CompactGameTree.
+
+Needs the dev workspace (python-chess + reflex-chess-viewer for building trees):
+
+    uv run python packages/reflex-chess-model/benchmarks/bench_compact.py
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from reflex_chess_model import CompactGameTree, validate_tree
+
+# Reuse the viewer's synthetic PGN generator.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "reflex-chess-viewer" / "benchmarks"))
+
+from reflex_chess_viewer import GameTreeBuilder  # noqa: E402
+from synthetic import variation_heavy_pgn  # noqa: E402
+
+
+def _retained(fn) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    obj = fn()
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, after - before
+
+
+def main() -> None:
+    print(f"{'plies':>6} {'nodes':>7} {'dict KB':>9} {'compact KB':>11} {'ratio':>6} {'validate dict/view ms':>22}")
+    for plies in (60, 120, 240):
+        tree = GameTreeBuilder().build(variation_heavy_pgn(plies=plies))
+        text = json.dumps(tree)
+
+        as_dict, dict_bytes = _retained(lambda: json.loads(text))  # noqa: B023
+        # Pack from a fresh copy that is dropped afterwards, so shared strings are counted.
+        compact, compact_bytes = _retained(lambda: CompactGameTree.from_dict(json.loads(text)))  # noqa: B023
+        assert isinstance(compact, CompactGameTree)
+        assert compact.to_dict() == tree
+
+        t0 = time.perf_counter()
+        validate_tree(tree)
+        t1 = time.perf_counter()
+        validate_tree(compact.as_mapping())
+        t2 = time.perf_counter()
+
+        print(
+            f"{plies:>6} {len(compact):>7} {dict_bytes / 1024:>9.1f} {compact_bytes / 1024:>11.1f} "
+            f"{dict_bytes / compact_bytes:>5.1f}x {(t1 - t0) * 1000:>10.1f} / {(t2 - t1) * 1000:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
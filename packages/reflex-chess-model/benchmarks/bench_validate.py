@@ -0,0 +1,46 @@
+"""Benchmark: validate_tree cost per level on large trees.
+
+Needs the dev workspace (python-chess + reflex-chess-viewer for building trees):
+
+    uv run python packages/reflex-chess-model/benchmarks/bench_validate.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+from reflex_chess_model import CompactGameTree, validate_tree
+
+# Reuse the viewer's synthetic PGN generator.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "reflex-chess-viewer" / "benchmarks"))
+
+from reflex_chess_viewer import GameTreeBuilder  # noqa: E402
+from synthetic import variation_heavy_pgn  # noqa: E402
+
+LEVELS = ("trusted", "schema", "structural")
+
+
+def _best_ms(fn, repeat: int = 7) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    print(f"{'plies':>6} {'nodes':>7} {'source':>8} " + " ".join(f"{lv + ' ms':>14}" for lv in LEVELS))
+    for plies in (120, 240, 480):
+        tree = GameTreeBuilder().build(variation_heavy_pgn(plies=plies))
+        sources = (("dict", tree), ("view", CompactGameTree.from_dict(tree).as_mapping()))
+        for name, source in sources:
+            times = [_best_ms(lambda lv=lv, src=source: validate_tree(src, level=lv)) for lv in LEVELS]
+            cells = " ".join(f"{t:>14.3f}" for t in times)
+            print(f"{plies:>6} {len(tree['nodes']):>7} {name:>8} {cells}")
+
+
+if __name__ == "__main__":
+    main()
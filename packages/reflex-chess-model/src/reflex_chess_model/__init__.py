@@ -1,11 +1,32 @@
+from .codec import decode_compact, decode_tree, encode_tree
+from .compact import CompactGameTree, CompactTreeView
+from .index import TreeIndex, position_key
 from .types import PackedGameTree
-from .utils import get_node, is_root
+from .utils import (
+    find_nodes_by_position,
+    get_node,
+    is_root,
+    next_mainline,
+    nodes_by_fen,
+    prev_mainline,
+)
 from .validate import validate_tree
 
 __all__ = [
+    "CompactGameTree",
+    "CompactTreeView",
     "PackedGameTree",
+    "TreeIndex",
+    "decode_compact",
+    "decode_tree",
+    "encode_tree",
+    "find_nodes_by_position",
     "get_node",
     "is_root",
+    "next_mainline",
+    "nodes_by_fen",
+    "position_key",
+    "prev_mainline",
     "validate_tree",
 ]
 
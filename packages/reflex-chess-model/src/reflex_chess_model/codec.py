@@ -0,0 +1,260 @@
+"""Binary codec for PackedGameTree v1.
+
+Layout (little-endian), built on `CompactGameTree`:
+
+    magic b"RCGT" | u8 format | u8 flags | u32 counts[5]
+        flags bit 0: no derived indices; bit 1: only those in side `indexKeys`
+    string tables: ids, fens, words (SAN), headers (k, v, ...), misc (initialFen)
+        each: u32 count | u32 lengths[count] | utf-8 bytes
+    i32 parent | u32 ply | i32 first_child | i32 next_sibling | u32 fen_of | i32 san_of
+    u16 move codes (from | to << 6 | promo << 12; 0xFFFF none, 0xFFFE see side data)
+    u32 mainline
+    u32 side_len | JSON side data (sparse: comments/NAGs, non-builder move info,
+                                   non-derived nodeByFen/nextMainline/prevMainline)
+
+FENs and ids are stored once each. `decode_compact` only slices arrays and
+tables; v1 dicts are built on access through `CompactGameTree.as_mapping()`.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Any
+
+from .compact import CompactGameTree, CompactTreeView, _Table
+from .index import INDEX_KEYS
+from .types import PackedGameTree
+
+MAGIC = b"RCGT"
+FORMAT = 1
+
+_HEAD = struct.Struct("<4sBB5I")
+_U32 = struct.Struct("<I")
+
+_FLAG_NO_INDEX = 0x01  # source tree omitted nodeByFen/nextMainline/prevMainline
+_FLAG_SOME_INDEX = 0x02  # source tree had only the indices listed in side["indexKeys"]
+
+_NO_MOVE = 0xFFFF
+_RAW_UCI = 0xFFFE
+_FILES = "abcdefgh"
+_PROMO = "nbrqk"  # code 1..5; 0 = none
+
+
+def _err(msg: str) -> ValueError:
+    return ValueError(f"PackedGameTree binary: {msg}")
+
+
+def _square(name: str) -> int:
+    f = _FILES.find(name[0])
+    r = ord(name[1]) - 49
+    if f < 0 or not 0 <= r < 8:
+        raise ValueError(name)
+    return r * 8 + f
+
+
+def _move_code(uci: str) -> int:
+    """Pack a standard UCI move into 15 bits, or -1 if it is not one."""
+    if len(uci) not in (4, 5):
+        return -1
+    try:
+        frm = _square(uci[0:2])
+        to = _square(uci[2:4])
+    except (ValueError, IndexError):
+        return -1
+    promo = 0
+    if len(uci) == 5:
+        promo = _PROMO.find(uci[4]) + 1
+        if promo == 0:
+            return -1
+    return frm | to << 6 | promo << 12
+
+
+def _move_uci(code: int) -> str:
+    frm = code & 63
+    to = (code >> 6) & 63
+    promo = code >> 12
+    s = f"{_FILES[frm & 7]}{(frm >> 3) + 1}{_FILES[to & 7]}{(to >> 3) + 1}"
+    return s + _PROMO[promo - 1] if promo else s
+
+
+def _le(a: array) -> bytes:
+    if sys.byteorder == "big":
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a.tobytes()
+
+
+def _pack_strings(out: bytearray, items: list[str]) -> None:
+    encoded = [s.encode("utf-8") for s in items]
+    out += _U32.pack(len(encoded))
+    out += _le(array("I", [len(b) for b in encoded]))
+    out += b"".join(encoded)
+
+
+class _Reader:
+    __slots__ = ("buf", "pos")
+
+    def __init__(self, data: bytes) -> None:
+        self.buf = memoryview(data)
+        self.pos = 0
+
+    def take(self, n: int) -> memoryview:
+        end = self.pos + n
+        if end > len(self.buf):
+            raise _err("truncated data")
+        chunk = self.buf[self.pos : end]
+        self.pos = end
+        return chunk
+
+    def u32(self) -> int:
+        return _U32.unpack(self.take(4))[0]
+
+    def array(self, typecode: str, count: int) -> array:
+        a = array(typecode)
+        a.frombytes(self.take(count * a.itemsize))
+        if sys.byteorder == "big":
+            a.byteswap()
+        return a
+
+    def strings(self) -> list[str]:
+        count = self.u32()
+        lengths = self.array("I", count)
+        blob = bytes(self.take(sum(lengths)))
+        # ASCII (ids, FENs, SANs): decode once, byte offsets == char offsets.
+        text: str | bytes = blob.decode("ascii") if blob.isascii() else blob
+        out: list[str] = []
+        pos = 0
+        for n in lengths:
+            chunk = text[pos : pos + n]
+            out.append(chunk if isinstance(chunk, str) else chunk.decode("utf-8"))
+            pos += n
+        return out
+
+
+def encode_tree(tree: Mapping[str, Any] | CompactGameTree) -> bytes:
+    """Encode a v1 tree (dict, Mapping view or CompactGameTree) to bytes."""
+    if isinstance(tree, CompactTreeView):
+        tree = tree.compact  # keep its `index_keys` (a view lists every key)
+    t = tree if isinstance(tree, CompactGameTree) else CompactGameTree.from_dict(tree)
+    n = len(t.ids)
+
+    codes = array("H", [_NO_MOVE]) * n
+    raw_uci: list[list[Any]] = []
+    for i, u in enumerate(t.uci_of):
+        if u < 0:
+            continue
+        uci = t.words[u]
+        code = _move_code(uci)
+        if code >= 0 and _move_uci(code) == uci:
+            codes[i] = code
+        else:
+            codes[i] = _RAW_UCI
+            raw_uci.append([i, uci])
+
+    # Only SANs go to the words table: UCIs travel as move codes.
+    sans = _Table()
+    san_of = array("i", (sans.add(t.words[s]) if s >= 0 else -1 for s in t.san_of))
+
+    flags = 0
+    if not t.index_keys:
+        flags = _FLAG_NO_INDEX
+    elif not t.has_index:
+        flags = _FLAG_SOME_INDEX
+    side: dict[str, Any] = {}
+    if t._extras:
+        side["extras"] = [[i, *v] for i, v in t._extras.items()]
+    if t._raw_moves:
+        side["raw"] = [[i, mi] for i, mi in t._raw_moves.items()]
+    if raw_uci:
+        side["uci"] = raw_uci
+    for key, value in (
+        ("nodeByFen", t._node_by_fen),
+        ("nextMainline", t._next_mainline),
+        ("prevMainline", t._prev_mainline),
+    ):
+        if value is not None:
+            side[key] = value
+    if flags & _FLAG_SOME_INDEX:
+        side["indexKeys"] = list(t.index_keys)
+    side_bytes = json.dumps(side, ensure_ascii=False, separators=(",", ":")).encode("utf-8") if side else b""
+
+    headers: list[str] = []
+    for k, v in t.headers.items():
+        headers += (k, v)
+
+    out = bytearray(_HEAD.pack(MAGIC, FORMAT, flags, n, len(t.fens), len(sans.items), len(t.mainline), t.root))
+    _pack_strings(out, t.ids)
+    _pack_strings(out, t.fens)
+    _pack_strings(out, sans.items)
+    _pack_strings(out, headers)
+    _pack_strings(out, [t.initial_fen])
+    for a in (t.parent, t.ply, t.first_child, t.next_sibling, t.fen_of, san_of, codes, t.mainline):
+        out += _le(a)
+    out += _U32.pack(len(side_bytes))
+    out += side_bytes
+    return bytes(out)
+
+
+def decode_compact(data: bytes) -> CompactGameTree:
+    """Decode bytes into a `CompactGameTree` (no per-node dicts are built)."""
+    r = _Reader(data)
+    magic, fmt, flags, n, n_fens, n_words, n_mainline, root = _HEAD.unpack(r.take(_HEAD.size))
+    if magic != MAGIC:
+        raise _err("bad magic")
+    if fmt != FORMAT:
+        raise _err(f"unsupported format {fmt}")
+
+    t = CompactGameTree()
+    t.ids = [sys.intern(s) for s in r.strings()]
+    t.fens = r.strings()
+    t.words = r.strings()
+    headers = r.strings()
+    t.headers = dict(zip(headers[0::2], headers[1::2], strict=True))
+    (t.initial_fen,) = r.strings()
+    if (len(t.ids), len(t.fens), len(t.words)) != (n, n_fens, n_words):
+        raise _err("table sizes do not match the header")
+    t.root = root
+    t.parent = r.array("i", n)
+    t.ply = r.array("I", n)
+    t.first_child = r.array("i", n)
+    t.next_sibling = r.array("i", n)
+    t.fen_of = r.array("I", n)
+    t.san_of = r.array("i", n)
+    codes = r.array("H", n)
+    t.mainline = r.array("I", n_mainline)
+    side_len = r.u32()
+    side: dict[str, Any] = json.loads(bytes(r.take(side_len))) if side_len else {}
+
+    raw_uci = {int(i): uci for i, uci in side.get("uci", ())}
+    uci_slot: dict[str, int] = {}
+    uci_of = array("i", [-1]) * n
+    for i, code in enumerate(codes):
+        if code == _NO_MOVE:
+            continue
+        uci = raw_uci[i] if code == _RAW_UCI else _move_uci(code)
+        slot = uci_slot.get(uci)
+        if slot is None:
+            slot = uci_slot[uci] = len(t.words)
+            t.words.append(uci)
+        uci_of[i] = slot
+    t.uci_of = uci_of
+
+    t._extras = {int(i): (nags, pre, post) for i, nags, pre, post in side.get("extras", ())}
+    t._raw_moves = {int(i): mi for i, mi in side.get("raw", ())}
+    if flags & _FLAG_NO_INDEX:
+        t.index_keys = ()
+    elif flags & _FLAG_SOME_INDEX:
+        t.index_keys = tuple(k for k in INDEX_KEYS if k in side.get("indexKeys", ()))
+    t._node_by_fen = side.get("nodeByFen")
+    t._next_mainline = side.get("nextMainline")
+    t._prev_mainline = side.get("prevMainline")
+    return t
+
+
+def decode_tree(data: bytes) -> PackedGameTree:
+    """Decode bytes back into the v1 dict."""
+    return decode_compact(data).to_dict()
@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from .index import INDEX_KEYS
+from .types import PackedGameTree
+
+_TREE_KEYS = (
+    "version",
+    "headers",
+    "initialFen",
+    "rootId",
+    "nodes",
+    "moveByNode",
+    "nodeByFen",
+    "mainline",
+    "nextMainline",
+    "prevMainline",
+)
+_NODE_KEYS = ("id", "ply", "fen", "parent", "children")
+_MOVE_KEYS = ("san", "nags", "preComments", "postComments", "annotations")
+_MOVE_KEYS_UCI = (*_MOVE_KEYS, "uci")
+
+
+def _err(prefix: str, msg: str) -> ValueError:
+    return ValueError(f"{prefix}: {msg}")
+
+
+class _Table:
+    """Interned string table: each distinct string is stored once."""
+
+    __slots__ = ("items", "_slot")
+
+    def __init__(self) -> None:
+        self.items: list[str] = []
+        self._slot: dict[str, int] = {}
+
+    def add(self, s: str) -> int:
+        i = self._slot.get(s)
+        if i is None:
+            i = len(self.items)
+            self._slot[s] = i
+            self.items.append(sys.intern(s))
+        return i
+
+    def freeze(self) -> list[str]:
+        self._slot = {}
+        return self.items
+
+
+class CompactGameTree:
+    """Array-backed PackedGameTree v1.
+
+    Nodes are integer indices (in `nodes` insertion order) into parallel arrays
+    (`parent`, `ply`, `first_child`, `next_sibling`, ...). FEN and move strings
+    live in interned tables. Converts losslessly from/to the v1 dict and offers a
+    read-only Mapping view (`as_mapping()`) for dict-based consumers such as
+    `validate_tree` and `build_notation_lines`.
+
+    Move info that differs from the builder's shape (extra keys, non-empty
+    annotations) is kept verbatim in a sparse side table.
+    """
+
+    __slots__ = (
+        "headers",
+        "initial_fen",
+        "root",
+        "ids",
+        "parent",
+        "ply",
+        "first_child",
+        "next_sibling",
+        "fens",
+        "fen_of",
+        "words",
+        "san_of",
+        "uci_of",
+        "mainline",
+        "index_keys",
+        "_extras",
+        "_raw_moves",
+        "_node_by_fen",
+        "_next_mainline",
+        "_prev_mainline",
+        "_index",
+    )
+
+    def __init__(self) -> None:
+        self.headers: dict[str, str] = {}
+        self.initial_fen = ""
+        self.root = 0
+        self.ids: list[str] = []
+        self.parent = array("i")  # -1 for the root
+        self.ply = array("I")
+        self.first_child = array("i")  # -1: leaf
+        self.next_sibling = array("i")  # -1: last child
+        self.fens: list[str] = []
+        self.fen_of = array("I")
+        self.words: list[str] = []  # SAN/UCI table
+        self.san_of = array("i")  # -1: no MoveInfo (root)
+        self.uci_of = array("i")  # -1: no uci
+        self.mainline = array("I")
+        # Which of nodeByFen/nextMainline/prevMainline `to_dict` emits (the view always derives them).
+        self.index_keys: tuple[str, ...] = INDEX_KEYS
+        # node index -> (nags, preComments, postComments) when any is non-empty
+        self._extras: dict[int, tuple[list[int], list[str], list[str]]] = {}
+        # node index -> MoveInfo dict kept verbatim (non-builder shape)
+        self._raw_moves: dict[int, dict[str, Any]] = {}
+        # Stored only when they differ from what the arrays imply.
+        self._node_by_fen: dict[str, list[str]] | None = None
+        self._next_mainline: dict[str, str | None] | None = None
+        self._prev_mainline: dict[str, str | None] | None = None
+        self._index: dict[str, int] | None = None
+
+    # --- conversion -----------------------------------------------------------
+
+    @classmethod
+    def from_dict(cls, tree: Mapping[str, Any]) -> CompactGameTree:
+        """Pack a structurally consistent v1 tree (children lists agree with parents)."""
+        t = cls()
+        t.headers = dict(tree["headers"])
+        t.initial_fen = tree["initialFen"]
+        nodes: Mapping[str, Mapping[str, Any]] = tree["nodes"]
+        moves: Mapping[str, Mapping[str, Any]] = tree["moveByNode"]
+
+        index = {nid: i for i, nid in enumerate(nodes)}
+        n = len(index)
+        t.ids = [sys.intern(nid) for nid in nodes]
+        t.parent = array("i", [-1]) * n
+        t.first_child = array("i", [-1]) * n
+        t.next_sibling = array("i", [-1]) * n
+        t.san_of = array("i", [-1]) * n
+        t.uci_of = array("i", [-1]) * n
+        fens = _Table()
+        words = _Table()
+        ply = array("I")
+        fen_of = array("I")
+        linked = bytearray(n)
+        root = index.get(tree["rootId"], -1)
+        if root < 0:
+            raise _err("PackedGameTree.rootId", f"{tree['rootId']!r} is not present in nodes")
+
+        for i, (nid, node) in enumerate(nodes.items()):
+            if tuple(node) != _NODE_KEYS or node["id"] != nid:
+                raise _err(f"Node[{nid}]", "not representable (unexpected keys or id)")
+            ply.append(node["ply"])
+            fen_of.append(fens.add(node["fen"]))
+            parent = node["parent"]
+            if parent is not None:
+                p = index.get(parent)
+                if p is None:
+                    raise _err(f"Node[{nid}].parent", f"parent {parent!r} missing from nodes")
+                t.parent[i] = p
+            prev = -1
+            for cid in node["children"]:
+                c = index.get(cid)
+                if c is None:
+                    raise _err(f"Node[{nid}].children", f"child {cid!r} missing from nodes")
+                # A node linked twice (repeated, or under two parents) or the root
+                # linked as a child would make the sibling chain / walk cycle.
+                if linked[c] or c == root:
+                    raise _err(f"Node[{nid}].children", f"child {cid!r} listed twice or is the root")
+                linked[c] = 1
+                if prev < 0:
+                    t.first_child[i] = c
+                else:
+                    t.next_sibling[prev] = c
+                prev = c
+
+        for i, nid in enumerate(t.ids):
+            p = t.parent[i]
+            if p >= 0 and i not in _child_indices(t, p):
+                raise _err(f"Node[{nid}].parent", "not listed among the parent's children")
+
+        for nid, mi in moves.items():
+            i = index.get(nid)
+            if i is None:
+                raise _err(f"PackedGameTree.moveByNode[{nid}]", "node missing from nodes")
+            keys = tuple(mi)
+            canonical = (
+                keys in (_MOVE_KEYS, _MOVE_KEYS_UCI)
+                and isinstance(mi["san"], str)
+                and mi["annotations"] == {"shapes": []}
+                and isinstance(mi.get("uci", ""), str)
+            )
+            if not canonical:
+                t._raw_moves[i] = _copy_json(mi)
+                continue
+            t.san_of[i] = words.add(mi["san"])
+            if "uci" in mi:
+                t.uci_of[i] = words.add(mi["uci"])
+            if mi["nags"] or mi["preComments"] or mi["postComments"]:
+                t._extras[i] = (list(mi["nags"]), list(mi["preComments"]), list(mi["postComments"]))
+
+        t.ply = ply
+        t.fen_of = fen_of
+        t.fens = fens.freeze()
+        t.words = words.freeze()
+        t.root = root
+        t.mainline = array("I", (index[nid] for nid in tree["mainline"]))
+
+        t.index_keys = tuple(k for k in INDEX_KEYS if k in tree)
+        view = t.as_mapping()
+        node_by_fen = tree.get("nodeByFen")
+        if node_by_fen is not None and node_by_fen != _derived_node_by_fen(t):
+            t._node_by_fen = _copy_json(node_by_fen)
+        next_ml = tree.get("nextMainline")
+        if next_ml is not None and next_ml != dict(view["nextMainline"]):
+            t._next_mainline = dict(next_ml)
+        prev_ml = tree.get("prevMainline")
+        if prev_ml is not None and prev_ml != dict(view["prevMainline"]):
+            t._prev_mainline = dict(prev_ml)
+        return t
+
+    def to_dict(self) -> PackedGameTree:
+        """Materialize the v1 dict (builder key order); derived indices only those in `index_keys`."""
+        view = self.as_mapping()
+        out: dict[str, Any] = {
+            "version": 1,
+            "headers": dict(self.headers),
+            "initialFen": self.initial_fen,
+            "rootId": self.ids[self.root],
+            "nodes": {nid: self.node_dict(i) for i, nid in enumerate(self.ids)},
+            "moveByNode": {self.ids[i]: mi for i, mi in self._iter_moves()},
+        }
+        if "nodeByFen" in self.index_keys:
+            out["nodeByFen"] = {k: list(v) for k, v in view["nodeByFen"].items()}
+        out["mainline"] = view["mainline"]
+        for key in ("nextMainline", "prevMainline"):
+            if key in self.index_keys:
+                out[key] = dict(view[key])
+        return out  # type: ignore[return-value]
+
+    def as_mapping(self) -> CompactTreeView:
+        return CompactTreeView(self)
+
+    @property
+    def has_index(self) -> bool:
+        """Whether `to_dict` emits all three derived indices."""
+        return self.index_keys == INDEX_KEYS
+
+    # --- accessors ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index_of(self, node_id: str) -> int:
+        if self._index is None:
+            self._index = {nid: i for i, nid in enumerate(self.ids)}
+        return self._index[node_id]
+
+    def children(self, i: int) -> list[int]:
+        return _child_indices(self, i)
+
+    def node_dict(self, i: int) -> dict[str, Any]:
+        p = self.parent[i]
+        return {
+            "id": self.ids[i],
+            "ply": self.ply[i],
+            "fen": self.fens[self.fen_of[i]],
+            "parent": None if p < 0 else self.ids[p],
+            "children": [self.ids[c] for c in _child_indices(self, i)],
+        }
+
+    def move_dict(self, i: int) -> dict[str, Any] | None:
+        raw = self._raw_moves.get(i)
+        if raw is not None:
+            return _copy_json(raw)
+        s = self.san_of[i]
+        if s < 0:
+            return None
+        nags, pre, post = self._extras.get(i, ((), (), ()))
+        mi: dict[str, Any] = {
+            "san": self.words[s],
+            "nags": list(nags),
+            "preComments": list(pre),
+            "postComments": list(post),
+            "annotations": {"shapes": []},
+        }
+        u = self.uci_of[i]
+        if u >= 0:
+            mi["uci"] = self.words[u]
+        return mi
+
+    def _has_move(self, i: int) -> bool:
+        return self.san_of[i] >= 0 or i in self._raw_moves
+
+    def _iter_moves(self) -> Iterator[tuple[int, dict[str, Any]]]:
+        for i in range(len(self.ids)):
+            mi = self.move_dict(i)
+            if mi is not None:
+                yield i, mi
+
+
+def _child_indices(t: CompactGameTree, i: int) -> list[int]:
+    out: list[int] = []
+    c = t.first_child[i]
+    while c >= 0:
+        out.append(c)
+        c = t.next_sibling[c]
+    return out
+
+
+def _copy_json(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {k: _copy_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(v) for v in value]
+    return value
+
+
+def _derived_node_by_fen(t: CompactGameTree) -> dict[str, list[str]]:
+    out: dict[str, list[str]] = {}
+    for i, f in enumerate(t.fen_of):
+        out.setdefault(t.fens[f], []).append(t.ids[i])
+    return out
+
+
+class _NodesView(Mapping[str, dict[str, Any]]):
+    __slots__ = ("_t",)
+
+    def __init__(self, t: CompactGameTree) -> None:
+        self._t = t
+
+    def __getitem__(self, node_id: str) -> dict[str, Any]:
+        return self._t.node_dict(self._t.index_of(node_id))
+
+    def __contains__(self, node_id: object) -> bool:
+        try:
+            self._t.index_of(node_id)  # type: ignore[arg-type]
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._t.ids)
+
+    def __len__(self) -> int:
+        return len(self._t.ids)
+
+
+class _MovesView(Mapping[str, dict[str, Any]]):
+    __slots__ = ("_t",)
+
+    def __init__(self, t: CompactGameTree) -> None:
+        self._t = t
+
+    def __getitem__(self, node_id: str) -> dict[str, Any]:
+        mi = self._t.move_dict(self._t.index_of(node_id))
+        if mi is None:
+            raise KeyError(node_id)
+        return mi
+
+    def __contains__(self, node_id: object) -> bool:
+        try:
+            return self._t._has_move(self._t.index_of(node_id))  # type: ignore[arg-type]
+        except (KeyError, TypeError):
+            return False
+
+    def __iter__(self) -> Iterator[str]:
+        t = self._t
+        return (t.ids[i] for i in range(len(t.ids)) if t._has_move(i))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class _MainlineStepView(Mapping[str, "str | None"]):
+    __slots__ = ("_t", "_step", "_pos")
+
+    def __init__(self, t: CompactGameTree, step: int) -> None:
+        self._t = t
+        self._step = step
+        self._pos: dict[int, int] | None = None
+
+    def _positions(self) -> dict[int, int]:
+        if self._pos is None:
+            self._pos = {n: k for k, n in enumerate(self._t.mainline)}
+        return self._pos
+
+    def __getitem__(self, node_id: str) -> str | None:
+        t = self._t
+        k = self._positions()[t.index_of(node_id)]
+        j = k + self._step
+        return t.ids[t.mainline[j]] if 0 <= j < len(t.mainline) else None
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._t.ids[n] for n in self._t.mainline)
+
+    def __len__(self) -> int:
+        return len(self._t.mainline)
+
+
+class CompactTreeView(Mapping[str, Any]):
+    """Read-only v1-shaped view over a `CompactGameTree` (values built on access)."""
+
+    __slots__ = ("_t",)
+
+    def __init__(self, t: CompactGameTree) -> None:
+        self._t = t
+
+    @property
+    def compact(self) -> CompactGameTree:
+        return self._t
+
+    def __getitem__(self, key: str) -> Any:
+        t = self._t
+        if key == "version":
+            return 1
+        if key == "headers":
+            return t.headers
+        if key == "initialFen":
+            return t.initial_fen
+        if key == "rootId":
+            return t.ids[t.root]
+        if key == "nodes":
+            return _NodesView(t)
+        if key == "moveByNode":
+            return _MovesView(t)
+        if key == "nodeByFen":
+            return t._node_by_fen if t._node_by_fen is not None else _derived_node_by_fen(t)
+        if key == "mainline":
+            return [t.ids[n] for n in t.mainline]
+        if key == "nextMainline":
+            return t._next_mainline if t._next_mainline is not None else _MainlineStepView(t, 1)
+        if key == "prevMainline":
+            return t._prev_mainline if t._prev_mainline is not None else _MainlineStepView(t, -1)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_TREE_KEYS)
+
+    def __len__(self) -> int:
+        return len(_TREE_KEYS)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+INDEX_KEYS = ("nodeByFen", "nextMainline", "prevMainline")
+
+
+def position_key(fen: str) -> str:
+    """EPD part of a FEN (placement, side, castling, en passant).
+
+    Move counters are dropped, so transpositions reached at different move
+    numbers share a key. Accepts an EPD as well (extra fields are ignored).
+    """
+    return " ".join(fen.split()[:4])
+
+
+class TreeIndex:
+    """Derived lookup maps of a PackedGameTree, computed on first access and memoized.
+
+    `nextMainline`, `prevMainline` and `nodeByFen` are optional in a tree: when
+    the tree carries them they are used as is, otherwise they are derived from
+    `mainline` / `nodes`. The tree must not be mutated while the index is in use.
+    """
+
+    __slots__ = ("tree", "_next", "_prev", "_by_fen", "_by_position")
+
+    def __init__(self, tree: Mapping[str, Any]) -> None:
+        self.tree = tree
+        self._next: Mapping[str, str | None] | None = None
+        self._prev: Mapping[str, str | None] | None = None
+        self._by_fen: Mapping[str, list[str]] | None = None
+        self._by_position: dict[str, list[str]] | None = None
+
+    @property
+    def next_mainline(self) -> Mapping[str, str | None]:
+        if self._next is None:
+            stored = self.tree.get("nextMainline")
+            self._next = stored if stored is not None else _mainline_steps(self.tree)[0]
+        return self._next
+
+    @property
+    def prev_mainline(self) -> Mapping[str, str | None]:
+        if self._prev is None:
+            stored = self.tree.get("prevMainline")
+            self._prev = stored if stored is not None else _mainline_steps(self.tree)[1]
+        return self._prev
+
+    @property
+    def node_by_fen(self) -> Mapping[str, list[str]]:
+        if self._by_fen is None:
+            stored = self.tree.get("nodeByFen")
+            self._by_fen = stored if stored is not None else _node_by_fen(self.tree)
+        return self._by_fen
+
+    @property
+    def node_by_position(self) -> Mapping[str, list[str]]:
+        """`position_key` -> node ids (transpositions, move counters ignored)."""
+        if self._by_position is None:
+            out: dict[str, list[str]] = {}
+            for nid, node in (self.tree.get("nodes") or {}).items():
+                out.setdefault(position_key(node["fen"]), []).append(nid)
+            self._by_position = out
+        return self._by_position
+
+    def next(self, node_id: str) -> str | None:
+        return self.next_mainline.get(node_id)
+
+    def prev(self, node_id: str) -> str | None:
+        return self.prev_mainline.get(node_id)
+
+    def nodes_at(self, fen: str) -> list[str]:
+        return list(self.node_by_fen.get(fen, ()))
+
+    def nodes_at_position(self, fen_or_epd: str) -> list[str]:
+        return list(self.node_by_position.get(position_key(fen_or_epd), ()))
+
+
+def _mainline_steps(tree: Mapping[str, Any]) -> tuple[dict[str, str | None], dict[str, str | None]]:
+    mainline: list[str] = list(tree.get("mainline") or ())
+    nxt: dict[str, str | None] = {}
+    prev: dict[str, str | None] = {}
+    for i, nid in enumerate(mainline):
+        prev[nid] = mainline[i - 1] if i > 0 else None
+        nxt[nid] = mainline[i + 1] if i + 1 < len(mainline) else None
+    return nxt, prev
+
+
+def _node_by_fen(tree: Mapping[str, Any]) -> dict[str, list[str]]:
+    out: dict[str, list[str]] = {}
+    for nid, node in (tree.get("nodes") or {}).items():
+        out.setdefault(node["fen"], []).append(nid)
+    return out
@@ -75,9 +75,10 @@ class PackedGameTree(TypedDict):
     rootId: str
     nodes: dict[str, Node]
     moveByNode: dict[str, MoveInfo]  # root omitted
-    nodeByFen: dict[str, list[str]]
     mainline: list[str]
-    nextMainline: dict[str, str | None]
-    prevMainline: dict[str, str | None]
+    # Derived indices, optional (see `TreeIndex` / `reflex_chess_model.utils` accessors).
+    nodeByFen: NotRequired[dict[str, list[str]]]
+    nextMainline: NotRequired[dict[str, str | None]]
+    prevMainline: NotRequired[dict[str, str | None]]
 
 
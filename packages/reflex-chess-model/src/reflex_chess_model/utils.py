@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
+from .index import TreeIndex, position_key
 from .types import Node, PackedGameTree
 
 
@@ -22,3 +24,55 @@ def get_header(tree: PackedGameTree, key: str, default: str | None = None) -> st
     return None if value is None else str(value)
 
 
+# Accessors for the optional derived maps (nextMainline / prevMainline / nodeByFen).
+# They take a tree or a `TreeIndex`; on a tree without the stored map only the
+# requested entry is computed. Hold a `TreeIndex` for repeated lookups.
+
+
+def next_mainline(tree: Mapping[str, Any] | TreeIndex, node_id: str) -> str | None:
+    if isinstance(tree, TreeIndex):
+        return tree.next(node_id)
+    stored = tree.get("nextMainline")
+    if stored is not None:
+        return stored.get(node_id)
+    return _mainline_step(tree, node_id, 1)
+
+
+def prev_mainline(tree: Mapping[str, Any] | TreeIndex, node_id: str) -> str | None:
+    if isinstance(tree, TreeIndex):
+        return tree.prev(node_id)
+    stored = tree.get("prevMainline")
+    if stored is not None:
+        return stored.get(node_id)
+    return _mainline_step(tree, node_id, -1)
+
+
+def nodes_by_fen(tree: Mapping[str, Any] | TreeIndex, fen: str) -> list[str]:
+    if isinstance(tree, TreeIndex):
+        return tree.nodes_at(fen)
+    stored = tree.get("nodeByFen")
+    if stored is not None:
+        return list(stored.get(fen, ()))
+    return [nid for nid, node in (tree.get("nodes") or {}).items() if node["fen"] == fen]
+
+
+def find_nodes_by_position(tree: Mapping[str, Any] | TreeIndex, board_or_fen: Any) -> list[str]:
+    """Node ids whose position matches, ignoring halfmove/fullmove counters.
+
+    `board_or_fen` is a FEN/EPD string or anything with an `.epd()` method
+    (e.g. `chess.Board`).
+    """
+    fen = board_or_fen if isinstance(board_or_fen, str) else board_or_fen.epd()
+    if isinstance(tree, TreeIndex):
+        return tree.nodes_at_position(fen)
+    key = position_key(fen)
+    return [nid for nid, node in (tree.get("nodes") or {}).items() if position_key(node["fen"]) == key]
+
+
+def _mainline_step(tree: Mapping[str, Any], node_id: str, step: int) -> str | None:
+    mainline = tree.get("mainline") or []
+    try:
+        j = mainline.index(node_id) + step
+    except ValueError:
+        return None
+    return mainline[j] if 0 <= j < len(mainline) else None
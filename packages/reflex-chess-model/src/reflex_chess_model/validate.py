@@ -1,20 +1,33 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
-from typing import Any
+from typing import Any, Literal
 
 from .utils import is_root
 
+ValidationLevel = Literal["trusted", "schema", "structural"]
+_LEVELS = ("trusted", "schema", "structural")
+_REQUIRED_KEYS = ("headers", "initialFen", "rootId", "nodes", "moveByNode", "mainline")
+
 
 def _err(prefix: str, msg: str) -> ValueError:
     return ValueError(f"{prefix}: {msg}")
 
 
-def validate_tree(tree: Mapping[str, Any]) -> None:
+def validate_tree(tree: Mapping[str, Any], *, level: ValidationLevel = "schema") -> None:
     """Soft validation for PackedGameTree v1.
 
-    Raises ValueError with a human-readable message on schema/invariant violations.
+    Levels:
+    - `trusted`: envelope only (version, required keys, root present) — for trees
+      our own builder just produced.
+    - `schema` (default): field types and per-node invariants, one pass over the nodes.
+    - `structural`: `schema` + child -> parent agreement, reachability from the root
+      and acyclicity (one O(n) traversal). Use for trees from untrusted sources.
+
+    Raises ValueError with a human-readable message on the first violation.
     """
+    if level not in _LEVELS:
+        raise ValueError(f"validate_tree.level: expected one of {_LEVELS}, got {level!r}")
     if not isinstance(tree, Mapping):
         raise _err("PackedGameTree", "expected a mapping/dict")
 
@@ -22,7 +35,7 @@ def validate_tree(tree: Mapping[str, Any]) -> None:
     if version != 1:
         raise _err("PackedGameTree.version", f"expected 1, got {version!r}")
 
-    for k in ("headers", "initialFen", "rootId", "nodes", "moveByNode", "nodeByFen", "mainline", "nextMainline", "prevMainline"):
+    for k in _REQUIRED_KEYS:
         if k not in tree:
             raise _err("PackedGameTree", f"missing required key {k!r}")
 
@@ -37,6 +50,9 @@ def validate_tree(tree: Mapping[str, Any]) -> None:
     if root_id not in nodes:
         raise _err("PackedGameTree.nodes", f"rootId {root_id!r} is not present in nodes")
 
+    if level == "trusted":
+        return
+
     move_by_node = tree["moveByNode"]
     if not isinstance(move_by_node, Mapping):
         raise _err("PackedGameTree.moveByNode", "expected mapping node_id -> MoveInfo")
@@ -49,57 +65,93 @@ def validate_tree(tree: Mapping[str, Any]) -> None:
     if mainline[0] != root_id:
         raise _err("PackedGameTree.mainline", "expected mainline[0] == rootId")
 
-    def check_node(node_id: str, node: Any) -> None:
+    structural = level == "structural"
+    for nid, node in nodes.items():
+        if not isinstance(nid, str) or not nid:
+            raise _err("PackedGameTree.nodes", "node_id keys must be non-empty strings")
         if not isinstance(node, Mapping):
-            raise _err(f"Node[{node_id}]", "expected mapping")
-        if node.get("id") != node_id:
-            raise _err(f"Node[{node_id}].id", f"expected {node_id!r}")
+            raise _err(f"Node[{nid}]", "expected mapping")
+        if node.get("id") != nid:
+            raise _err(f"Node[{nid}].id", f"expected {nid!r}")
         ply = node.get("ply")
-        if not isinstance(ply, int) or ply < 0:
-            raise _err(f"Node[{node_id}].ply", "expected int >= 0")
+        if type(ply) is not int or ply < 0:
+            raise _err(f"Node[{nid}].ply", "expected int >= 0")
         fen = node.get("fen")
-        if not isinstance(fen, str) or not fen:
-            raise _err(f"Node[{node_id}].fen", "expected non-empty str")
-        parent = node.get("parent")
-        if parent is not None and not isinstance(parent, str):
-            raise _err(f"Node[{node_id}].parent", "expected str|null")
+        if type(fen) is not str or not fen:
+            raise _err(f"Node[{nid}].fen", "expected non-empty str")
         children = node.get("children")
         if not isinstance(children, list):
-            raise _err(f"Node[{node_id}].children", "expected list[str]")
+            raise _err(f"Node[{nid}].children", "expected list[str]")
         for c in children:
             if not isinstance(c, str) or not c:
-                raise _err(f"Node[{node_id}].children", "expected list of non-empty str node_ids")
-            if c not in nodes:
-                raise _err(f"Node[{node_id}].children", f"child {c!r} missing from nodes")
+                raise _err(f"Node[{nid}].children", "expected list of non-empty str node_ids")
+            child = nodes.get(c)
+            if child is None:
+                raise _err(f"Node[{nid}].children", f"child {c!r} missing from nodes")
+            if structural and isinstance(child, Mapping) and child.get("parent") != nid:
+                raise _err(f"Node[{nid}].children", f"child {c!r} has parent {child.get('parent')!r}")
 
-        if node_id == root_id or is_root(node_id):
+        parent = node.get("parent")
+        if nid == root_id or is_root(nid):
             if parent is not None:
-                raise _err(f"Node[{node_id}].parent", "root parent must be null")
+                raise _err(f"Node[{nid}].parent", "root parent must be null")
             if ply != 0:
-                raise _err(f"Node[{node_id}].ply", "root ply must be 0")
+                raise _err(f"Node[{nid}].ply", "root ply must be 0")
         else:
             if parent is None:
-                raise _err(f"Node[{node_id}].parent", "non-root parent must be set")
+                raise _err(f"Node[{nid}].parent", "non-root parent must be set")
+            if not isinstance(parent, str):
+                raise _err(f"Node[{nid}].parent", "expected str|null")
             if parent not in nodes:
-                raise _err(f"Node[{node_id}].parent", f"parent {parent!r} missing from nodes")
-            if node_id not in move_by_node:
-                raise _err(f"PackedGameTree.moveByNode[{node_id}]", "missing MoveInfo for non-root node")
-
-    for nid, n in nodes.items():
-        if not isinstance(nid, str) or not nid:
-            raise _err("PackedGameTree.nodes", "node_id keys must be non-empty strings")
-        check_node(nid, n)
-
-    node_by_fen = tree["nodeByFen"]
-    if not isinstance(node_by_fen, Mapping):
-        raise _err("PackedGameTree.nodeByFen", "expected mapping fen -> list[node_id]")
-    for fen, ids in node_by_fen.items():
-        if not isinstance(fen, str) or not fen:
-            raise _err("PackedGameTree.nodeByFen", "fen keys must be non-empty strings")
-        if not isinstance(ids, list):
-            raise _err(f"PackedGameTree.nodeByFen[{fen!r}]", "expected list[node_id]")
-        for nid in ids:
-            if nid not in nodes:
-                raise _err(f"PackedGameTree.nodeByFen[{fen!r}]", f"node_id {nid!r} missing from nodes")
-
-
+                raise _err(f"Node[{nid}].parent", f"parent {parent!r} missing from nodes")
+            if nid not in move_by_node:
+                raise _err(f"PackedGameTree.moveByNode[{nid}]", "missing MoveInfo for non-root node")
+
+    # Derived indices are optional; validate them only when present.
+    for k in ("nextMainline", "prevMainline"):
+        if k in tree and not isinstance(tree[k], Mapping):
+            raise _err(f"PackedGameTree.{k}", "expected mapping node_id -> node_id|null")
+
+    if "nodeByFen" in tree:
+        node_by_fen = tree["nodeByFen"]
+        if not isinstance(node_by_fen, Mapping):
+            raise _err("PackedGameTree.nodeByFen", "expected mapping fen -> list[node_id]")
+        for fen, ids in node_by_fen.items():
+            if not isinstance(fen, str) or not fen:
+                raise _err("PackedGameTree.nodeByFen", "fen keys must be non-empty strings")
+            if not isinstance(ids, list):
+                raise _err(f"PackedGameTree.nodeByFen[{fen!r}]", "expected list[node_id]")
+            for nid in ids:
+                if nid not in nodes:
+                    raise _err(f"PackedGameTree.nodeByFen[{fen!r}]", f"node_id {nid!r} missing from nodes")
+
+    if structural:
+        _check_structure(nodes, root_id, mainline)
+
+
+def _check_structure(nodes: Mapping[str, Any], root_id: str, mainline: list[Any]) -> None:
+    """Every node reachable from the root exactly once (no cycles, no orphans).
+
+    Children already agree with their parents (checked in the node pass), so a
+    node seen twice means a duplicate child entry or a cycle.
+    """
+    seen = {root_id}
+    stack = [root_id]
+    while stack:
+        nid = stack.pop()
+        for c in nodes[nid]["children"]:
+            if c in seen:
+                raise _err(f"Node[{nid}].children", f"child {c!r} reached twice (duplicate or cycle)")
+            seen.add(c)
+            stack.append(c)
+    if len(seen) != len(nodes):
+        orphan = next(nid for nid in nodes if nid not in seen)
+        raise _err(f"Node[{orphan}]", "not reachable from rootId (orphan or cycle)")
+
+    for i in range(1, len(mainline)):
+        prev, nid = mainline[i - 1], mainline[i]
+        children = nodes[prev]["children"] if prev in nodes else ()
+        if not children or children[0] != nid:
+            raise _err(f"PackedGameTree.mainline[{i}]", f"expected the first child of {prev!r}")
+    if nodes[mainline[-1]]["children"]:
+        raise _err("PackedGameTree.mainline", "ends before a leaf")
@@ -0,0 +1,127 @@
+import json
+
+import pytest
+from reflex_chess_model import CompactGameTree, validate_tree
+
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+E4 = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+D4 = "rnbqkbnr/pppppppp/8/8/3P4/8/PPP1PPPP/RNBQKBNR b KQkq - 0 1"
+E5 = "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2"
+
+
+def _move(san, uci, **extra):
+    mi = {"san": san, "nags": [], "preComments": [], "postComments": [], "annotations": {"shapes": []}}
+    mi.update(extra)
+    mi["uci"] = uci
+    return mi
+
+
+def _tree():
+    return {
+        "version": 1,
+        "headers": {"Event": "Compact"},
+        "initialFen": START,
+        "rootId": "n:root",
+        "nodes": {
+            "n:root": {"id": "n:root", "ply": 0, "fen": START, "parent": None, "children": ["n:0", "n:1"]},
+            "n:0": {"id": "n:0", "ply": 1, "fen": E4, "parent": "n:root", "children": ["n:0.0"]},
+            "n:0.0": {"id": "n:0.0", "ply": 2, "fen": E5, "parent": "n:0", "children": []},
+            "n:1": {"id": "n:1", "ply": 1, "fen": D4, "parent": "n:root", "children": []},
+        },
+        "moveByNode": {
+            "n:0": _move("e4", "e2e4", nags=[1], postComments=["best by test"]),
+            "n:0.0": {
+                "san": "e5",
+                "nags": [],
+                "preComments": [],
+                "postComments": [],
+                "annotations": {"shapes": [{"kind": "arrow", "color": "green", "from": "g1", "to": "f3"}], "clock": 59.0},
+            },
+            "n:1": _move("d4", "d2d4"),
+        },
+        "nodeByFen": {START: ["n:root"], E4: ["n:0"], E5: ["n:0.0"], D4: ["n:1"]},
+        "mainline": ["n:root", "n:0", "n:0.0"],
+        "nextMainline": {"n:root": "n:0", "n:0": "n:0.0", "n:0.0": None},
+        "prevMainline": {"n:root": None, "n:0": "n:root", "n:0.0": "n:0"},
+    }
+
+
+def test_round_trip_is_lossless():
+    tree = _tree()
+    compact = CompactGameTree.from_dict(tree)
+    assert json.dumps(compact.to_dict()) == json.dumps(tree)
+    assert compact.children(compact.root) == [1, 3]
+    assert compact.fens.count(E4) == 1
+
+
+def test_mapping_view_reads_like_the_dict():
+    tree = _tree()
+    view = CompactGameTree.from_dict(tree).as_mapping()
+    validate_tree(view)
+
+    assert view["nodes"]["n:0"] == tree["nodes"]["n:0"]
+    assert view["moveByNode"]["n:0.0"] == tree["moveByNode"]["n:0.0"]
+    assert "n:root" not in view["moveByNode"]
+    assert view["nextMainline"]["n:0"] == "n:0.0"
+    assert view["nextMainline"].get("n:1") is None
+    with pytest.raises(TypeError):
+        view["nodes"]["n:0"] = {}  # type: ignore[index]
+
+
+def test_rejects_children_that_disagree_with_parents():
+    tree = _tree()
+    tree["nodes"]["n:1"]["parent"] = "n:0"
+    with pytest.raises(ValueError, match=r"Node\[n:1\]\.parent"):
+        CompactGameTree.from_dict(tree)
+
+
+@pytest.mark.parametrize(
+    "children",
+    [
+        {"n:root": ["n:0", "n:1", "n:0"]},  # repeated child
+        {"n:0": ["n:0.0", "n:1"]},  # also listed under another parent
+        {"n:0.0": ["n:root"]},  # root as a child
+    ],
+)
+def test_rejects_children_linked_twice(children):
+    tree = _tree()
+    for nid, kids in children.items():
+        tree["nodes"][nid]["children"] = kids
+    with pytest.raises(ValueError, match="listed twice or is the root"):
+        CompactGameTree.from_dict(tree)
+
+
+def test_binary_codec_round_trips_and_decodes_lazily():
+    from reflex_chess_model import decode_compact, decode_tree, encode_tree
+
+    tree = _tree()
+    tree["moveByNode"]["n:1"]["uci"] = "0000"  # null move: no 16-bit code
+    tree["nodeByFen"][E4] = ["n:0", "n:1"]  # not derivable from node FENs
+
+    data = encode_tree(tree)
+    assert data[:4] == b"RCGT"
+    assert json.dumps(decode_tree(data)) == json.dumps(tree)
+
+    view = decode_compact(data).as_mapping()
+    validate_tree(view)
+    assert view["moveByNode"]["n:0"]["uci"] == "e2e4"
+    assert encode_tree(view) == data
+
+    with pytest.raises(ValueError, match="truncated"):
+        decode_compact(data[:-3])
+
+
+@pytest.mark.parametrize(
+    "keep", [(), ("nodeByFen",), ("nextMainline", "prevMainline"), ("prevMainline",)]
+)
+def test_binary_codec_keeps_partial_indices(keep):
+    from reflex_chess_model import decode_compact, decode_tree, encode_tree
+
+    tree = _tree()
+    for key in ("nodeByFen", "nextMainline", "prevMainline"):
+        if key not in keep:
+            del tree[key]
+
+    data = encode_tree(tree)
+    assert json.dumps(decode_tree(data)) == json.dumps(tree)
+    assert encode_tree(decode_compact(data).as_mapping()) == data
@@ -0,0 +1,82 @@
+import json
+
+from reflex_chess_model import (
+    CompactGameTree,
+    TreeIndex,
+    decode_tree,
+    encode_tree,
+    find_nodes_by_position,
+    next_mainline,
+    nodes_by_fen,
+    prev_mainline,
+    validate_tree,
+)
+
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+E4 = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+D4 = "rnbqkbnr/pppppppp/8/8/3P4/8/PPP1PPPP/RNBQKBNR b KQkq - 0 1"
+
+
+def _move(san, uci):
+    return {"san": san, "nags": [], "preComments": [], "postComments": [], "annotations": {"shapes": []}, "uci": uci}
+
+
+def _lean_tree():
+    # No nodeByFen / nextMainline / prevMainline.
+    return {
+        "version": 1,
+        "headers": {},
+        "initialFen": START,
+        "rootId": "n:root",
+        "nodes": {
+            "n:root": {"id": "n:root", "ply": 0, "fen": START, "parent": None, "children": ["n:0", "n:1"]},
+            "n:0": {"id": "n:0", "ply": 1, "fen": E4, "parent": "n:root", "children": []},
+            "n:1": {"id": "n:1", "ply": 1, "fen": D4, "parent": "n:root", "children": []},
+        },
+        "moveByNode": {"n:0": _move("e4", "e2e4"), "n:1": _move("d4", "d2d4")},
+        "mainline": ["n:root", "n:0"],
+    }
+
+
+def test_lean_tree_validates_and_accessors_derive_entries():
+    tree = _lean_tree()
+    validate_tree(tree)
+    assert next_mainline(tree, "n:root") == "n:0"
+    assert next_mainline(tree, "n:0") is None
+    assert prev_mainline(tree, "n:0") == "n:root"
+    assert prev_mainline(tree, "n:1") is None  # variation: not on the mainline
+    assert nodes_by_fen(tree, D4) == ["n:1"]
+
+
+def test_tree_index_memoizes_and_prefers_stored_maps():
+    tree = _lean_tree()
+    index = TreeIndex(tree)
+    assert index.next_mainline is index.next_mainline
+    assert dict(index.prev_mainline) == {"n:root": None, "n:0": "n:root"}
+    assert index.nodes_at(START) == ["n:root"]
+    assert next_mainline(index, "n:root") == "n:0"
+
+    stored = {**tree, "nextMainline": {"n:root": "n:1"}}
+    assert TreeIndex(stored).next("n:root") == "n:1"
+
+
+def test_compact_and_codec_keep_index_absent():
+    tree = _lean_tree()
+    compact = CompactGameTree.from_dict(tree)
+    assert not compact.has_index
+    assert json.dumps(compact.to_dict()) == json.dumps(tree)
+    assert compact.as_mapping()["nextMainline"]["n:root"] == "n:0"
+    assert json.dumps(decode_tree(encode_tree(tree))) == json.dumps(tree)
+
+
+def test_find_nodes_by_position_ignores_move_counters():
+    tree = _lean_tree()
+    later_start = START.replace(" 0 1", " 4 3")
+
+    class Board:
+        def epd(self):
+            return " ".join(E4.split()[:4])
+
+    assert find_nodes_by_position(tree, later_start) == ["n:root"]
+    assert find_nodes_by_position(TreeIndex(tree), later_start) == ["n:root"]
+    assert find_nodes_by_position(tree, Board()) == ["n:0"]
@@ -32,3 +32,54 @@ def test_validate_tree_rejects_wrong_version():
         validate_tree({"version": 2})
 
 
+def _chain_tree():
+    def node(nid, ply, parent, children):
+        return {"id": nid, "ply": ply, "fen": f"fen-{nid}", "parent": parent, "children": children}
+
+    mi = {"san": "x", "nags": [], "preComments": [], "postComments": [], "annotations": {"shapes": []}}
+    return {
+        "version": 1,
+        "headers": {},
+        "initialFen": "fen-n:root",
+        "rootId": "n:root",
+        "nodes": {
+            "n:root": node("n:root", 0, None, ["n:0"]),
+            "n:0": node("n:0", 1, "n:root", ["n:0.0"]),
+            "n:0.0": node("n:0.0", 2, "n:0", []),
+        },
+        "moveByNode": {"n:0": mi, "n:0.0": mi},
+        "mainline": ["n:root", "n:0", "n:0.0"],
+    }
+
+
+def test_structural_level_detects_cycles_that_schema_accepts():
+    tree = _chain_tree()
+    validate_tree(tree, level="structural")
+
+    # n:0.0 points back to n:0: every id exists, so the schema pass is fine.
+    tree["nodes"]["n:0.0"]["children"] = ["n:0"]
+    validate_tree(tree)
+    with pytest.raises(ValueError, match="has parent"):
+        validate_tree(tree, level="structural")
+
+
+def test_structural_level_detects_orphans_and_bad_mainline():
+    tree = _chain_tree()
+    tree["nodes"]["n:0"]["children"] = []
+    with pytest.raises(ValueError, match="not reachable"):
+        validate_tree(tree, level="structural")
+
+    tree = _chain_tree()
+    tree["mainline"] = ["n:root", "n:0"]
+    with pytest.raises(ValueError, match="ends before a leaf"):
+        validate_tree(tree, level="structural")
+
+
+def test_trusted_level_only_checks_the_envelope():
+    tree = _chain_tree()
+    tree["nodes"]["n:0"]["ply"] = "bad"
+    validate_tree(tree, level="trusted")
+    with pytest.raises(ValueError, match="ply"):
+        validate_tree(tree)
+    with pytest.raises(ValueError, match="level"):
+        validate_tree(tree, level="strict")  # type: ignore[arg-type]
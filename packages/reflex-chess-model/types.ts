@@ -51,10 +51,11 @@ export type PackedGameTreeV1 = {
   rootId: string;
   nodes: Record<string, Node>;
   moveByNode: Record<string, MoveInfo>;
-  nodeByFen: Record<string, string[]>;
   mainline: string[];
-  nextMainline: Record<string, string | null>;
-  prevMainline: Record<string, string | null>;
+  // Derived indices: optional, may be omitted by the producer (derive from nodes/mainline).
+  nodeByFen?: Record<string, string[]>;
+  nextMainline?: Record<string, string | null>;
+  prevMainline?: Record<string, string | null>;
 };
 
 
@@ -0,0 +1,89 @@
+"""Benchmark: full `build_notation_lines` vs incremental `NotationBuilder` updates.
+
+Needs the dev workspace (python-chess + reflex-chess-viewer for building trees):
+
+    uv run python packages/reflex-chess-notation/benchmarks/bench_incremental.py
+"""
+
+from __future__ import annotations
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from reflex_chess_notation import NotationBuilder, build_notation_lines
+
+# Reuse the viewer's synthetic PGN generator.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "reflex-chess-viewer" / "benchmarks"))
+
+from reflex_chess_viewer import GameTreeBuilder  # noqa: E402
+from synthetic import variation_heavy_pgn  # noqa: E402
+
+ROUNDS = 50
+
+
+def _median_ms(samples: list[float]) -> float:
+    return statistics.median(samples) * 1000
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    rng = random.Random(7)
+    print(f"{'nodes':>6} {'full ms':>8} {'options ms':>11} {'comment ms':>11} {'variation ms':>13}")
+    for plies in (60, 80, 120):
+        tree = GameTreeBuilder(indices=False).build(variation_heavy_pgn(plies=plies))
+        nodes = tree["nodes"]
+        moves = tree["moveByNode"]
+        ids = [nid for nid in nodes if nid in moves]
+
+        full = [_timed(lambda: build_notation_lines(tree)) for _ in range(5)]  # noqa: B023
+
+        builder = NotationBuilder(tree)
+        builder.lines()
+        builder.set_options({"show_comments": False})
+        builder.lines()
+
+        # Toggling between two already-seen option sets.
+        opts = [{"show_comments": True}, {"show_comments": False}]
+        toggles = []
+        for i in range(ROUNDS):
+            builder.set_options(opts[i % 2])
+            toggles.append(_timed(builder.lines))
+        builder.set_options(None)
+        builder.lines()
+
+        # Edit one comment, invalidate the node, rebuild.
+        comments = []
+        for i in range(ROUNDS):
+            nid = rng.choice(ids)
+            moves[nid]["postComments"] = [f"edit {i}"]
+            builder.invalidate(nid)
+            comments.append(_timed(builder.lines))
+
+        # Append a one-move variation under a random node, invalidate the parent, rebuild.
+        variations = []
+        for i in range(ROUNDS):
+            parent = rng.choice(ids)
+            nid = f"{parent}.x{i}"
+            nodes[nid] = {"id": nid, "ply": nodes[parent]["ply"] + 1, "fen": "x", "parent": parent, "children": []}
+            moves[nid] = {"san": "a3", "nags": [], "preComments": [], "postComments": [], "annotations": {"shapes": []}}
+            nodes[parent]["children"].append(nid)
+            builder.invalidate(parent)
+            variations.append(_timed(builder.lines))
+
+        assert builder.lines() == build_notation_lines(tree)
+        print(
+            f"{len(nodes):>6} {_median_ms(full):>8.2f} {_median_ms(toggles):>11.3f} "
+            f"{_median_ms(comments):>11.3f} {_median_ms(variations):>13.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
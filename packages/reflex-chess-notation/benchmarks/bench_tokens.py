@@ -0,0 +1,80 @@
+"""Benchmark: notation build time and client payload on a heavily annotated game.
+
+"object" is the former token shape (one JSON object per token with all four
+fields, plus a " " separator token after moves/comments/NAGs), reconstructed
+from the lean tokens for comparison.
+
+    uv run python packages/reflex-chess-notation/benchmarks/bench_tokens.py
+"""
+
+from __future__ import annotations
+
+import gzip
+import sys
+import time
+from pathlib import Path
+
+from reflex.utils.format import json_dumps
+from reflex_chess_notation import TokenKind, build_notation_lines
+
+# Reuse the viewer's synthetic PGN generator.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "reflex-chess-viewer" / "benchmarks"))
+
+from reflex_chess_viewer import GameTreeBuilder  # noqa: E402
+from synthetic import variation_heavy_pgn  # noqa: E402
+
+_KIND_NAMES = {k.value: k.name.lower() for k in TokenKind}
+
+
+def _annotate(tree: dict) -> None:
+    for i, mi in enumerate(tree["moveByNode"].values()):
+        mi["postComments"] = [f"comment on move {i}: the idea is to improve the worst piece"]
+        if i % 3 == 0:
+            mi["preComments"] = ["before"]
+        mi["nags"] = [1 + i % 6]
+
+
+def _object_shape(lines) -> list[dict]:
+    out = []
+    for line in lines:
+        tokens = []
+        for t in line.tokens:
+            kind = _KIND_NAMES[t[0]]
+            if kind == "move":
+                tokens.append({"kind": kind, "text": "", "node_id": t[1], "san": t[2]})
+            else:
+                tokens.append({"kind": kind, "text": t[1], "node_id": "", "san": ""})
+            if t[1] not in ("(", ")"):
+                tokens.append({"kind": "text", "text": " ", "node_id": "", "san": ""})
+        out.append({"indent": line.indent, "tokens": tokens})
+    return out
+
+
+def _best_ms(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    print(f"{'nodes':>6} {'tokens':>7} {'build ms':>9} {'lean KB':>8} {'gz':>6} {'object KB':>10} {'gz':>6}")
+    for plies in (60, 120, 240):
+        tree = GameTreeBuilder(indices=False).build(variation_heavy_pgn(plies=plies))
+        _annotate(tree)
+        lines = build_notation_lines(tree)
+        build_ms = _best_ms(lambda: build_notation_lines(tree))  # noqa: B023
+
+        lean = json_dumps(lines).encode()
+        verbose = json_dumps(_object_shape(lines)).encode()
+        print(
+            f"{len(tree['nodes']):>6} {sum(len(line.tokens) for line in lines):>7} {build_ms:>9.2f} "
+            f"{len(lean) / 1024:>8.0f} {len(gzip.compress(lean)) / 1024:>6.0f} "
+            f"{len(verbose) / 1024:>10.0f} {len(gzip.compress(verbose)) / 1024:>6.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,29 @@
-from .notation import NotationLine, NotationToken, build_notation_lines, chess_notation
+from .notation import (
+    MOVE_ID_PREFIX,
+    SELECT_EVENT,
+    NotationBuilder,
+    NotationLine,
+    NotationOptions,
+    NotationToken,
+    TokenKind,
+    build_notation_lines,
+    chess_notation,
+    index_lines,
+    window_offset,
+)
 
 __all__ = [
+    "MOVE_ID_PREFIX",
+    "NotationBuilder",
     "NotationLine",
+    "NotationOptions",
     "NotationToken",
+    "SELECT_EVENT",
+    "TokenKind",
     "build_notation_lines",
     "chess_notation",
+    "index_lines",
+    "window_offset",
 ]
 
 
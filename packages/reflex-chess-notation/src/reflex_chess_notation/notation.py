@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
+from enum import Enum
 from typing import Any, Literal
 
 import reflex as rx
-from pydantic import BaseModel
+from reflex.utils.imports import ImportVar
+from reflex.vars import FunctionStringVar
 
 UnknownNagMode = Literal["hide", "dollar"]
 
@@ -60,24 +63,41 @@ def _move_number_prefix(ply: int, *, line_start: bool) -> str | None:
     return None
 
 
-class NotationToken(BaseModel):
-    kind: str
-    text: str = ""
-    node_id: str = ""
-    san: str = ""
+class TokenKind(str, Enum):  # noqa: UP042 - StrEnum needs 3.11
+    MOVENO = "n"
+    MOVE = "m"
+    COMMENT = "c"
+    NAG = "g"
+    TEXT = "t"  # variation brackets / placeholders
 
 
-class NotationLine(BaseModel):
+# Token = tuple, serialized as a JSON array; the last item is always the display text:
+#   (MOVENO | COMMENT | NAG | TEXT, text)
+#   (MOVE, node_id, san)
+# Spacing between tokens is done in CSS, so there are no separator tokens.
+NotationToken = tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class NotationLine:
     indent: str  # e.g. "18px"
-    tokens: list[NotationToken]
+    tokens: tuple[NotationToken, ...]
+
 
+def _tok(kind: TokenKind, text: str) -> NotationToken:
+    return (kind.value, text)
 
-def _tok(kind: str, **kwargs: Any) -> NotationToken:
-    return NotationToken(kind=kind, **kwargs)
+
+def _move_tok(node_id: str, san: str) -> NotationToken:
+    return (TokenKind.MOVE.value, node_id, san)
+
+
+_OPEN = _tok(TokenKind.TEXT, "(")
+_CLOSE = _tok(TokenKind.TEXT, ")")
 
 
 def _render_comments_tokens(
-    move: dict[str, Any],
+    move: Mapping[str, Any],
     *,
     where: Literal["pre", "post"],
     o: NotationOptions,
@@ -92,21 +112,19 @@ def _render_comments_tokens(
             s = str(c).strip()
             if not s:
                 continue
-            out.append(_tok("comment", text=s))
-            out.append(_tok("text", text=" "))
+            out.append(_tok(TokenKind.COMMENT, s))
 
     if where == "post":
         ann = move.get("annotations") or {}
         text = ann.get("text")
         if isinstance(text, str) and text.strip():
-            out.append(_tok("comment", text=text.strip()))
-            out.append(_tok("text", text=" "))
+            out.append(_tok(TokenKind.COMMENT, text.strip()))
 
     return out
 
 
 def _render_nags_token(
-    move: dict[str, Any], o: NotationOptions
+    move: Mapping[str, Any], o: NotationOptions
 ) -> NotationToken | None:
     if not o.show_nags:
         return None
@@ -126,26 +144,27 @@ def _render_nags_token(
             parts.append(f"${ni}")
     if not parts:
         return None
-    return _tok("nag", text="".join(parts))
+    return _tok(TokenKind.NAG, "".join(parts))
 
 
-def _node(tree: dict[str, Any], node_id: str) -> dict[str, Any] | None:
+def _node(tree: Mapping[str, Any], node_id: str) -> Mapping[str, Any] | None:
+    # Mapping (not just dict): also accepts read-only views such as CompactTreeView.
     nodes = tree.get("nodes") or {}
-    if not isinstance(nodes, dict):
+    if not isinstance(nodes, Mapping):
         return None
     n = nodes.get(node_id)
-    return n if isinstance(n, dict) else None
+    return n if isinstance(n, Mapping) else None
 
 
-def _move(tree: dict[str, Any], node_id: str) -> dict[str, Any] | None:
+def _move(tree: Mapping[str, Any], node_id: str) -> Mapping[str, Any] | None:
     mbn = tree.get("moveByNode") or {}
-    if not isinstance(mbn, dict):
+    if not isinstance(mbn, Mapping):
         return None
     m = mbn.get(node_id)
-    return m if isinstance(m, dict) else None
+    return m if isinstance(m, Mapping) else None
 
 
-def _children(tree: dict[str, Any], node_id: str) -> list[str]:
+def _children(tree: Mapping[str, Any], node_id: str) -> list[str]:
     n = _node(tree, node_id) or {}
     ch = n.get("children") or []
     if not isinstance(ch, list):
@@ -159,7 +178,7 @@ def _children(tree: dict[str, Any], node_id: str) -> list[str]:
 
 def _move_tokens(
     *,
-    tree: dict[str, Any],
+    tree: Mapping[str, Any],
     node_id: str,
     line_start: bool,
     o: NotationOptions,
@@ -167,7 +186,7 @@ def _move_tokens(
     n = _node(tree, node_id)
     m = _move(tree, node_id)
     if not n or not m:
-        return [_tok("text", text="?"), _tok("text", text=" ")]
+        return [_tok(TokenKind.TEXT, "?")]
 
     ply = int(n.get("ply") or 0)
     san = str(m.get("san") or "?")
@@ -177,177 +196,368 @@ def _move_tokens(
         _move_number_prefix(ply, line_start=line_start) if o.show_move_numbers else None
     )
     if prefix:
-        out.append(_tok("moveno", text=prefix))
-        out.append(_tok("text", text=" "))
+        out.append(_tok(TokenKind.MOVENO, prefix))
 
     out.extend(_render_comments_tokens(m, where="pre", o=o))
-    out.append(_tok("move", node_id=node_id, san=san))
-    out.append(_tok("text", text=" "))
+    out.append(_move_tok(node_id, san))
 
     nag = _render_nags_token(m, o)
     if nag is not None:
         out.append(nag)
-        out.append(_tok("text", text=" "))
 
     out.extend(_render_comments_tokens(m, where="post", o=o))
     return out
 
 
-def _build_mainline_lines(
-    *,
-    tree: dict[str, Any],
-    start_node_id: str,
-    depth: int,
-    o: NotationOptions,
-) -> list[NotationLine]:
-    lines: list[NotationLine] = []
-    cur = start_node_id
-    tokens: list[NotationToken] = []
-    first = True
-
-    while True:
-        ch = _children(tree, cur)
-        if not ch:
-            break
-        main = ch[0]
-
-        tokens.extend(
-            _move_tokens(
-                tree=tree,
-                node_id=main,
-                line_start=first,
-                o=o,
-            )
-        )
-
-        # Variations of the *node we just entered* (rule: after SAN leading into node).
-        tokens.append(_tok("text", text=" "))
-        lines.extend(_build_variation_lines(tree=tree, node_id=main, depth=depth, o=o))
-
-        first = False
-        cur = main
-
-    if tokens:
-        # Trim trailing spaces
-        while tokens and tokens[-1].kind == "text" and tokens[-1].text == " ":
-            tokens.pop()
-        lines.insert(0, NotationLine(indent=f"{depth * 18}px", tokens=tokens))
-    return lines
+class NotationBuilder:
+    """Stateful `build_notation_lines` that reuses work between builds.
 
+    Move tokens are cached per (node, line start, token options) and variation
+    blocks per (node, depth, options), so switching options back and forth or
+    rebuilding after a local edit only renders what changed. After editing the
+    tree in place, call `invalidate(node_id)` for every node whose move info
+    (comments, NAGs, SAN) or children changed; `lines()` then rebuilds just the
+    blocks containing those nodes plus the main line.
+    """
 
-def _build_variation_lines(
-    *,
-    tree: dict[str, Any],
-    node_id: str,
-    depth: int,
-    o: NotationOptions,
-) -> list[NotationLine]:
-    ch = _children(tree, node_id)
-    if len(ch) <= 1:
-        return []
+    __slots__ = ("tree", "_o", "_moves", "_blocks", "_children", "_lines")
+
+    def __init__(self, tree: Mapping[str, Any], options: dict[str, Any] | None = None) -> None:
+        self.tree = tree
+        self._o = _opts(options)
+        self._moves: dict[str, dict[tuple[Any, ...], list[NotationToken]]] = {}
+        self._blocks: dict[str, dict[tuple[int, NotationOptions], list[NotationLine]]] = {}
+        self._children: dict[str, list[str]] = {}
+        self._lines: dict[NotationOptions, list[NotationLine]] = {}
+
+    @property
+    def options(self) -> NotationOptions:
+        return self._o
+
+    def set_options(self, options: dict[str, Any] | None) -> None:
+        # Caches are keyed by options: nothing to drop.
+        self._o = _opts(options)
+
+    def set_tree(self, tree: Mapping[str, Any]) -> None:
+        self.tree = tree
+        self.clear()
+
+    def clear(self) -> None:
+        self._moves.clear()
+        self._blocks.clear()
+        self._children.clear()
+        self._lines.clear()
+
+    def invalidate(self, *node_ids: str) -> None:
+        self._lines.clear()
+        for node_id in node_ids:
+            self._moves.pop(node_id, None)
+            self._blocks.pop(node_id, None)
+            self._children.pop(node_id, None)
+            # Ancestor blocks that render this node inside one of their variations.
+            cur = node_id
+            parent = (_node(self.tree, cur) or {}).get("parent")
+            while isinstance(parent, str) and parent:
+                ch = self._kids(parent)
+                if ch and ch[0] != cur:
+                    self._blocks.pop(parent, None)
+                cur = parent
+                parent = (_node(self.tree, cur) or {}).get("parent")
+
+    def lines(self) -> list[NotationLine]:
+        lines = self._lines.get(self._o)
+        if lines is None:
+            root_id = str(self.tree.get("rootId") or "n:root")
+            lines = self._lines[self._o] = self._mainline_lines(root_id, 0)
+        return list(lines)
+
+    def _kids(self, node_id: str) -> list[str]:
+        ch = self._children.get(node_id)
+        if ch is None:
+            ch = self._children[node_id] = _children(self.tree, node_id)
+        return ch
+
+    def _move_tokens(self, node_id: str, *, line_start: bool) -> list[NotationToken]:
+        o = self._o
+        key = (line_start, o.show_move_numbers, o.show_comments, o.show_nags, o.unknown_nag_mode)
+        per_node = self._moves.get(node_id)
+        if per_node is None:
+            per_node = self._moves[node_id] = {}
+        tokens = per_node.get(key)
+        if tokens is None:
+            tokens = per_node[key] = _move_tokens(tree=self.tree, node_id=node_id, line_start=line_start, o=o)
+        return tokens
+
+    def _mainline_lines(self, start_node_id: str, depth: int) -> list[NotationLine]:
+        lines: list[NotationLine] = []
+        cur = start_node_id
+        tokens: list[NotationToken] = []
+        first = True
 
-    next_depth = depth + 1
-    if o.max_variation_depth is not None and next_depth > o.max_variation_depth:
-        return [
-            NotationLine(
-                indent=f"{next_depth * 18}px",
-                tokens=[_tok("comment", text="(…)")],
-            )
-        ]
-
-    lines: list[NotationLine] = []
-    for v in ch[1:]:
-        head: list[NotationToken] = [_tok("text", text="("), _tok("text", text=" ")]
-        head.extend(_move_tokens(tree=tree, node_id=v, line_start=True, o=o))
-
-        nested_lines: list[NotationLine] = []
-        cur = v
         while True:
-            ch2 = _children(tree, cur)
-            if not ch2:
+            ch = self._kids(cur)
+            if not ch:
                 break
-            main = ch2[0]
-            head.extend(_move_tokens(tree=tree, node_id=main, line_start=False, o=o))
-            nested_lines.extend(
-                _build_variation_lines(tree=tree, node_id=main, depth=next_depth, o=o)
-            )
-            cur = main
+            main = ch[0]
+
+            tokens.extend(self._move_tokens(main, line_start=first))
 
-        # Trim trailing spaces then close ")"
-        while head and head[-1].kind == "text" and head[-1].text == " ":
-            head.pop()
-        head.extend([_tok("text", text=" "), _tok("text", text=")")])
+            # Variations of the *node we just entered* (rule: after SAN leading into node).
+            lines.extend(self._variation_lines(main, depth))
 
-        lines.append(NotationLine(indent=f"{next_depth * 18}px", tokens=head))
-        lines.extend(nested_lines)
+            first = False
+            cur = main
 
-    return lines
+        if tokens:
+            lines.insert(0, NotationLine(indent=f"{depth * 18}px", tokens=tuple(tokens)))
+        return lines
+
+    def _variation_lines(self, node_id: str, depth: int) -> list[NotationLine]:
+        key = (depth, self._o)
+        per_node = self._blocks.get(node_id)
+        if per_node is None:
+            per_node = self._blocks[node_id] = {}
+        lines = per_node.get(key)
+        if lines is None:
+            lines = per_node[key] = self._render_variations(node_id, depth)
+        return lines
+
+    def _render_variations(self, node_id: str, depth: int) -> list[NotationLine]:
+        ch = self._kids(node_id)
+        if len(ch) <= 1:
+            return []
+
+        o = self._o
+        next_depth = depth + 1
+        if o.max_variation_depth is not None and next_depth > o.max_variation_depth:
+            return [
+                NotationLine(
+                    indent=f"{next_depth * 18}px",
+                    tokens=(_tok(TokenKind.COMMENT, "(…)"),),
+                )
+            ]
+
+        lines: list[NotationLine] = []
+        for v in ch[1:]:
+            head: list[NotationToken] = [_OPEN]
+            head.extend(self._move_tokens(v, line_start=True))
+
+            nested_lines: list[NotationLine] = []
+            cur = v
+            while True:
+                ch2 = self._kids(cur)
+                if not ch2:
+                    break
+                main = ch2[0]
+                head.extend(self._move_tokens(main, line_start=False))
+                nested_lines.extend(self._variation_lines(main, next_depth))
+                cur = main
+
+            head.append(_CLOSE)
+
+            lines.append(NotationLine(indent=f"{next_depth * 18}px", tokens=tuple(head)))
+            lines.extend(nested_lines)
+
+        return lines
 
 
 def build_notation_lines(
-    tree: dict[str, Any],
+    tree: Mapping[str, Any],
     options: dict[str, Any] | None = None,
 ) -> list[NotationLine]:
     """Server-side builder: PackedGameTree -> renderable lines.
 
     This returns a JSON-serializable structure that can be stored in Reflex State
     and rendered via `rx.foreach` without Python loops over Vars.
+    Use `NotationBuilder` to rebuild repeatedly (options changes, edits).
+    """
+    return NotationBuilder(tree, options).lines()
+
+
+# Move spans get `id=MOVE_ID_PREFIX + node_id` (scroll-to-selection).
+MOVE_ID_PREFIX = "nt-"
+
+
+def index_lines(lines: Sequence[NotationLine]) -> dict[str, int]:
+    """node_id -> index of the line that shows its move."""
+    out: dict[str, int] = {}
+    move = TokenKind.MOVE.value
+    for i, line in enumerate(lines):
+        for t in line.tokens:
+            if t[0] == move:
+                out.setdefault(t[1], i)
+    return out
+
+
+def window_offset(line: int, *, offset: int, total: int, size: int, margin: int = 3) -> int:
+    """First line of a `size`-line window over `total` lines that shows `line`.
+
+    Keeps `offset` while `line` is at least `margin` lines inside the window
+    (edges of the whole list excepted); otherwise recenters it in the upper third.
     """
-    o = _opts(options)
-    root_id = str(tree.get("rootId") or "n:root")
-    return _build_mainline_lines(tree=tree, start_node_id=root_id, depth=0, o=o)
+    if size <= 0 or total <= size:
+        return 0
+    lo = offset + margin if offset > 0 else offset
+    hi = offset + size - margin if offset + size < total else total
+    if lo <= line < hi:
+        return offset
+    return max(0, min(total - size, line - size // 3))
+
+
+# Client-side selection: move spans carry `data-node-id` and the highlight is one
+# CSS rule rendered by `_SelectionStyle`. A click announces the move with a
+# `SELECT_EVENT` DOM event (the rule follows it right away); the server hears
+# about it through `on_select` as usual. Other components (the chessboard's local
+# navigation) dispatch the same event to move the highlight without the server.
+SELECT_EVENT = "reflex-chess:select"
+_MOVE_CLASS = "rcn-move"
+_SELECTED_DECL = "background-color:rgba(59, 130, 246, 0.18);outline:1px solid rgba(59, 130, 246, 0.35)"
+_SELECT_LOCALLY = FunctionStringVar.create(
+    "((id) => window.dispatchEvent("
+    f'new CustomEvent("{SELECT_EVENT}", {{ detail: {{ nodeId: id, source: "notation" }} }})'
+    "))"
+)
+
+
+class _SelectionStyle(rx.Component):
+    """`<style>` with the highlight rule: follows `selected_id` and `SELECT_EVENT`."""
+
+    tag = "ReflexChessNotationSelection"
+
+    selected_id: str = ""
+
+    def add_imports(self):
+        return {
+            "react": [ImportVar(tag="useEffect"), ImportVar(tag="useRef"), ImportVar(tag="useState")],
+            "@emotion/react": [ImportVar(tag="jsx")],
+        }
+
+    def _get_custom_code(self) -> str:
+        return (
+            r"""
+// Server selection vs our clicks still in flight (`pending`: ids sent through `on_select`,
+// oldest first). Returns { echo, pending }: the echo of any pending click keeps the local
+// highlight (it is on that move or a newer one); anything else is the server's own choice.
+function reflexChessNotationResolveSelection(pending, selectedId) {
+  const echoed = pending.indexOf(selectedId);
+  if (echoed >= 0) return { echo: true, pending: pending.slice(echoed + 1) };
+  return { echo: false, pending: [] };
+}
+
+function ReflexChessNotationSelection({ selectedId }) {
+  const [localId, setLocalId] = useState(selectedId);
+  const selectedIdRef = useRef(selectedId);
+  selectedIdRef.current = selectedId;
+  const pendingRef = useRef([]);
+
+  // Server-side selection wins when it changes, unless it echoes an earlier click.
+  useEffect(() => {
+    const { echo, pending } = reflexChessNotationResolveSelection(pendingRef.current, selectedId);
+    pendingRef.current = pending;
+    if (!echo) setLocalId(selectedId);
+  }, [selectedId]);
+
+  useEffect(() => {
+    const onSelect = (e) => {
+      const id = e?.detail?.nodeId;
+      if (typeof id !== "string") return;
+      setLocalId(id);
+      // Our click goes to the server too; no echo comes when it is already selected there.
+      if (e.detail.source === "notation" && id !== selectedIdRef.current) {
+        pendingRef.current.push(id);
+        if (pendingRef.current.length > 32) pendingRef.current.shift();
+      }
+      // Keyboard/board navigation: keep the move visible (clicks already are).
+      if (e.detail.source !== "notation") {
+        requestAnimationFrame(() => document.getElementById(`MOVE_ID_PREFIX${id}`)?.scrollIntoView({ block: "nearest" }));
+      }
+    };
+    window.addEventListener("SELECT_EVENT", onSelect);
+    return () => window.removeEventListener("SELECT_EVENT", onSelect);
+  }, []);
+
+  const rule = localId ? `.MOVE_CLASS[data-node-id="${CSS.escape(localId)}"]{SELECTED_DECL}` : "";
+  return jsx("style", { children: rule });
+}
+"""
+            .replace("MOVE_ID_PREFIX", MOVE_ID_PREFIX)
+            .replace("SELECT_EVENT", SELECT_EVENT)
+            .replace("MOVE_CLASS", _MOVE_CLASS)
+            .replace("SELECTED_DECL", _SELECTED_DECL)
+        )
+
+
+_MOVENO_STYLE = {"opacity": "0.75"}
+_COMMENT_STYLE = {"opacity": "0.72", "fontStyle": "italic"}
+_NAG_STYLE = {"opacity": "0.9"}
+_MOVE_STYLE = {
+    "display": "inline-block",
+    "cursor": "pointer",
+    "padding": "1px 3px",
+    "borderRadius": "4px",
+    "userSelect": "none",
+}
+_MOVE_STYLE_SEL = {
+    **_MOVE_STYLE,
+    "backgroundColor": "rgba(59, 130, 246, 0.18)",
+    "outline": "1px solid rgba(59, 130, 246, 0.35)",
+}
+
+
+def _render_move(
+    node_id: rx.Var, san: rx.Var, *, selected_id: rx.Var, on_select: rx.EventHandler, client_select: bool
+) -> rx.Component:
+    if client_select:
+        # No per-token dependency on `selected_id`: the <style> rule highlights.
+        return rx.el.span(
+            san,
+            id=f"{MOVE_ID_PREFIX}{node_id}",
+            class_name=_MOVE_CLASS,
+            custom_attrs={"data-node-id": node_id},
+            title=node_id,
+            style=_MOVE_STYLE,
+            on_click=[_SELECT_LOCALLY.partial(node_id), on_select({"node_id": node_id})],
+        )
+    return rx.cond(
+        node_id == selected_id,
+        rx.el.span(
+            san,
+            id=f"{MOVE_ID_PREFIX}{node_id}",
+            title=node_id,
+            style=_MOVE_STYLE_SEL,
+            on_click=on_select({"node_id": node_id}),
+        ),
+        rx.el.span(
+            san,
+            id=f"{MOVE_ID_PREFIX}{node_id}",
+            title=node_id,
+            style=_MOVE_STYLE,
+            on_click=on_select({"node_id": node_id}),
+        ),
+    )
 
 
 def _render_token(
-    token: NotationToken, *, selected_id: rx.Var, on_select: rx.EventHandler
+    token: rx.Var, *, selected_id: rx.Var, on_select: rx.EventHandler, client_select: bool = False
 ) -> rx.Component:
-    kind = token.kind
-
-    moveno_style = {"opacity": "0.75", "marginRight": "6px"}
-    comment_style = {"opacity": "0.72", "fontStyle": "italic", "marginRight": "6px"}
-    nag_style = {"opacity": "0.9", "marginRight": "6px"}
-
-    move_style = {
-        "display": "inline-block",
-        "cursor": "pointer",
-        "padding": "1px 3px",
-        "borderRadius": "4px",
-        "userSelect": "none",
-        "marginRight": "6px",
-    }
-    move_style_sel = {
-        **move_style,
-        "backgroundColor": "rgba(59, 130, 246, 0.18)",
-        "outline": "1px solid rgba(59, 130, 246, 0.35)",
-    }
+    # `token` is a Var over a NotationToken tuple (see TokenKind).
+    kind = token[0]
+    text = token[1]  # node_id for MOVE tokens
+    san = token[2]
 
     return rx.cond(
-        kind == "move",
-        rx.cond(
-            token.node_id == selected_id,
-            rx.el.span(
-                token.san,
-                title=token.node_id,
-                style=move_style_sel,
-                on_click=on_select({"node_id": token.node_id}),
-            ),
-            rx.el.span(
-                token.san,
-                title=token.node_id,
-                style=move_style,
-                on_click=on_select({"node_id": token.node_id}),
-            ),
-        ),
+        kind == TokenKind.MOVE.value,
+        _render_move(text, san, selected_id=selected_id, on_select=on_select, client_select=client_select),
         rx.cond(
-            kind == "moveno",
-            rx.el.span(token.text, style=moveno_style),
+            kind == TokenKind.MOVENO.value,
+            rx.el.span(text, style=_MOVENO_STYLE),
             rx.cond(
-                kind == "comment",
-                rx.el.span(token.text, style=comment_style),
+                kind == TokenKind.COMMENT.value,
+                rx.el.span(text, style=_COMMENT_STYLE),
                 rx.cond(
-                    kind == "nag",
-                    rx.el.span(token.text, style=nag_style),
-                    rx.el.span(token.text),
+                    kind == TokenKind.NAG.value,
+                    rx.el.span(text, style=_NAG_STYLE),
+                    rx.el.span(text),
                 ),
             ),
         ),
@@ -358,8 +568,22 @@ def chess_notation(
     lines: list[NotationLine],
     selected_id: str,
     on_select: rx.EventHandler,
+    *,
+    hidden_before: int | rx.Var[int] = 0,
+    hidden_after: int | rx.Var[int] = 0,
+    on_page: rx.EventHandler | None = None,
+    client_select: bool = False,
 ) -> rx.Component:
-    """Render prebuilt notation lines (Var-friendly)."""
+    """Render prebuilt notation lines (Var-friendly).
+
+    Windowed mode: pass only a slice of the lines, the number of lines left out
+    on each side and `on_page(direction)` (-1 / 1) to load the neighbouring page.
+
+    `client_select=True`: a click highlights the move in the browser before the
+    server round-trip, and a `selected_id` change only updates one CSS rule instead
+    of re-rendering every token. The highlight also follows `SELECT_EVENT` DOM
+    events (`detail: {nodeId, source}`) dispatched by other components.
+    """
     wrapper_style = {
         "fontFamily": 'ui-sans-serif, system-ui, -apple-system, Segoe UI, Roboto, Arial, "Noto Sans", "Liberation Sans", sans-serif',
         "fontSize": "14px",
@@ -373,14 +597,38 @@ def chess_notation(
             rx.foreach(
                 line.tokens,
                 lambda t: _render_token(
-                    t, selected_id=selected_var, on_select=on_select
+                    t, selected_id=selected_var, on_select=on_select, client_select=client_select
                 ),
             ),
+            # Token spacing lives here (no separator tokens on the wire).
             style={
                 "marginLeft": line.indent,
-                "whiteSpace": "pre-wrap",
+                "display": "flex",
+                "flexWrap": "wrap",
+                "alignItems": "baseline",
+                "columnGap": "6px",
                 "wordBreak": "break-word",
             },
         )
 
-    return rx.el.div(rx.foreach(lines, render_line), style=wrapper_style)
+    body = rx.foreach(lines, render_line)
+    if client_select:
+        body = rx.fragment(_SelectionStyle.create(selected_id=selected_var), body)
+    if on_page is None:
+        return rx.el.div(body, style=wrapper_style)
+
+    pager_style = {"opacity": "0.6", "fontSize": "12px", "cursor": "pointer", "padding": "2px 0"}
+    before = rx.Var.create(hidden_before)
+    after = rx.Var.create(hidden_after)
+    return rx.el.div(
+        rx.cond(
+            before > 0,
+            rx.el.div(f"▲ {before} earlier lines", style=pager_style, on_click=on_page(-1)),
+        ),
+        body,
+        rx.cond(
+            after > 0,
+            rx.el.div(f"▼ {after} more lines", style=pager_style, on_click=on_page(1)),
+        ),
+        style=wrapper_style,
+    )
@@ -0,0 +1,135 @@
+import reflex_chess_notation.notation as notation_module
+from reflex_chess_notation import (
+    NotationBuilder,
+    build_notation_lines,
+    index_lines,
+    window_offset,
+)
+
+
+def _mi(san, **extra):
+    return {"san": san, "nags": [], "preComments": [], "postComments": [], "annotations": {"shapes": []}, **extra}
+
+
+def _tree():
+    # 1. e4 e5 (1... c5 2. Nf3) 2. Nf3
+    def node(nid, ply, parent, children):
+        return {"id": nid, "ply": ply, "fen": nid, "parent": parent, "children": children}
+
+    return {
+        "version": 1,
+        "headers": {},
+        "initialFen": "start",
+        "rootId": "n:root",
+        "nodes": {
+            "n:root": node("n:root", 0, None, ["n:0"]),
+            "n:0": node("n:0", 1, "n:root", ["n:0.0", "n:0.1"]),
+            "n:0.0": node("n:0.0", 2, "n:0", ["n:0.0.0"]),
+            "n:0.0.0": node("n:0.0.0", 3, "n:0.0", []),
+            "n:0.1": node("n:0.1", 2, "n:0", ["n:0.1.0"]),
+            "n:0.1.0": node("n:0.1.0", 3, "n:0.1", []),
+        },
+        "moveByNode": {
+            "n:0": _mi("e4"),
+            "n:0.0": _mi("e5"),
+            "n:0.0.0": _mi("Nf3"),
+            "n:0.1": _mi("c5"),
+            "n:0.1.0": _mi("Nf3"),
+        },
+        "mainline": ["n:root", "n:0", "n:0.0", "n:0.0.0"],
+    }
+
+
+def _text(lines):
+    return [(line.indent, " ".join(t[-1] for t in line.tokens)) for line in lines]
+
+
+def _count_rebuilds(monkeypatch):
+    """Record the nodes whose move tokens / variation blocks get rendered."""
+    calls = {"moves": [], "blocks": []}
+    move_tokens = notation_module._move_tokens
+    render = NotationBuilder._render_variations
+
+    def counted_move_tokens(*, node_id, **kw):
+        calls["moves"].append(node_id)
+        return move_tokens(node_id=node_id, **kw)
+
+    def counted_render(self, node_id, depth):
+        calls["blocks"].append(node_id)
+        return render(self, node_id, depth)
+
+    monkeypatch.setattr(notation_module, "_move_tokens", counted_move_tokens)
+    monkeypatch.setattr(NotationBuilder, "_render_variations", counted_render)
+    return calls
+
+
+def test_builder_matches_one_shot_build_and_caches_per_options(monkeypatch):
+    tree = _tree()
+    builder = NotationBuilder(tree)
+    first = builder.lines()
+    assert _text(first) == [("0px", "1. e4 e5 2. Nf3"), ("18px", "( 1... c5 2. Nf3 )")]
+
+    builder.set_options({"show_move_numbers": False})
+    assert builder.lines() == build_notation_lines(tree, {"show_move_numbers": False})
+
+    calls = _count_rebuilds(monkeypatch)
+    builder.set_options(None)
+    again = builder.lines()
+    assert calls == {"moves": [], "blocks": []}
+    assert all(a is b for a, b in zip(again, first, strict=True))
+
+
+def test_invalidate_rebuilds_edited_nodes_and_new_variations():
+    tree = _tree()
+    builder = NotationBuilder(tree)
+    builder.lines()
+
+    tree["moveByNode"]["n:0.1.0"]["postComments"] = ["sharp"]
+    tree["moveByNode"]["n:0.0.0"]["nags"] = [1]
+    builder.invalidate("n:0.1.0", "n:0.0.0")
+    assert builder.lines() == build_notation_lines(tree)
+    assert "sharp" in _text(builder.lines())[1][1]
+
+    tree["nodes"]["n:0.0.1"] = {"id": "n:0.0.1", "ply": 3, "fen": "x", "parent": "n:0.0", "children": []}
+    tree["nodes"]["n:0.0"]["children"].append("n:0.0.1")
+    tree["moveByNode"]["n:0.0.1"] = _mi("d4")
+    builder.invalidate("n:0.0")
+    assert builder.lines() == build_notation_lines(tree)
+    assert ("18px", "( 2. d4 )") in _text(builder.lines())
+
+
+def test_invalidate_rebuilds_only_the_ancestor_lines(monkeypatch):
+    # 1. e4 e5 (1... c5 2. Nf3) 2. Nf3 (2. d4)
+    tree = _tree()
+    tree["nodes"]["n:0.0.1"] = {"id": "n:0.0.1", "ply": 3, "fen": "x", "parent": "n:0.0", "children": []}
+    tree["nodes"]["n:0.0"]["children"].append("n:0.0.1")
+    tree["moveByNode"]["n:0.0.1"] = _mi("d4")
+    builder = NotationBuilder(tree)
+    before = builder.lines()
+    assert _text(before)[1:] == [("18px", "( 1... c5 2. Nf3 )"), ("18px", "( 2. d4 )")]
+
+    calls = _count_rebuilds(monkeypatch)
+    tree["moveByNode"]["n:0.1.0"]["postComments"] = ["sharp"]
+    builder.invalidate("n:0.1.0")
+    after = builder.lines()
+
+    # Only the edited node (move + its own, empty, block) and the block of its
+    # variation ancestor are rendered again; the main line is re-joined from cached
+    # tokens and the other variation block is reused as is.
+    assert calls == {"moves": ["n:0.1.0"], "blocks": ["n:0", "n:0.1.0"]}
+    assert after == build_notation_lines(tree)
+    assert after[1] is not before[1]
+    assert after[2] is before[2]
+    assert after[0].tokens[:2] == before[0].tokens[:2]
+
+
+def test_index_lines_and_window_offset():
+    lines = build_notation_lines(_tree())
+    assert index_lines(lines) == {"n:0": 0, "n:0.0": 0, "n:0.0.0": 0, "n:0.1": 1, "n:0.1.0": 1}
+
+    # Everything fits / already visible -> unchanged; otherwise recentred.
+    assert window_offset(5, offset=0, total=8, size=10) == 0
+    assert window_offset(10, offset=0, total=100, size=30) == 0
+    assert window_offset(28, offset=0, total=100, size=30) == 18
+    assert window_offset(99, offset=0, total=100, size=30) == 70
+    assert window_offset(1, offset=70, total=100, size=30) == 0
@@ -1,4 +1,10 @@
+import json
 import os
+import re
+import shutil
+import subprocess
+
+import pytest
 
 
 def test_package_imports_and_component_contract():
@@ -9,3 +15,52 @@ def test_package_imports_and_component_contract():
     assert callable(chess_notation)
 
 
+def test_client_select_mode_highlights_with_one_css_rule():
+    os.environ["REFLEX_BACKEND_ONLY"] = "1"
+
+    import reflex as rx
+    from reflex_chess_notation import NotationLine, chess_notation
+
+    class _NotationState(rx.State):
+        selected: str = "n:0"
+        lines: list[NotationLine] = []
+
+        def select(self, payload: dict) -> None:
+            pass
+
+    server = str(chess_notation(_NotationState.lines, _NotationState.selected, _NotationState.select).render())
+    client = str(
+        chess_notation(
+            _NotationState.lines, _NotationState.selected, _NotationState.select, client_select=True
+        ).render()
+    )
+    # Tokens no longer compare against the selection; one <style> rule does.
+    assert "data-node-id" not in server
+    assert "data-node-id" in client
+    assert "ReflexChessNotationSelection" in client
+    assert "reflex-chess:select" in client
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+def test_client_select_ignores_stale_echoes_of_clicks():
+    os.environ["REFLEX_BACKEND_ONLY"] = "1"
+
+    from reflex_chess_notation.notation import _SelectionStyle
+
+    code = _SelectionStyle._get_custom_code(_SelectionStyle)
+    helper = re.search(r"^function reflexChessNotationResolveSelection\(.*?^}$", code, re.S | re.M).group(0)
+    # Clicks on A then B; the server echoes A, then B, then selects C itself.
+    script = helper + """
+    let pending = ["A", "B"];
+    let highlighted = "B";
+    const log = [];
+    for (const id of ["A", "B", "C"]) {
+      const r = reflexChessNotationResolveSelection(pending, id);
+      pending = r.pending;
+      if (!r.echo) highlighted = id;
+      log.push([highlighted, pending.length]);
+    }
+    console.log(JSON.stringify(log));
+    """
+    out = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True).stdout
+    assert json.loads(out) == [["B", 1], ["B", 0], ["C", 0]]
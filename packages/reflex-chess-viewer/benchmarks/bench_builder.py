@@ -0,0 +1,46 @@
+"""Benchmark: incremental vs replay-from-root GameTreeBuilder.
+
+Run from the repo root:
+
+    uv run python packages/reflex-chess-viewer/benchmarks/bench_builder.py
+"""
+
+from __future__ import annotations
+
+import json
+import time
+
+from reflex_chess_viewer import GameTreeBuilder
+from synthetic import variation_heavy_pgn
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    print(f"{'plies':>6} {'nodes':>7} {'replay ms':>10} {'incr ms':>9} {'speedup':>8}")
+    for plies in (40, 120, 240):
+        pgn = variation_heavy_pgn(plies=plies)
+        replay = GameTreeBuilder(incremental=False)
+        incr = GameTreeBuilder()
+
+        a = replay.build(pgn)
+        b = incr.build(pgn)
+        assert json.dumps(a) == json.dumps(b), "builder modes diverged"
+
+        t_replay = _best_of(lambda: replay.build(pgn), repeat=3)  # noqa: B023
+        t_incr = _best_of(lambda: incr.build(pgn), repeat=3)  # noqa: B023
+        print(
+            f"{plies:>6} {len(b['nodes']):>7} {t_replay * 1000:>10.1f} "
+            f"{t_incr * 1000:>9.1f} {t_replay / t_incr:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark: picking one game out of a large PGN file.
+
+Compares a full parse of every game, a `read_headers` pass, a raw `PgnIndex`
+scan, and fetching the last game via `skip_game` vs `build_at(offset)`.
+
+    uv run python packages/reflex-chess-viewer/benchmarks/bench_index.py [games]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from reflex_chess_viewer import GameTreeBuilder, PgnIndex
+from reflex_chess_viewer.builder import iter_headers, read_nth_game
+from synthetic import variation_heavy_pgn
+
+
+def _timed(label: str, fn) -> object:
+    t0 = time.perf_counter()
+    out = fn()
+    print(f"{label:<34} {(time.perf_counter() - t0) * 1000:>10.1f} ms")
+    return out
+
+
+def main() -> None:
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    pgn = "\n".join(variation_heavy_pgn(plies=80, variation_rate=0.1, seed=i) for i in range(games))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "db.pgn"
+        path.write_text(pgn, encoding="utf-8")
+        print(f"{games} games, {path.stat().st_size / 1e6:.1f} MB\n")
+
+        def parse_all() -> int:
+            with path.open(encoding="utf-8") as f:
+                return sum(1 for _ in GameTreeBuilder().build_many(f))
+
+        def headers_pass() -> int:
+            with path.open(encoding="utf-8") as f:
+                return sum(1 for _ in iter_headers(f))
+
+        _timed("build_many (every game)", parse_all)
+        _timed("iter_headers (read_headers)", headers_pass)
+        index = _timed("PgnIndex.scan_path", lambda: PgnIndex.scan_path(path))
+        assert isinstance(index, PgnIndex) and len(index) == games
+
+        idx_path = Path(tmp) / "db.idx.json"
+        index.save(idx_path)
+        print(f"{'index on disk':<34} {idx_path.stat().st_size / 1e3:>10.1f} KB")
+        _timed("PgnIndex.load", lambda: PgnIndex.load(idx_path))
+        print()
+
+        def last_via_skip() -> object:
+            with path.open(encoding="utf-8") as f:
+                return GameTreeBuilder().build_game(read_nth_game(f, games - 1))
+
+        def last_via_offset() -> object:
+            with path.open("rb") as f:
+                return GameTreeBuilder().build_at(f, index[games - 1].offset)
+
+        a = _timed("last game: skip_game + build", last_via_skip)
+        b = _timed("last game: build_at(offset)", last_via_offset)
+        assert a == b
+
+
+if __name__ == "__main__":
+    main()
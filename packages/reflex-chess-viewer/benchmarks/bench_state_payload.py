@@ -0,0 +1,45 @@
+"""Measure the websocket payload of ChessViewerState on game load and navigation.
+
+"before" adds the full tree to the load delta, which is what the client received
+while `tree` was a public state var; "after" is the actual delta now that the
+tree is backend-only.
+
+    uv run python packages/reflex-chess-viewer/benchmarks/bench_state_payload.py
+"""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("REFLEX_BACKEND_ONLY", "1")
+
+from reflex.utils.format import json_dumps  # noqa: E402
+from reflex_chess_viewer import ChessViewerState  # noqa: E402
+from synthetic import variation_heavy_pgn  # noqa: E402
+
+
+def _delta_bytes(state: ChessViewerState) -> int:
+    size = len(json_dumps(state.get_delta()).encode("utf-8"))
+    state._clean()
+    return size
+
+
+def main() -> None:
+    print(f"{'plies':>6} {'nodes':>7} {'load before':>12} {'load after':>11} {'nav':>7}")
+    for plies in (60, 120, 240):
+        state = ChessViewerState(_reflex_internal_init=True)  # type: ignore[call-arg]
+        state.load_pgn_text(variation_heavy_pgn(plies=plies))
+        tree_bytes = len(json_dumps(state._tree).encode("utf-8"))
+        after = _delta_bytes(state)
+
+        state.nav_forward()
+        nav = _delta_bytes(state)
+
+        print(
+            f"{plies:>6} {len(state._tree['nodes']):>7} {(after + tree_bytes) / 1024:>10.1f}KB "
+            f"{after / 1024:>9.1f}KB {nav:>6}B"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Deterministic synthetic PGN generators shared by the benchmark scripts."""
+
+from __future__ import annotations
+
+import random
+
+import chess
+import chess.pgn
+
+
+def _random_line(
+    node: chess.pgn.GameNode,
+    board: chess.Board,
+    *,
+    plies: int,
+    rng: random.Random,
+    variation_rate: float,
+    variation_plies: int,
+    depth: int,
+    max_depth: int,
+) -> None:
+    for ply in range(plies):
+        moves = list(board.legal_moves)
+        if not moves:
+            return
+        move = rng.choice(moves)
+
+        # Sidelines branch off at the same parent as the mainline move.
+        if depth < max_depth and len(moves) > 1 and rng.random() < variation_rate:
+            alt = rng.choice([m for m in moves if m != move])
+            side = node.add_variation(alt, comment=f"sideline d{depth + 1}")
+            side_board = board.copy(stack=False)
+            side_board.push(alt)
+            _random_line(
+                side,
+                side_board,
+                plies=variation_plies,
+                rng=rng,
+                variation_rate=variation_rate,
+                variation_plies=variation_plies // 2,
+                depth=depth + 1,
+                max_depth=max_depth,
+            )
+
+        node = node.add_main_variation(move, comment="" if ply % 7 else "annotated move")
+        if ply % 11 == 0:
+            node.nags.add(chess.pgn.NAG_GOOD_MOVE)
+        board.push(move)
+
+
+def variation_heavy_pgn(
+    *,
+    plies: int = 120,
+    variation_rate: float = 0.25,
+    variation_plies: int = 16,
+    max_depth: int = 2,
+    seed: int = 1,
+) -> str:
+    """A long annotated game with nested sidelines (random legal moves)."""
+    rng = random.Random(seed)
+    game = chess.pgn.Game()
+    game.headers["Event"] = f"Synthetic {plies} plies (seed {seed})"
+    board = game.board()
+    _random_line(
+        game,
+        board,
+        plies=plies,
+        rng=rng,
+        variation_rate=variation_rate,
+        variation_plies=variation_plies,
+        depth=0,
+        max_depth=max_depth,
+    )
+    return str(game) + "\n"
+
@@ -1,12 +1,24 @@
 from .builder import GameTreeBuilder
-from .projection import project_shapes_to_board_options
+from .cache import GameCache, PgnStore, game_cache, pgn_store
+from .index import PgnIndex, PgnIndexEntry
+from .navigation import build_nav_table, nav_ids
+from .projection import project_shapes_to_board_options, project_tree_shapes
 from .viewer import ChessViewerState, chess_viewer
 
 __all__ = [
     "ChessViewerState",
+    "GameCache",
     "GameTreeBuilder",
+    "PgnIndex",
+    "PgnIndexEntry",
+    "PgnStore",
+    "build_nav_table",
     "chess_viewer",
+    "game_cache",
+    "nav_ids",
+    "pgn_store",
     "project_shapes_to_board_options",
+    "project_tree_shapes",
 ]
 
 
@@ -1,18 +1,20 @@
 from __future__ import annotations
 
 import io
+from collections.abc import Iterator
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, BinaryIO, TextIO
 
 import chess.pgn
 
 from reflex_chess_model.types import MoveInfo, PackedGameTree
 
 
-def _node_id_from_path(path: list[int]) -> str:
-    if not path:
-        return "n:root"
-    return "n:" + ".".join(str(i) for i in path)
+def _child_node_id(parent_id: str, index: int) -> str:
+    """Path ids: `n:root`, its children `n:0`, `n:1`, their children `n:0.0`, ..."""
+    if parent_id == "n:root":
+        return f"n:{index}"
+    return f"{parent_id}.{index}"
 
 
 def _split_comment(text: str | None) -> list[str]:
@@ -24,16 +26,67 @@ def _split_comment(text: str | None) -> list[str]:
     return [s]
 
 
+def _san(board: chess.Board, move: chess.Move) -> str:
+    try:
+        return board.san(move)
+    except Exception:
+        return "?"
+
+
 @dataclass(frozen=True, slots=True)
 class GameTreeBuilder:
+    """PGN -> PackedGameTree v1 (python-chess).
+
+    `incremental=True` (default) carries a single board through the walk and
+    derives FEN/SAN/ply with push/pop, so the build is linear in the number of
+    nodes. `incremental=False` keeps the original behavior of replaying every
+    node from the root via `GameNode.board()` (quadratic, kept for comparison).
+    Both modes produce identical trees.
+
+    `indices=False` omits the derived `nodeByFen`/`nextMainline`/`prevMainline`
+    maps; consumers read them through `reflex_chess_model.TreeIndex` or the
+    `reflex_chess_model.utils` accessors.
+    """
+
+    incremental: bool = True
+    indices: bool = True
+
     def build(self, pgn: str) -> PackedGameTree:
+        """Build the first game of a PGN string."""
         game = chess.pgn.read_game(io.StringIO(pgn))
         if game is None:
             raise ValueError("PGN: no game found")
+        return self.build_game(game)
+
+    def build_many(self, stream: TextIO) -> Iterator[PackedGameTree]:
+        """Yield one tree per game, reading `stream` lazily.
 
+        Only the game currently being converted is held in memory.
+        """
+        while True:
+            game = chess.pgn.read_game(stream)
+            if game is None:
+                return
+            yield self.build_game(game)
+
+    def build_at(self, fp: BinaryIO, offset: int) -> PackedGameTree:
+        """Seek a binary PGN stream to a game offset (see `PgnIndex`) and build only that game."""
+        fp.seek(offset)
+        text = io.TextIOWrapper(fp, encoding="utf-8", errors="replace")
+        try:
+            game = chess.pgn.read_game(text)
+        finally:
+            text.detach()
+        if game is None:
+            raise ValueError(f"PGN: no game found at offset {offset}")
+        return self.build_game(game)
+
+    def build_game(self, game: chess.pgn.Game) -> PackedGameTree:
+        """Build a tree from an already parsed python-chess game."""
         headers = {str(k): str(v) for k, v in dict(game.headers).items()}
         board0 = game.board()
         initial_fen = headers.get("FEN") or board0.fen()
+        game_ply = game.ply()
 
         root_id = "n:root"
         nodes: dict[str, dict[str, Any]] = {
@@ -46,61 +99,76 @@ class GameTreeBuilder:
             }
         }
         move_by_node: dict[str, MoveInfo] = {}
-        node_by_fen: dict[str, list[str]] = {initial_fen: [root_id]}
-
-        def walk(parent: chess.pgn.GameNode, parent_id: str, parent_path: list[int]) -> None:
-            variations = list(parent.variations)
-            children_ids: list[str] = []
-
-            for i, child in enumerate(variations):
-                path = [*parent_path, i]
-                node_id = _node_id_from_path(path)
-
-                # Board after move.
-                b = child.board()
-                fen = b.fen()
-
-                nodes[node_id] = {
-                    "id": node_id,
-                    "ply": child.ply(),
-                    "fen": fen,
-                    "parent": parent_id,
-                    "children": [],
-                }
+        node_by_fen: dict[str, list[str]] | None = {initial_fen: [root_id]} if self.indices else None
+
+        # Shared board for incremental mode: always positioned at the node on top
+        # of the stack while its variations are visited.
+        board = board0
+
+        # Explicit-stack pre-order walk (no recursion, so depth is only bounded by
+        # memory). Frame: [game_node, node_id, next_variation_index, depth].
+        # Visiting order matches the former recursive walk, so dict insertion
+        # order (and the serialized tree) is unchanged.
+        stack: list[list[Any]] = [[game, root_id, 0, 0]]
+        while stack:
+            frame = stack[-1]
+            parent, parent_id, i, depth = frame
+            variations = parent.variations
+            if i >= len(variations):
+                stack.pop()
+                if self.incremental and stack:
+                    board.pop()
+                continue
+            frame[2] = i + 1
+
+            child = variations[i]
+            node_id = _child_node_id(parent_id, i)
+
+            if self.incremental:
+                san = _san(board, child.move)
+                board.push(child.move)
+                fen = board.fen()
+                ply = game_ply + depth + 1
+            else:
+                # Board after move (replayed from the root).
+                fen = child.board().fen()
+                san = _san(parent.board(), child.move)
+                ply = child.ply()
+
+            nodes[node_id] = {
+                "id": node_id,
+                "ply": ply,
+                "fen": fen,
+                "parent": parent_id,
+                "children": [],
+            }
+            nodes[parent_id]["children"].append(node_id)
+            if node_by_fen is not None:
                 node_by_fen.setdefault(fen, []).append(node_id)
 
-                # MoveInfo for the node (move that leads into it).
-                try:
-                    san = parent.board().san(child.move)
-                except Exception:
-                    san = "?"
+            # MoveInfo for the node (move that leads into it).
+            uci = None
+            try:
+                uci = child.move.uci()
+            except Exception:
                 uci = None
-                try:
-                    uci = child.move.uci()
-                except Exception:
-                    uci = None
-
-                nags = sorted(int(n) for n in getattr(child, "nags", set()) or set())
-                pre = _split_comment(getattr(child, "starting_comment", None))
-                post = _split_comment(getattr(child, "comment", None))
 
-                mi: dict[str, Any] = {
-                    "san": san,
-                    "nags": nags,
-                    "preComments": pre,
-                    "postComments": post,
-                    "annotations": {"shapes": []},
-                }
-                if uci:
-                    mi["uci"] = uci
-                move_by_node[node_id] = mi  # type: ignore[assignment]
+            nags = sorted(int(n) for n in getattr(child, "nags", set()) or set())
+            pre = _split_comment(getattr(child, "starting_comment", None))
+            post = _split_comment(getattr(child, "comment", None))
 
-                children_ids.append(node_id)
-                walk(child, node_id, path)
-
-            nodes[parent_id]["children"] = children_ids
+            mi: dict[str, Any] = {
+                "san": san,
+                "nags": nags,
+                "preComments": pre,
+                "postComments": post,
+                "annotations": {"shapes": []},
+            }
+            if uci:
+                mi["uci"] = uci
+            move_by_node[node_id] = mi  # type: ignore[assignment]
 
-        walk(game, root_id, [])
+            stack.append([child, node_id, 0, depth + 1])
 
         # mainline indices
         mainline: list[str] = [root_id]
@@ -112,23 +180,48 @@ class GameTreeBuilder:
             cur = ch[0]
             mainline.append(cur)
 
-        next_mainline: dict[str, str | None] = {}
-        prev_mainline: dict[str, str | None] = {}
-        for idx, nid in enumerate(mainline):
-            prev_mainline[nid] = mainline[idx - 1] if idx > 0 else None
-            next_mainline[nid] = mainline[idx + 1] if idx + 1 < len(mainline) else None
-
-        return {
+        tree: dict[str, Any] = {
             "version": 1,
             "headers": headers,
             "initialFen": initial_fen,
             "rootId": root_id,
-            "nodes": nodes,  # type: ignore[return-value]
+            "nodes": nodes,
             "moveByNode": {k: v for k, v in move_by_node.items() if k != root_id},
-            "nodeByFen": node_by_fen,
-            "mainline": mainline,
-            "nextMainline": next_mainline,
-            "prevMainline": prev_mainline,
         }
+        if node_by_fen is None:
+            tree["mainline"] = mainline
+            return tree  # type: ignore[return-value]
 
+        next_mainline: dict[str, str | None] = {}
+        prev_mainline: dict[str, str | None] = {}
+        for idx, nid in enumerate(mainline):
+            prev_mainline[nid] = mainline[idx - 1] if idx > 0 else None
+            next_mainline[nid] = mainline[idx + 1] if idx + 1 < len(mainline) else None
 
+        tree["nodeByFen"] = node_by_fen
+        tree["mainline"] = mainline
+        tree["nextMainline"] = next_mainline
+        tree["prevMainline"] = prev_mainline
+        return tree  # type: ignore[return-value]
+
+
+def iter_headers(stream: TextIO) -> Iterator[dict[str, str]]:
+    """Yield the headers of every game in `stream` without parsing the moves."""
+    while True:
+        headers = chess.pgn.read_headers(stream)
+        if headers is None:
+            return
+        yield {str(k): str(v) for k, v in dict(headers).items()}
+
+
+def read_nth_game(stream: TextIO, index: int) -> chess.pgn.Game:
+    """Skip `index` games and parse the next one."""
+    if index < 0:
+        raise ValueError(f"PGN: game index must be >= 0, got {index}")
+    for _ in range(index):
+        if not chess.pgn.skip_game(stream):
+            raise ValueError(f"PGN: game #{index} not found")
+    game = chess.pgn.read_game(stream)
+    if game is None:
+        raise ValueError(f"PGN: game #{index} not found")
+    return game
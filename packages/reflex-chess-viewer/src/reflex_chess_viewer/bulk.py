@@ -0,0 +1,240 @@
+"""Bulk conversion of PGN databases to PackedGameTree JSON.
+
+    reflex-chess-bulk games.pgn out/ --workers 8
+    reflex-chess-bulk games.pgn games.jsonl --unordered
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Literal
+
+import chess.pgn
+from reflex_chess_model import validate_tree
+
+from .builder import GameTreeBuilder
+from .index import PgnIndex
+
+OutputFormat = Literal["dir", "jsonl"]
+
+
+@dataclass(frozen=True, slots=True)
+class GameError:
+    index: int
+    offset: int
+    error: str
+    game: int = 0  # > 0: the n-th extra game inside the span of game `index`
+
+
+@dataclass(slots=True)
+class BulkReport:
+    total: int = 0
+    converted: int = 0
+    errors: list[GameError] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class _Result:
+    index: int
+    offset: int
+    payload: str  # serialized tree JSON ("" on error)
+    error: str
+    extra_games: int = 0  # further games found in the same span (not converted)
+
+
+_EXTRA_GAME_ERROR = "ValueError: game without headers after game #{index}; not converted"
+
+
+def _convert_chunk(index: int, offset: int, chunk: bytes) -> _Result:
+    # Runs in worker processes: build + validate + serialize, so the parent only writes.
+    stream = io.StringIO(chunk.decode("utf-8", errors="replace"))
+    try:
+        game = chess.pgn.read_game(stream)
+        if game is None:
+            raise ValueError("PGN: no game found")
+        tree = GameTreeBuilder().build_game(game)
+        validate_tree(tree, level="trusted")
+        payload = json.dumps(tree, ensure_ascii=False, separators=(",", ":"))
+        error = ""
+    except Exception as e:
+        payload, error = "", f"{type(e).__name__}: {e}"
+    # `PgnIndex` starts a game at a header line, so a game without headers is part
+    # of the previous span: count those so they are reported instead of lost.
+    extra = 0
+    while chess.pgn.skip_game(stream):
+        extra += 1
+    return _Result(index=index, offset=offset, payload=payload, error=error, extra_games=extra)
+
+
+def iter_game_chunks(path: str | os.PathLike[str]) -> Iterator[tuple[int, int, bytes]]:
+    """Yield (index, offset, raw_bytes) per game; only one chunk is read at a time."""
+    index = PgnIndex.scan_path(path, header_keys=())
+    with open(path, "rb") as fp:
+        for i, entry in enumerate(index):
+            fp.seek(entry.offset)
+            yield i, entry.offset, fp.read(entry.length)
+
+
+class _Sink:
+    def __init__(self, output: Path, fmt: OutputFormat) -> None:
+        self.fmt = fmt
+        self.output = output
+        self._jsonl: IO[str] | None = None
+        self._errors: IO[str] | None = None
+        if fmt == "jsonl":
+            output.parent.mkdir(parents=True, exist_ok=True)
+            self._jsonl = output.open("w", encoding="utf-8")
+        else:
+            output.mkdir(parents=True, exist_ok=True)
+
+    def write(self, r: _Result) -> None:
+        if self._jsonl is not None:
+            if r.error:
+                line = json.dumps({"index": r.index, "offset": r.offset, "error": r.error}, ensure_ascii=False)
+            else:
+                line = f'{{"index":{r.index},"offset":{r.offset},"tree":{r.payload}}}'
+            self._jsonl.write(line + "\n")
+        elif r.error:
+            self.write_error(GameError(index=r.index, offset=r.offset, error=r.error))
+        else:
+            (self.output / f"{r.index:06d}.json").write_text(r.payload, encoding="utf-8")
+
+    def write_error(self, err: GameError) -> None:
+        record: dict[str, object] = {"index": err.index, "offset": err.offset}
+        if err.game:
+            record["game"] = err.game
+        record["error"] = err.error
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        if self._jsonl is not None:
+            self._jsonl.write(line)
+            return
+        if self._errors is None:
+            self._errors = (self.output / "errors.jsonl").open("w", encoding="utf-8")
+        self._errors.write(line)
+
+    def close(self) -> None:
+        for f in (self._jsonl, self._errors):
+            if f is not None:
+                f.close()
+
+
+def _detect_format(output: Path) -> OutputFormat:
+    return "jsonl" if output.suffix in (".jsonl", ".ndjson") else "dir"
+
+
+def convert_pgn_file(
+    source: str | os.PathLike[str],
+    output: str | os.PathLike[str],
+    *,
+    output_format: OutputFormat | None = None,
+    workers: int | None = None,
+    ordered: bool = True,
+) -> BulkReport:
+    """Convert every game of a PGN file to PackedGameTree JSON.
+
+    - `output`: directory (one `<index>.json` per game, failures in `errors.jsonl`)
+      or a `.jsonl` file (one `{"index", "offset", "tree"|"error"}` object per line).
+    - `workers`: process count (default: all cores); `1` converts in-process.
+    - `ordered`: write results in game order; otherwise as soon as they are ready.
+
+    A failing game is reported and skipped, it never aborts the batch. So is a game
+    without headers that follows another game (`PgnIndex` merges it into that span):
+    it is reported with `"game": n`, the n-th extra game after game `index`.
+    """
+    out = Path(output)
+    fmt = output_format or _detect_format(out)
+    n_workers = workers or os.cpu_count() or 1
+    report = BulkReport()
+    sink = _Sink(out, fmt)
+    t0 = time.perf_counter()
+
+    def emit(r: _Result) -> None:
+        report.total += 1
+        if r.error:
+            report.errors.append(GameError(index=r.index, offset=r.offset, error=r.error))
+        else:
+            report.converted += 1
+        sink.write(r)
+        for n in range(1, r.extra_games + 1):
+            err = GameError(index=r.index, offset=r.offset, error=_EXTRA_GAME_ERROR.format(index=r.index), game=n)
+            report.total += 1
+            report.errors.append(err)
+            sink.write_error(err)
+
+    try:
+        chunks = iter_game_chunks(source)
+        if n_workers <= 1:
+            for i, offset, chunk in chunks:
+                emit(_convert_chunk(i, offset, chunk))
+        else:
+            # Bounded number of chunks in flight, so memory does not grow with the file.
+            max_in_flight = n_workers * 4
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                pending: deque[Future[_Result]] = deque()
+                for i, offset, chunk in chunks:
+                    pending.append(pool.submit(_convert_chunk, i, offset, chunk))
+                    while len(pending) >= max_in_flight:
+                        _drain(pending, emit, ordered=ordered)
+                while pending:
+                    _drain(pending, emit, ordered=ordered)
+    finally:
+        sink.close()
+
+    report.seconds = time.perf_counter() - t0
+    return report
+
+
+def _drain(pending: deque[Future[_Result]], emit, *, ordered: bool) -> None:
+    if ordered:
+        emit(pending.popleft().result())
+        return
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for fut in list(pending):
+        if fut in done:
+            pending.remove(fut)
+            emit(fut.result())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="reflex-chess-bulk",
+        description="Convert a PGN database to PackedGameTree JSON (one tree per game).",
+    )
+    parser.add_argument("source", help="input .pgn file")
+    parser.add_argument("output", help="output directory, or a .jsonl file")
+    parser.add_argument("--format", choices=("dir", "jsonl"), default=None, help="override output format detection")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--unordered", action="store_true", help="write results as soon as they are ready")
+    args = parser.parse_args(argv)
+
+    report = convert_pgn_file(
+        args.source,
+        args.output,
+        output_format=args.format,
+        workers=args.workers,
+        ordered=not args.unordered,
+    )
+    for err in report.errors:
+        where = f"game #{err.index}" + (f" +{err.game}" if err.game else "")
+        print(f"{where} (offset {err.offset}): {err.error}", file=sys.stderr)
+    print(
+        f"{report.converted}/{report.total} games converted, {len(report.errors)} failed "
+        f"in {report.seconds:.2f}s",
+        file=sys.stderr,
+    )
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
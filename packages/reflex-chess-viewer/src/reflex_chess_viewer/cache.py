@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction is still serialized within the process
+    fcntl = None  # type: ignore[assignment]
+
+from reflex_chess_model import TreeIndex
+from reflex_chess_model.types import PackedGameTree
+from reflex_chess_notation import index_lines
+
+from .navigation import build_nav_table
+from .projection import project_tree_shapes
+
+
+@dataclass(frozen=True, slots=True)
+class CachedGame:
+    """A built game shared between sessions. Treat as read-only."""
+
+    tree: PackedGameTree
+    notation_lines: list[Any]
+    size: int  # approximate bytes
+    # Lazily derived lookups (mainline steps, transpositions), shared like the tree.
+    index: TreeIndex = field(init=False)
+    # node_id -> notation line index (windowed notation).
+    line_of: dict[str, int] = field(init=False)
+    # node_id -> projected annotation shapes (nodes that have any).
+    shapes: dict[str, dict[str, Any]] = field(init=False)
+    # Client-side navigation table (`build_nav_table`).
+    nav: dict[str, Any] = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "index", TreeIndex(self.tree))
+        object.__setattr__(self, "line_of", index_lines(self.notation_lines))
+        object.__setattr__(self, "shapes", project_tree_shapes(self.tree))
+        object.__setattr__(self, "nav", build_nav_table(self.tree, self.shapes))
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+def normalize_pgn(pgn: str) -> str:
+    """Drop BOM, line-ending and trailing-whitespace differences between uploads."""
+    text = pgn.lstrip("\ufeff").strip()
+    return "\n".join(line.rstrip() for line in text.splitlines())
+
+
+def _approx_size(tree: Mapping[str, Any], notation_lines: list[Any]) -> int:
+    tokens = sum(len(getattr(line, "tokens", ()) or ()) for line in notation_lines)
+    return len(json.dumps(tree, separators=(",", ":"))) + 64 * tokens
+
+
+class GameCache:
+    """Process-wide LRU of built games keyed by PGN content + notation options.
+
+    Bounded by entry count and by approximate size in bytes.
+    """
+
+    def __init__(self, *, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, CachedGame] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def key(pgn: str, notation_options: Mapping[str, Any] | None = None) -> str:
+        h = hashlib.sha256(normalize_pgn(pgn).encode("utf-8"))
+        h.update(b"\0")
+        h.update(json.dumps(dict(notation_options or {}), sort_keys=True, default=str).encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key: str) -> CachedGame | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: str, tree: PackedGameTree, notation_lines: list[Any]) -> CachedGame:
+        entry = CachedGame(tree=tree, notation_lines=notation_lines, size=_approx_size(tree, notation_lines))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            if entry.size > self.max_bytes:
+                return entry  # never fits; don't flush everything else for it
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self._evictions += 1
+        return entry
+
+    def get_or_build(
+        self,
+        pgn: str,
+        notation_options: Mapping[str, Any] | None,
+        build: Callable[[], tuple[PackedGameTree, list[Any]]],
+    ) -> CachedGame:
+        key = self.key(pgn, notation_options)
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+        tree, lines = build()
+        return self.put(key, tree, lines)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+
+_GAME_CACHE = GameCache()
+
+
+def game_cache() -> GameCache:
+    """The process-wide cache used by `ChessViewerState`."""
+    return _GAME_CACHE
+
+
+class PgnStore:
+    """Uploaded PGN files spooled to disk, keyed by content hash.
+
+    Sessions keep only the key (plus game spans) and read single games back with a
+    seek, so an upload is never part of the (possibly serialized) session state.
+    The default directory is shared by all worker processes on the host and across
+    restarts, so the bound applies to the directory itself: every `put` scans it
+    under a lock file and deletes the least recently used files (by mtime, which
+    `open` refreshes) until it holds at most `max_bytes`.
+    """
+
+    # Interrupted writes older than this are removed by the next `put`.
+    _PART_MAX_AGE = 3600.0
+
+    def __init__(self, directory: str | os.PathLike[str] | None = None, *, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.directory = os.fspath(directory or os.path.join(tempfile.gettempdir(), "reflex-chess-pgn"))
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> str:
+        if not key or not all(c in "0123456789abcdef" for c in key):
+            raise ValueError(f"PGN: invalid upload key {key!r}")
+        return os.path.join(self.directory, key + ".pgn")
+
+    def put(self, fp: BinaryIO, *, chunk_size: int = 1 << 20) -> str:
+        """Copy a binary stream into the store and return its key (sha256 of the bytes)."""
+        os.makedirs(self.directory, exist_ok=True)
+        h = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while chunk := fp.read(chunk_size):
+                    h.update(chunk)
+                    out.write(chunk)
+            key = h.hexdigest()
+            os.replace(tmp, self.path(key))  # same content -> same file
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._evict(keep=key)
+        return key
+
+    def put_bytes(self, data: bytes) -> str:
+        return self.put(io.BytesIO(data))
+
+    def open(self, key: str) -> BinaryIO:
+        path = self.path(key)
+        try:
+            fp = open(path, "rb")  # noqa: SIM115 - caller closes
+        except FileNotFoundError:
+            raise ValueError("PGN: the uploaded file is no longer available, load it again") from None
+        try:
+            os.utime(path)  # recently used: evicted last
+        except OSError:
+            pass
+        return fp
+
+    def read(self, key: str, offset: int = 0, length: int = -1) -> bytes:
+        """`length` bytes at `offset` (-1: to the end of the file)."""
+        with self.open(key) as fp:
+            fp.seek(offset)
+            return fp.read(length)
+
+    def size(self) -> int:
+        """Bytes of stored uploads in the directory (all processes)."""
+        return sum(size for _, _, size in self._files())
+
+    def _files(self) -> list[tuple[int, str, int]]:
+        out: list[tuple[int, str, int]] = []
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return out
+        for entry in entries:
+            if not entry.name.endswith(".pgn"):
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue  # evicted by another process meanwhile
+            out.append((st.st_mtime_ns, entry.path, st.st_size))
+        return out
+
+    def _evict(self, *, keep: str) -> None:
+        keep_path = self.path(keep)
+        with self._lock, _DirLock(os.path.join(self.directory, ".lock")):
+            files = sorted(self._files())
+            total = sum(size for _, _, size in files)
+            for _, path, size in files:
+                if total <= self.max_bytes:
+                    break
+                if path == keep_path:
+                    continue
+                _unlink(path)
+                total -= size
+            now = time.time()
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".part"):
+                    try:
+                        if now - entry.stat().st_mtime > self._PART_MAX_AGE:
+                            _unlink(entry.path)
+                    except FileNotFoundError:
+                        pass
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class _DirLock:
+    """Exclusive lock file shared by processes (no-op where `fcntl` is missing)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fd = -1
+
+    def __enter__(self) -> _DirLock:
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+
+
+_PGN_STORE = PgnStore()
+
+
+def pgn_store() -> PgnStore:
+    """The process-wide upload store used by `ChessViewerState`."""
+    return _PGN_STORE
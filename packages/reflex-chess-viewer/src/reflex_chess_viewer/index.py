@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any, BinaryIO
+
+_HEADER_RE = re.compile(rb'^\s*\[([A-Za-z0-9_+#=:-]+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_ESCAPE_RE = re.compile(r"\\(.)")
+_BOM = b"\xef\xbb\xbf"
+
+INDEX_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class PgnIndexEntry:
+    offset: int  # byte offset of the first header line
+    length: int  # bytes up to the next game (or EOF)
+    headers: dict[str, str]
+
+
+def _decode_value(raw: bytes) -> str:
+    s = raw.decode("utf-8", errors="replace")
+    return _ESCAPE_RE.sub(r"\1", s) if "\\" in s else s
+
+
+def _comment_state(line: bytes, in_comment: bool) -> bool:
+    """Track `{...}` comments across movetext lines (`;` comments end at EOL)."""
+    i = 0
+    n = len(line)
+    while i < n:
+        if in_comment:
+            j = line.find(b"}", i)
+            if j < 0:
+                return True
+            in_comment = False
+            i = j + 1
+            continue
+        j = line.find(b"{", i)
+        k = line.find(b";", i)
+        if j < 0:
+            return False
+        if 0 <= k < j:
+            return False
+        in_comment = True
+        i = j + 1
+    return in_comment
+
+
+def _scan(fp: BinaryIO, keys: frozenset[str] | None) -> Iterator[tuple[int, dict[str, str]]]:
+    """Yield (offset, headers) for every game start, in a single pass over raw lines."""
+    pos = fp.tell()
+    in_headers = False
+    in_comment = False
+    headers: dict[str, str] = {}
+    start = -1
+    seen_content = False
+
+    for line in fp:
+        line_start = pos
+        pos += len(line)
+        if line_start == 0 and line.startswith(_BOM):
+            line = line[len(_BOM) :]
+
+        if in_comment:
+            in_comment = _comment_state(line, True)
+            continue
+
+        m = _HEADER_RE.match(line)
+        if m is not None:
+            if not in_headers:
+                if start >= 0:
+                    yield start, headers
+                start = line_start
+                headers = {}
+                in_headers = True
+            key = m.group(1).decode("ascii")
+            if keys is None or key in keys:
+                headers[key] = _decode_value(m.group(2))
+            seen_content = True
+            continue
+
+        stripped = line.strip()
+        if not stripped or stripped.startswith(b"%"):
+            continue
+
+        # Movetext.
+        if not seen_content:
+            # Headerless game at the beginning of the file.
+            start = line_start
+            headers = {}
+            seen_content = True
+        in_headers = False
+        in_comment = _comment_state(line, False)
+
+    if start >= 0:
+        yield start, headers
+
+
+@dataclass(frozen=True, slots=True)
+class PgnIndex:
+    """Byte-offset index of the games in a PGN file (one raw scan, no move parsing).
+
+    Games are split at header blocks, so a game without headers that follows
+    another game is treated as part of the previous one.
+    """
+
+    entries: tuple[PgnIndexEntry, ...]
+    size: int  # source size in bytes at scan time (staleness check)
+
+    @classmethod
+    def scan(cls, fp: BinaryIO, *, header_keys: Iterable[str] | None = None) -> PgnIndex:
+        """Index a binary PGN stream from its current position.
+
+        `header_keys` limits which tags are kept (all tags by default).
+        """
+        keys = None if header_keys is None else frozenset(header_keys)
+        starts = list(_scan(fp, keys))
+        end = fp.tell()
+        entries: list[PgnIndexEntry] = []
+        for i, (offset, headers) in enumerate(starts):
+            nxt = starts[i + 1][0] if i + 1 < len(starts) else end
+            entries.append(PgnIndexEntry(offset=offset, length=nxt - offset, headers=headers))
+        return cls(entries=tuple(entries), size=end)
+
+    @classmethod
+    def scan_path(cls, path: str | os.PathLike[str], *, header_keys: Iterable[str] | None = None) -> PgnIndex:
+        with open(path, "rb") as fp:
+            return cls.scan(fp, header_keys=header_keys)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, index: int) -> PgnIndexEntry:
+        return self.entries[index]
+
+    def __iter__(self) -> Iterator[PgnIndexEntry]:
+        return iter(self.entries)
+
+    def read_bytes(self, fp: BinaryIO, index: int) -> bytes:
+        """Raw PGN bytes of one game."""
+        entry = self.entries[index]
+        fp.seek(entry.offset)
+        return fp.read(entry.length)
+
+    # Compact on-disk form: header keys are stored once, values positionally.
+    def to_json(self) -> dict[str, Any]:
+        keys: list[str] = []
+        slot: dict[str, int] = {}
+        for e in self.entries:
+            for k in e.headers:
+                if k not in slot:
+                    slot[k] = len(keys)
+                    keys.append(k)
+        games: list[list[Any]] = []
+        for e in self.entries:
+            values: list[str | None] = [None] * len(keys)
+            for k, v in e.headers.items():
+                values[slot[k]] = v
+            while values and values[-1] is None:
+                values.pop()
+            games.append([e.offset, e.length, values])
+        return {"version": INDEX_VERSION, "size": self.size, "keys": keys, "games": games}
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> PgnIndex:
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"PgnIndex.version: expected {INDEX_VERSION}, got {data.get('version')!r}")
+        keys: Sequence[str] = data["keys"]
+        entries = tuple(
+            PgnIndexEntry(
+                offset=int(offset),
+                length=int(length),
+                headers={k: v for k, v in zip(keys, values, strict=False) if v is not None},
+            )
+            for offset, length, values in data["games"]
+        )
+        return cls(entries=entries, size=int(data["size"]))
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> PgnIndex:
+        with open(path, encoding="utf-8") as f:
+            return cls.from_json(json.load(f))
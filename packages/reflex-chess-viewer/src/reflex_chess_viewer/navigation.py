@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from .builder import _child_node_id
+from .projection import project_tree_shapes
+
+
+def build_nav_table(
+    tree: Mapping[str, Any], node_shapes: Mapping[str, Mapping[str, Any]] | None = None
+) -> dict[str, Any]:
+    """Compact per-node table for client-side navigation (`chessboard(nav=...)`).
+
+    Sent to the browser once per game. Nodes are numbered depth-first from the
+    root (index 0), columns are parallel lists:
+
+    - `ids`, `fens`: node id and FEN. `ids` is left out when every id follows the
+      builder's path scheme (`n:0.1` = 2nd child of `n:0`): the client rebuilds
+      them from `root` + `parent` (see `nav_ids`), which keeps deep trees small;
+    - `parent`: parent index (-1 for the root);
+    - `child`: first child index (-1 at a leaf). On the mainline `child`/`parent`
+      are the mainline next/prev steps; inside a variation they follow it;
+    - `moves`: UCI of the move leading to the node ("" for the root), for the
+      last-move highlight;
+    - `end`: index of the last mainline node;
+    - `shapes`: sparse `{index: {"arrows": [...], "squareStyles": {...}}}` with the
+      projected annotations of the nodes that have any (`node_shapes`, computed
+      with `project_tree_shapes` when not given).
+    """
+    nodes = tree.get("nodes") or {}
+    move_by_node = tree.get("moveByNode") or {}
+    if node_shapes is None:
+        node_shapes = project_tree_shapes(tree)
+    root_id = tree.get("rootId")
+    if root_id not in nodes:
+        return {"root": "", "ids": [], "fens": [], "parent": [], "child": [], "moves": [], "end": -1, "shapes": {}}
+
+    ids: list[str] = []
+    fens: list[str] = []
+    parent: list[int] = []
+    child: list[int] = []
+    moves: list[str] = []
+    shapes: dict[str, dict[str, Any]] = {}
+
+    stack: list[tuple[str, int]] = [(root_id, -1)]
+    while stack:
+        nid, parent_idx = stack.pop()
+        idx = len(ids)
+        node = nodes[nid]
+        ids.append(nid)
+        fens.append(node["fen"])
+        parent.append(parent_idx)
+        child.append(-1)
+        moves.append((move_by_node.get(nid) or {}).get("uci") or "")
+        if parent_idx >= 0 and child[parent_idx] < 0:
+            child[parent_idx] = idx
+
+        projected = node_shapes.get(nid)
+        if projected:
+            shapes[str(idx)] = projected
+
+        # Reversed so the first child is numbered (and linked) first.
+        stack.extend((c, idx) for c in reversed(node.get("children") or ()))
+
+    mainline = tree.get("mainline") or [root_id]
+    position = {nid: i for i, nid in enumerate(ids)}
+    table: dict[str, Any] = {"root": root_id}
+    if _path_ids(root_id, parent) != ids:
+        table["ids"] = ids
+    return {
+        **table,
+        "fens": fens,
+        "parent": parent,
+        "child": child,
+        "moves": moves,
+        "end": position.get(mainline[-1], 0),
+        "shapes": shapes,
+    }
+
+
+def nav_ids(table: Mapping[str, Any]) -> list[str]:
+    """Node ids of a nav table row by row (rebuilt when `ids` was left out)."""
+    ids = table.get("ids")
+    return list(ids) if ids is not None else _path_ids(table["root"], table["parent"])
+
+
+def _path_ids(root_id: str, parent: list[int]) -> list[str]:
+    # Rows are depth-first, so a row's earlier siblings are already numbered.
+    out: list[str] = []
+    kids = [0] * len(parent)
+    for p in parent:
+        if p < 0:
+            out.append(root_id)
+            continue
+        out.append(_child_node_id(out[p], kids[p]))
+        kids[p] += 1
+    return out
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
 from reflex_chess_model.types import Shape
 
-
 _COLOR = {
     "green": "rgba(34, 197, 94, 0.85)",
     "red": "rgba(239, 68, 68, 0.85)",
     "yellow": "rgba(234, 179, 8, 0.85)",
     "blue": "rgba(59, 130, 246, 0.85)",
 }
+_DEFAULT_COLOR = "rgba(0,0,0,0.6)"
+# Square highlights use the same colors, more transparent.
+_SQUARE_COLOR = {name: color.replace("0.85", "0.28") for name, color in _COLOR.items()}
 
 
 def project_shapes_to_board_options(shapes: list[Shape]) -> dict[str, Any]:
@@ -20,21 +23,28 @@ def project_shapes_to_board_options(shapes: list[Shape]) -> dict[str, Any]:
 
     for s in shapes or []:
         kind = s.get("kind")
-        color = _COLOR.get(s.get("color"), "rgba(0,0,0,0.6)")
         if kind == "arrow":
             arrows.append(
                 {
                     "startSquare": s.get("from"),
                     "endSquare": s.get("to"),
-                    "color": color,
+                    "color": _COLOR.get(s.get("color"), _DEFAULT_COLOR),
                 }
             )
         elif kind == "square":
             sq = s.get("square")
             if sq:
                 # last one wins (deterministic)
-                square_styles[str(sq)] = {"backgroundColor": color.replace("0.85", "0.28")}
+                square_styles[str(sq)] = {"backgroundColor": _SQUARE_COLOR.get(s.get("color"), _DEFAULT_COLOR)}
 
     return {"arrows": arrows, "squareStyles": square_styles}
 
 
+def project_tree_shapes(tree: Mapping[str, Any]) -> dict[str, dict[str, Any]]:
+    """node_id -> projected shapes, for the nodes that have any."""
+    out: dict[str, dict[str, Any]] = {}
+    for nid, mi in (tree.get("moveByNode") or {}).items():
+        shapes = ((mi or {}).get("annotations") or {}).get("shapes")
+        if shapes:
+            out[nid] = project_shapes_to_board_options(shapes)
+    return out
@@ -1,31 +1,96 @@
 from __future__ import annotations
 
+import json
 from typing import Any
 
 import reflex as rx
-
-from reflex_chess_model import validate_tree
-from reflex_chess_notation import NotationLine, build_notation_lines, chess_notation
+from reflex.event import EventSpec
+
+from reflex_chess_model import (
+    TreeIndex,
+    find_nodes_by_position,
+    next_mainline,
+    prev_mainline,
+    validate_tree,
+)
+from reflex_chess_notation import (
+    MOVE_ID_PREFIX,
+    NotationLine,
+    build_notation_lines,
+    chess_notation,
+    window_offset,
+)
 from reflex_chessboard import chessboard
 
 from .builder import GameTreeBuilder
-from .projection import project_shapes_to_board_options
+from .cache import game_cache, pgn_store
+from .index import PgnIndex
 
 
 UPLOAD_ID = "pgn-upload"
 
+# Tags kept in the game index (what the picker shows).
+_PICKER_HEADERS = ("Event", "Date", "White", "Black", "Result")
+
+
+def _game_summary(index: int, headers: dict[str, str]) -> dict[str, str]:
+    """Header-only record for the game picker."""
+    white = headers.get("White") or "?"
+    black = headers.get("Black") or "?"
+    label = f"{index + 1}. {white} – {black}"
+    extra = ", ".join(v for v in (headers.get("Event"), headers.get("Date")) if v and "?" not in v)
+    if extra:
+        label += f" ({extra})"
+    result = headers.get("Result")
+    if result and result != "*":
+        label += f" {result}"
+    return {"index": str(index), "label": label}
+
+
+def _move_label(tree: Any, node_id: str) -> str:
+    """Move label such as `12. Nf3` / `12... Nf6` ("start" for the root)."""
+    mi = (tree.get("moveByNode") or {}).get(node_id)
+    if not mi:
+        return "start"
+    ply = int(tree["nodes"][node_id]["ply"])
+    number = (ply + 1) // 2
+    return f"{number}. {mi['san']}" if ply % 2 else f"{number}... {mi['san']}"
+
 
 class ChessViewerState(rx.State):
     pgn_error: str = ""
     selected_id: str = "n:root"
     fen: str = "start"
 
-    tree: dict = {}
+    # Full tree stays on the server (backend-only var): the client only needs the
+    # projected fields below (fen, notation_lines, nav_table).
+    _tree: dict = {}
+    # Lazy lookups over `_tree` (shared with the game cache entry).
+    _index: TreeIndex | None = None
+    # Windowed notation: the client only gets `notation_window` lines around the
+    # selection (0 = all); the full list and node -> line map stay on the server.
+    _notation_all: tuple[NotationLine, ...] = ()
+    _line_of: dict[str, int] = {}
     notation_lines: list[NotationLine] = []
-
-    # Optional: user overrides for board/notation (MVP: minimal).
+    notation_window: int = 120
+    notation_offset: int = 0
+    notation_hidden_after: int = 0
+    # Other nodes with the selected position (move counters ignored).
+    transpositions: list[dict[str, str]] = []
+    # Per-node fen/parent/child/shapes table (see `build_nav_table`), sent once per
+    # game: the board navigates in the browser and syncs back via `on_select`.
+    nav_table: dict[str, Any] = {}
+
+    # Multi-game PGN: one header-only summary per game (for the game picker).
+    games: list[dict[str, str]] = []
+    game_index: str = "0"
+    # The upload itself lives in `pgn_store()`; state keeps its key and game spans.
+    _pgn_key: str = ""
+    _game_spans: list[tuple[int, int]] = []
+
+    # Optional: user overrides for board/notation (MVP: minimal). Annotation
+    # shapes are not merged in here: the board takes them per node from `nav_table`.
     board_options: dict[str, Any] = {}
-    board_options_effective: dict[str, Any] = {}
     notation_options: dict[str, Any] = {
         "show_move_numbers": True,
         "show_comments": True,
@@ -34,116 +99,179 @@ class ChessViewerState(rx.State):
         "max_variation_depth": 8,
     }
 
-    def _recompute_effective_board_options(self) -> None:
-        base: dict[str, Any] = dict(self.board_options or {})
+    def _recompute_transpositions(self) -> None:
+        if self._index is None or not self.fen:
+            self.transpositions = []
+            return
+        self.transpositions = [
+            {"node_id": nid, "label": _move_label(self._tree, nid)}
+            for nid in find_nodes_by_position(self._index, self.fen)
+            if nid != self.selected_id
+        ]
+
+    def _show_notation(self, offset: int) -> None:
+        lines = self._notation_all
+        size = self.notation_window if self.notation_window > 0 else len(lines)
+        self.notation_offset = offset
+        self.notation_lines = list(lines[offset : offset + size])
+        self.notation_hidden_after = max(0, len(lines) - offset - size)
+
+    def _follow_selection(self) -> EventSpec:
+        """Move the notation window to the selected move (if needed) and scroll to it."""
+        line = 0 if self.selected_id == self._tree.get("rootId") else self._line_of.get(self.selected_id)
+        if line is not None:  # None: move hidden by max_variation_depth
+            offset = window_offset(
+                line,
+                offset=self.notation_offset,
+                total=len(self._notation_all),
+                size=self.notation_window,
+            )
+            if offset != self.notation_offset:
+                self._show_notation(offset)
+        elem_id = json.dumps(MOVE_ID_PREFIX + self.selected_id)
+        return rx.call_script(
+            f"requestAnimationFrame(() => document.getElementById({elem_id})?.scrollIntoView({{block: 'nearest'}}))"
+        )
+
+    def page_notation(self, direction: int) -> None:
+        total = len(self._notation_all)
+        size = self.notation_window
+        if size <= 0 or total <= size:
+            return
+        step = max(1, size // 2)
+        offset = max(0, min(total - size, self.notation_offset + step * (1 if direction > 0 else -1)))
+        if offset != self.notation_offset:
+            self._show_notation(offset)
 
-        shapes: list[dict[str, Any]] = []
-        try:
-            root_id = str(self.tree.get("rootId") or "n:root")
-            if self.selected_id and self.selected_id != root_id:
-                mbn = self.tree.get("moveByNode") or {}
-                mi = mbn.get(self.selected_id) if isinstance(mbn, dict) else None
-                ann = mi.get("annotations") if isinstance(mi, dict) else None
-                shapes = ann.get("shapes") if isinstance(ann, dict) else []
-        except Exception:
-            shapes = []
-
-        proj = project_shapes_to_board_options(shapes or [])
-
-        # squareStyles: viewer wins on conflicts
-        user_square = base.get("squareStyles") or {}
-        viewer_square = proj.get("squareStyles") or {}
-        if isinstance(user_square, dict) and isinstance(viewer_square, dict):
-            base["squareStyles"] = {**user_square, **viewer_square}
-        else:
-            base["squareStyles"] = viewer_square
-
-        # arrows: merge user + viewer
-        user_arrows = base.get("arrows") or []
-        viewer_arrows = proj.get("arrows") or []
-        if isinstance(user_arrows, list) and isinstance(viewer_arrows, list):
-            base["arrows"] = [*user_arrows, *viewer_arrows]
-        else:
-            base["arrows"] = viewer_arrows
-
-        self.board_options_effective = base
-
-    def _set_from_tree_root(self) -> None:
-        root_id = str(self.tree.get("rootId") or "n:root")
+    def _set_from_tree_root(self) -> EventSpec:
+        root_id = str(self._tree.get("rootId") or "n:root")
         self.selected_id = root_id
-        self.fen = str(self.tree.get("initialFen") or "start")
-        self._recompute_effective_board_options()
+        self.fen = str(self._tree.get("initialFen") or "start")
+        self._recompute_transpositions()
+        return self._follow_selection()
 
     def load_pgn_text(self, pgn: str) -> None:
+        """Load a (possibly multi-game) PGN and show its first game."""
+        self._load_pgn_key(pgn_store().put_bytes(pgn.encode("utf-8")))
+
+    def _load_pgn_key(self, key: str) -> None:
+        # One raw header scan; games are parsed only when selected.
+        index = PgnIndex.scan_path(pgn_store().path(key), header_keys=_PICKER_HEADERS)
+        self._pgn_key = key
+        self._game_spans = [(e.offset, e.length) for e in index]
+        self.games = [_game_summary(i, e.headers) for i, e in enumerate(index)]
+        self._load_game(0)
+
+    def select_game(self, value: str) -> None:
+        try:
+            index = int(value)
+        except (TypeError, ValueError):
+            return
+        self._load_game(index)
+
+    def _game_text(self, index: int) -> str:
+        if not self._game_spans:
+            # Nothing looked like a game: let the builder report it.
+            return pgn_store().read(self._pgn_key).decode("utf-8", errors="replace")
+        if not 0 <= index < len(self._game_spans):
+            raise ValueError(f"PGN: game #{index} not found")
+        offset, length = self._game_spans[index]
+        return pgn_store().read(self._pgn_key, offset, length).decode("utf-8", errors="replace")
+
+    def _load_game(self, index: int) -> None:
         self.pgn_error = ""
+        self.game_index = str(index)
         try:
-            tree = GameTreeBuilder().build(pgn)
-            validate_tree(tree)
+            pgn = self._game_text(index)
+            options = dict(self.notation_options)
+
+            def build() -> tuple[Any, list[NotationLine]]:
+                # Derived maps are left out; navigation uses the model accessors.
+                tree = GameTreeBuilder(indices=False).build(pgn)
+                validate_tree(tree, level="trusted")  # our own builder output
+                return tree, build_notation_lines(tree, options=options)
+
+            # Same game + options (any session, or a re-upload) -> built once.
+            cached = game_cache().get_or_build(pgn, options, build)
         except Exception as e:
-            self.tree = {}
-            self.notation_lines = []
+            self._tree = {}
+            self._index = None
+            self.transpositions = []
+            self._notation_all = ()
+            self._line_of = {}
+            self._show_notation(0)
+            self.nav_table = {}
             self.selected_id = "n:root"
             self.fen = "start"
-            self.board_options_effective = {}
             self.pgn_error = str(e)
             return
 
-        self.tree = tree
+        self._tree = cached.tree  # type: ignore[assignment]
+        self._index = cached.index
+        self._notation_all = tuple(cached.notation_lines)
+        self._line_of = cached.line_of
+        self._show_notation(0)
+        self.nav_table = cached.nav
         self._set_from_tree_root()
-        self.notation_lines = build_notation_lines(tree, options=self.notation_options)
 
-    def on_select(self, payload: dict) -> None:
+    def on_select(self, payload: dict) -> EventSpec | None:
         node_id = payload.get("node_id")
         if not isinstance(node_id, str) or not node_id:
-            return
-        if not self.tree:
-            return
-        nodes = self.tree.get("nodes") or {}
+            return None
+        if not self._tree:
+            return None
+        nodes = self._tree.get("nodes") or {}
         node = nodes.get(node_id) if isinstance(nodes, dict) else None
         if not isinstance(node, dict):
-            return
+            return None
         self.selected_id = node_id
         self.fen = str(node.get("fen") or self.fen)
-        self._recompute_effective_board_options()
+        self._recompute_transpositions()
+        return self._follow_selection()
 
-    def nav_start(self) -> None:
-        if not self.tree:
-            return
-        self._set_from_tree_root()
+    def select_node(self, node_id: str) -> EventSpec | None:
+        return self.on_select({"node_id": node_id})
 
-    def nav_end(self) -> None:
-        if not self.tree:
-            return
-        ml = self.tree.get("mainline") or []
+    def nav_start(self) -> EventSpec | None:
+        if not self._tree:
+            return None
+        return self._set_from_tree_root()
+
+    def nav_end(self) -> EventSpec | None:
+        if not self._tree:
+            return None
+        ml = self._tree.get("mainline") or []
         if isinstance(ml, list) and ml:
-            self.on_select({"node_id": ml[-1]})
+            return self.on_select({"node_id": ml[-1]})
+        return None
 
-    def nav_back(self) -> None:
-        if not self.tree:
-            return
-        prev = (self.tree.get("prevMainline") or {}).get(self.selected_id)
+    def nav_back(self) -> EventSpec | None:
+        if not self._tree:
+            return None
+        prev = prev_mainline(self._index or self._tree, self.selected_id)
         if isinstance(prev, str) and prev:
-            self.on_select({"node_id": prev})
+            return self.on_select({"node_id": prev})
+        return None
 
-    def nav_forward(self) -> None:
-        if not self.tree:
-            return
-        nxt = (self.tree.get("nextMainline") or {}).get(self.selected_id)
+    def nav_forward(self) -> EventSpec | None:
+        if not self._tree:
+            return None
+        nxt = next_mainline(self._index or self._tree, self.selected_id)
         if isinstance(nxt, str) and nxt:
-            self.on_select({"node_id": nxt})
+            return self.on_select({"node_id": nxt})
+        return None
 
     def on_pgn_upload(self, files: list[rx.UploadFile]) -> None:
-        # Read the first uploaded file and parse it as PGN.
+        # Spool the first uploaded file to the store and list its games.
         if not files:
             return
         f = files[0]
         try:
-            raw = f.file.read()
-            text = raw.decode("utf-8", errors="replace")
+            key = pgn_store().put(f.file)
         except Exception as e:
             self.pgn_error = f"upload read failed: {e}"
             return
-        self.load_pgn_text(text)
+        self._load_pgn_key(key)
 
     def ignore_move(self, payload: dict) -> None:  # noqa: ARG002
         # Viewer is read-only on MVP: ignore board input.
@@ -168,6 +296,19 @@ def chess_viewer() -> rx.Component:
         on_drop=ChessViewerState.on_pgn_upload,
     )
 
+    game_picker = rx.cond(
+        ChessViewerState.games.length() > 1,
+        rx.el.select(
+            rx.foreach(
+                ChessViewerState.games,
+                lambda g: rx.el.option(g["label"], value=g["index"]),
+            ),
+            value=ChessViewerState.game_index,
+            on_change=ChessViewerState.select_game,
+            style={"maxWidth": "100%", "padding": "4px 6px"},
+        ),
+    )
+
     toolbar = rx.hstack(
         rx.button("Start", on_click=ChessViewerState.nav_start),
         rx.button("Back", on_click=ChessViewerState.nav_back),
@@ -177,12 +318,35 @@ def chess_viewer() -> rx.Component:
         wrap="wrap",
     )
 
+    transpositions = rx.cond(
+        ChessViewerState.transpositions.length() > 0,
+        rx.hstack(
+            rx.text("Also at:", opacity="0.75", font_size="12px"),
+            rx.foreach(
+                ChessViewerState.transpositions,
+                lambda t: rx.link(
+                    t["label"],
+                    on_click=ChessViewerState.select_node(t["node_id"]),
+                    font_size="12px",
+                    cursor="pointer",
+                ),
+            ),
+            spacing="2",
+            wrap="wrap",
+            padding_top="6px",
+        ),
+    )
+
     main = rx.hstack(
         rx.box(
             chessboard(
                 fen=ChessViewerState.fen,
-                options=ChessViewerState.board_options_effective,
+                # Annotation shapes come from `nav` per node, so only user options here.
+                options=ChessViewerState.board_options,
                 on_move=ChessViewerState.ignore_move,  # read-only MVP
+                nav=ChessViewerState.nav_table,
+                node_id=ChessViewerState.selected_id,
+                on_navigate=ChessViewerState.on_select,
             ),
             width="480px",
             max_width="100%",
@@ -192,8 +356,15 @@ def chess_viewer() -> rx.Component:
                 lines=ChessViewerState.notation_lines,
                 selected_id=ChessViewerState.selected_id,
                 on_select=ChessViewerState.on_select,
+                hidden_before=ChessViewerState.notation_offset,
+                hidden_after=ChessViewerState.notation_hidden_after,
+                on_page=ChessViewerState.page_notation,
+                client_select=True,
             ),
+            transpositions,
             width="100%",
+            max_height="70vh",
+            overflow_y="auto",
         ),
         spacing="4",
         align="start",
@@ -209,6 +380,7 @@ def chess_viewer() -> rx.Component:
     return rx.vstack(
         upload,
         rx.cond(ChessViewerState.pgn_error != "", rx.callout(ChessViewerState.pgn_error, color_scheme="red")),
+        game_picker,
         toolbar,
         main,
         debug,
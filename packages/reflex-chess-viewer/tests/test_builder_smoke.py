@@ -15,3 +15,77 @@ def test_builder_builds_minimal_tree():
     assert tree["mainline"][0] == "n:root"
 
 
+def test_incremental_builder_matches_replay_builder():
+    import json
+
+    pgn = """[Event "Modes"]
+[SetUp "1"]
+[FEN "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"]
+
+3. Bb5 $1 {Ruy Lopez} (3. Bc4 Bc5 (3... Nf6 4. Ng5 d5 $5) 4. c3) 3... a6 {Morphy} 4. Ba4 (4. Bxc6 dxc6 5. O-O) Nf6 *
+"""
+    fast = GameTreeBuilder().build(pgn)
+    slow = GameTreeBuilder(incremental=False).build(pgn)
+    assert json.dumps(fast) == json.dumps(slow)
+    assert fast["nodes"]["n:0"]["ply"] == 5
+    assert fast["moveByNode"]["n:0.0.1"]["san"] == "Bxc6"
+
+
+def test_builder_handles_very_deep_games_without_recursion():
+    import sys
+
+    from reflex_chess_model import validate_tree
+
+    plies = 5000
+    assert plies > sys.getrecursionlimit()
+
+    # Legal knight shuffle: 1. Nf3 Nf6 2. Ng1 Ng8 ...
+    cycle = ["Nf3", "Nf6", "Ng1", "Ng8"]
+    moves: list[str] = []
+    for ply in range(plies):
+        if ply % 2 == 0:
+            moves.append(f"{ply // 2 + 1}.")
+        moves.append(cycle[ply % 4])
+    # A sideline at the very bottom of the tree.
+    moves.append("(2500... Nc6)")
+    pgn = '[Event "Stress"]\n\n' + " ".join(moves) + " *\n"
+
+    tree = GameTreeBuilder().build(pgn)
+    validate_tree(tree)
+
+    assert len(tree["mainline"]) == plies + 1
+    last = tree["mainline"][-1]
+    assert last == "n:" + ".".join(["0"] * plies)
+    assert tree["nodes"][last]["ply"] == plies
+    assert tree["moveByNode"][last]["san"] == "Ng8"
+
+    parent = tree["mainline"][-2]
+    side = tree["nodes"][parent]["children"][1]
+    assert side == parent + ".1"
+    assert tree["moveByNode"][side]["san"] == "Nc6"
+    assert tree["nodes"][side]["parent"] == parent
+
+
+def test_build_many_streams_every_game():
+    import io
+
+    from reflex_chess_viewer.builder import iter_headers, read_nth_game
+
+    pgn = """[White "A"]
+
+1. e4 e5 *
+
+[White "B"]
+
+1. d4 *
+
+[White "C"]
+
+1. c4 c5 2. Nc3 *
+"""
+    trees = GameTreeBuilder().build_many(io.StringIO(pgn))
+    assert next(trees)["headers"]["White"] == "A"
+    assert [len(t["mainline"]) for t in trees] == [2, 4]
+
+    assert [h["White"] for h in iter_headers(io.StringIO(pgn))] == ["A", "B", "C"]
+    assert read_nth_game(io.StringIO(pgn), 2).headers["White"] == "C"
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from reflex_chess_viewer.bulk import convert_pgn_file, main
+
+PGN = """[White "A"]
+
+1. e4 e5 *
+
+[White "Broken"]
+[SetUp "1"]
+[FEN "not a fen"]
+
+1. e4 *
+
+[White "C"]
+
+1. d4 d5 2. c4 *
+"""
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_convert_to_jsonl_reports_errors_without_aborting(tmp_path, workers):
+    src = tmp_path / "db.pgn"
+    src.write_text(PGN, encoding="utf-8")
+    out = tmp_path / "db.jsonl"
+
+    report = convert_pgn_file(src, out, workers=workers)
+
+    assert (report.total, report.converted) == (3, 2)
+    assert [e.index for e in report.errors] == [1]
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["index"] for r in rows] == [0, 1, 2]
+    assert rows[0]["tree"]["headers"]["White"] == "A"
+    assert "error" in rows[1]
+    assert len(rows[2]["tree"]["mainline"]) == 4
+
+
+def test_cli_writes_one_file_per_game(tmp_path):
+    src = tmp_path / "db.pgn"
+    src.write_text(PGN, encoding="utf-8")
+    out = tmp_path / "trees"
+
+    assert main([str(src), str(out), "--workers", "2", "--unordered"]) == 1
+
+    assert sorted(p.name for p in out.iterdir()) == ["000000.json", "000002.json", "errors.jsonl"]
+    tree = json.loads((out / "000002.json").read_text(encoding="utf-8"))
+    assert tree["headers"]["White"] == "C"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_headerless_game_merged_into_a_span_is_reported(tmp_path, workers):
+    # No headers before the second game: `PgnIndex` sees a single span.
+    src = tmp_path / "db.pgn"
+    src.write_text('[White "A"]\n\n1. e4 e5 *\n\n1. d4 d5 *\n\n1. c4 *\n', encoding="utf-8")
+    out = tmp_path / "trees"
+
+    report = convert_pgn_file(src, out, workers=workers)
+
+    assert (report.total, report.converted) == (3, 1)
+    assert [(e.index, e.game) for e in report.errors] == [(0, 1), (0, 2)]
+    assert sorted(p.name for p in out.iterdir()) == ["000000.json", "errors.jsonl"]
+    rows = [json.loads(line) for line in (out / "errors.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [(r["index"], r["game"]) for r in rows] == [(0, 1), (0, 2)]
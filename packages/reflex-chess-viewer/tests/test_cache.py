@@ -0,0 +1,91 @@
+import io
+import os
+
+import pytest
+from reflex_chess_viewer import GameCache, GameTreeBuilder, PgnStore
+
+PGN = '[Event "Cache"]\n\n1. e4 e5 2. Nf3 *\n'
+
+
+def _build(pgn):
+    return lambda: (GameTreeBuilder().build(pgn), [])
+
+
+def test_key_ignores_line_endings_but_not_options():
+    k = GameCache.key(PGN, {"show_nags": True})
+    assert GameCache.key("\ufeff" + PGN.replace("\n", "\r\n") + "  \n", {"show_nags": True}) == k
+    assert GameCache.key(PGN, {"show_nags": False}) != k
+
+
+def test_hits_misses_and_lru_eviction():
+    cache = GameCache(max_entries=2)
+    first = cache.get_or_build(PGN, None, _build(PGN))
+    assert cache.get_or_build(PGN, None, _build(PGN)) is first
+
+    cache.get_or_build(PGN, {"a": 1}, _build(PGN))
+    cache.get_or_build(PGN, None, _build(PGN))  # touch: now most recent
+    cache.get_or_build(PGN, {"b": 2}, _build(PGN))  # evicts {"a": 1}
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (2, 3, 1, 2)
+    assert cache.get(GameCache.key(PGN, None)) is first
+    assert cache.get(GameCache.key(PGN, {"a": 1})) is None
+
+
+def test_byte_bound_evicts_oldest():
+    size = GameCache().get_or_build(PGN, None, _build(PGN)).size
+    cache = GameCache(max_bytes=size * 2)
+    for i in range(3):
+        cache.get_or_build(PGN, {"i": i}, _build(PGN))
+    stats = cache.stats()
+    assert stats.entries == 2
+    assert stats.bytes <= size * 2
+
+
+def test_pgn_store_is_keyed_by_content_and_reads_spans(tmp_path):
+    store = PgnStore(tmp_path)
+    key = store.put(io.BytesIO(PGN.encode()), chunk_size=7)
+    assert store.put_bytes(PGN.encode()) == key
+    assert [p.name for p in tmp_path.glob("*.pgn")] == [key + ".pgn"]
+    assert store.read(key) == PGN.encode()
+    assert store.read(key, 17, 5) == b"1. e4"
+
+
+def _upload(i):
+    return PGN.replace("Cache", f"Cache{i}").encode()  # all the same length
+
+
+def _put_aged(store, i):
+    # Distinct, increasing mtimes: coarse filesystem clocks would tie otherwise.
+    key = store.put_bytes(_upload(i))
+    os.utime(store.path(key), (1_000_000 + i, 1_000_000 + i))
+    return key
+
+
+def test_pgn_store_evicts_least_recently_used_files(tmp_path):
+    store = PgnStore(tmp_path, max_bytes=len(_upload(0)) * 2)
+    keys = [_put_aged(store, i) for i in range(2)]
+    store.read(keys[0])  # refreshes its mtime: keys[1] is now the oldest
+    keys.append(_put_aged(store, 2))
+
+    with pytest.raises(ValueError, match="no longer available"):
+        store.read(keys[1])
+    assert store.read(keys[2]).startswith(b'[Event "Cache2"]')
+    assert store.size() == len(_upload(0)) * 2
+    with pytest.raises(ValueError, match="invalid upload key"):
+        store.path("../etc/passwd")
+
+
+def test_pgn_store_bounds_a_directory_shared_by_processes(tmp_path):
+    size = len(_upload(0))
+    # A file left over by an earlier run counts too.
+    (tmp_path / ("0" * 64 + ".pgn")).write_bytes(b"x" * size)
+    os.utime(tmp_path / ("0" * 64 + ".pgn"), (1, 1))
+    workers = [PgnStore(tmp_path, max_bytes=size * 3) for _ in range(2)]
+
+    keys = [_put_aged(workers[i % 2], i) for i in range(5)]
+
+    assert workers[0].size() == workers[1].size() == size * 3
+    assert sorted(p.name for p in tmp_path.glob("*.pgn")) == sorted(k + ".pgn" for k in keys[2:])
+    # Either worker reads what the other one stored.
+    assert workers[0].read(keys[3]) == _upload(3)
@@ -0,0 +1,47 @@
+import io
+
+from reflex_chess_viewer import GameTreeBuilder, PgnIndex
+
+PGN = (
+    b"\xef\xbb\xbf"
+    b'[Event "First"]\n'
+    b'[White "A \\"Ace\\" B"]\n'
+    b"\n"
+    b"1. e4 { a comment that spans\n"
+    b'[Event "not a header"]\n'
+    b"lines } e5 *\n"
+    b"\n"
+    b'[Event "Second"]\n'
+    b'[White "C"]\n'
+    b"\n"
+    b"1. d4 ; a { line comment\n"
+    b"d5 2. c4 *\n"
+    b"\n"
+    b'[Event "Third"]\n'
+    b"\n"
+    b"1. Nf3 *\n"
+)
+
+
+def test_scan_finds_games_and_offsets():
+    index = PgnIndex.scan(io.BytesIO(PGN))
+
+    assert [e.headers["Event"] for e in index] == ["First", "Second", "Third"]
+    assert index[0].headers["White"] == 'A "Ace" B'
+    assert index[0].offset == 0
+    assert sum(e.length for e in index) == len(PGN) == index.size
+
+    fp = io.BytesIO(PGN)
+    assert index.read_bytes(fp, 1).startswith(b'[Event "Second"]')
+    tree = GameTreeBuilder().build_at(fp, index[1].offset)
+    assert tree["headers"]["White"] == "C"
+    assert len(tree["mainline"]) == 4
+
+
+def test_index_round_trips_through_disk(tmp_path):
+    index = PgnIndex.scan(io.BytesIO(PGN), header_keys=["Event"])
+    assert index[0].headers == {"Event": "First"}
+
+    path = tmp_path / "games.idx.json"
+    index.save(path)
+    assert PgnIndex.load(path) == index
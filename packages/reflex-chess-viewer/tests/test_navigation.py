@@ -0,0 +1,55 @@
+from reflex_chess_viewer import GameTreeBuilder, build_nav_table, nav_ids
+
+
+def test_nav_table_links_parents_first_children_and_shapes():
+    pgn = """[Event "Nav"]
+
+1. e4 (1. d4 d5) e5 2. Nf3 *
+"""
+    tree = GameTreeBuilder().build(pgn)
+    shapes = [{"kind": "arrow", "from": "e2", "to": "e4", "color": "green"}]
+    tree["moveByNode"][tree["mainline"][1]]["annotations"]["shapes"] = shapes
+    nav = build_nav_table(tree)
+
+    # Builder ids follow the path scheme: left out and rebuilt from `parent`.
+    assert "ids" not in nav
+    ids = nav_ids(nav)
+    assert ids[0] == tree["rootId"]
+    assert len(ids) == len(tree["nodes"])
+    assert nav["fens"] == [tree["nodes"][nid]["fen"] for nid in ids]
+
+    # Right arrow from the root walks the mainline to `end`; left arrow walks back.
+    path = [0]
+    while nav["child"][path[-1]] >= 0:
+        path.append(nav["child"][path[-1]])
+    assert [ids[i] for i in path] == tree["mainline"]
+    assert path[-1] == nav["end"]
+    assert nav["parent"][0] == -1
+    assert nav["moves"][0] == ""
+    assert nav["moves"][path[1]] == "e2e4"
+    assert all(nav["parent"][b] == a for a, b in zip(path, path[1:], strict=False))
+
+    # A variation keeps its own continuation.
+    d4 = ids.index(tree["nodes"][tree["rootId"]]["children"][1])
+    assert ids[nav["child"][d4]] == tree["nodes"][ids[d4]]["children"][0]
+
+    e4 = str(ids.index(tree["mainline"][1]))
+    assert list(nav["shapes"]) == [e4]
+    assert nav["shapes"][e4]["arrows"][0]["startSquare"] == "e2"
+
+
+def test_nav_table_keeps_ids_that_do_not_follow_the_path_scheme():
+    tree = GameTreeBuilder().build("1. e4 e5 *")
+    renamed = {nid: f"x{i}" for i, nid in enumerate(tree["nodes"])}
+    tree = {
+        **tree,
+        "rootId": renamed[tree["rootId"]],
+        "mainline": [renamed[nid] for nid in tree["mainline"]],
+        "nodes": {
+            renamed[nid]: {**node, "id": renamed[nid], "children": [renamed[c] for c in node["children"]]}
+            for nid, node in tree["nodes"].items()
+        },
+        "moveByNode": {renamed[nid]: mi for nid, mi in tree["moveByNode"].items()},
+    }
+    nav = build_nav_table(tree)
+    assert nav["ids"] == nav_ids(nav) == ["x0", "x1", "x2"]
@@ -0,0 +1,17 @@
+from reflex_chess_viewer import project_shapes_to_board_options, project_tree_shapes
+
+
+def test_tree_shapes_are_projected_for_nodes_that_have_any():
+    tree = {
+        "moveByNode": {
+            "n:0": {"annotations": {"shapes": [{"kind": "arrow", "from": "e2", "to": "e4", "color": "green"}]}},
+            "n:0.0": {"annotations": {"shapes": [{"kind": "square", "square": "e5", "color": "red"}]}},
+            "n:0.0.0": {"annotations": {"shapes": []}},
+        }
+    }
+    shapes = project_tree_shapes(tree)
+    assert sorted(shapes) == ["n:0", "n:0.0"]
+
+    assert shapes["n:0"]["arrows"] == [{"startSquare": "e2", "endSquare": "e4", "color": "rgba(34, 197, 94, 0.85)"}]
+    assert shapes["n:0.0"] == {"arrows": [], "squareStyles": {"e5": {"backgroundColor": "rgba(239, 68, 68, 0.28)"}}}
+    assert project_shapes_to_board_options([{"kind": "arrow", "from": "a1", "to": "a2"}])["arrows"][0]["color"] == "rgba(0,0,0,0.6)"
@@ -0,0 +1,154 @@
+import os
+
+MULTI_PGN = """[Event "Open"]
+[White "Alpha"]
+[Black "Beta"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 1-0
+
+[Event "Open"]
+[White "Gamma"]
+[Black "Delta"]
+[Result "*"]
+
+1. d4 d5 *
+"""
+
+
+def _state():
+    os.environ["REFLEX_BACKEND_ONLY"] = "1"
+
+    from reflex_chess_viewer import ChessViewerState
+
+    return ChessViewerState(_reflex_internal_init=True)  # type: ignore[call-arg]
+
+
+def test_multi_game_pgn_lists_games_and_loads_selected():
+    s = _state()
+    s.load_pgn_text(MULTI_PGN)
+
+    assert [g["label"] for g in s.games] == [
+        "1. Alpha – Beta (Open) 1-0",
+        "2. Gamma – Delta (Open)",
+    ]
+    assert s._tree["headers"]["White"] == "Alpha"
+
+    s.select_game("1")
+    assert s.pgn_error == ""
+    assert s.game_index == "1"
+    assert s._tree["headers"]["White"] == "Gamma"
+    assert s.selected_id == "n:root"
+
+
+def test_reloading_the_same_game_hits_the_cache():
+    from reflex_chess_viewer import game_cache
+
+    game_cache().clear()
+    s = _state()
+    s.load_pgn_text(MULTI_PGN)
+    s.load_pgn_text(MULTI_PGN.replace("\n", "\r\n"))
+
+    stats = game_cache().stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert s._tree["headers"]["White"] == "Alpha"
+
+
+def test_tree_is_backend_only():
+    s = _state()
+    s.load_pgn_text(MULTI_PGN)
+
+    assert "tree" not in type(s).base_vars
+    assert "_tree" not in type(s).base_vars
+    delta = str(s.get_delta())
+    assert "nodeByFen" not in delta
+    assert "notation_lines" in delta
+
+
+def test_upload_is_spooled_not_kept_in_state():
+    from reflex_chess_viewer import pgn_store
+
+    s = _state()
+    s.load_pgn_text(MULTI_PGN)
+
+    # Only the store key and game spans stay in the session.
+    assert not any(isinstance(v, bytes) or MULTI_PGN in str(v) for v in vars(s).values())
+    assert pgn_store().read(s._pgn_key) == MULTI_PGN.encode()
+    s.select_game("1")
+    assert s.fen.startswith("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP")
+    assert s.pgn_error == ""
+
+
+def test_navigation_works_without_stored_indices():
+    s = _state()
+    s.load_pgn_text(MULTI_PGN)
+    assert "nextMainline" not in s._tree
+
+    s.nav_forward()
+    s.nav_forward()
+    assert s.selected_id == "n:0.0"
+    s.nav_back()
+    assert s.selected_id == "n:0"
+
+
+def test_transpositions_ignore_move_counters():
+    s = _state()
+    s.load_pgn_text("1. Nf3 Nf6 2. Ng1 Ng8 3. Nf3 *")
+
+    s.nav_end()
+    assert s.selected_id == "n:0.0.0.0.0"
+    assert s.transpositions == [{"node_id": "n:0", "label": "1. Nf3"}]
+
+    s.select_node("n:0.0.0.0")
+    assert s.transpositions == [{"node_id": "n:root", "label": "start"}]
+
+
+def test_notation_is_windowed_around_the_selection():
+    # Every white move gets a sideline -> one notation line per variation.
+    moves = " ".join(f"{n}. Nf3 ({n}. Nc3) Nf6 {n + 1}. Ng1 ({n + 1}. Nc3) Ng8" for n in range(1, 40, 2))
+    s = _state()
+    s.notation_window = 6
+    s.load_pgn_text(moves + " *")
+
+    total = len(s._notation_all)
+    assert total > 20
+    assert (s.notation_offset, len(s.notation_lines)) == (0, 6)
+    assert s.notation_hidden_after == total - 6
+
+    s.page_notation(1)
+    assert s.notation_offset == 3
+
+    last = max(s._line_of, key=s._line_of.__getitem__)  # sideline on the last line
+    s.select_node(last)
+    assert s.notation_offset + 6 == total
+    s.nav_end()  # mainline moves live on line 0
+    assert s.notation_offset == 0
+
+
+def test_loaded_game_ships_a_navigation_table():
+    s = _state()
+    s.load_pgn_text(MULTI_PGN)
+    from reflex_chess_viewer import nav_ids
+
+    ids = nav_ids(s.nav_table)
+    assert ids[0] == s.selected_id
+    assert len(ids) == len(s._tree["nodes"])
+
+    # The board syncs local navigation back through `on_select`.
+    target = ids[s.nav_table["end"]]
+    s.on_select({"node_id": target})
+    assert s.selected_id == target
+    assert s.fen == s.nav_table["fens"][s.nav_table["end"]]
+
+
+def test_navigation_resends_no_board_options():
+    s = _state()
+    s.load_pgn_text(MULTI_PGN)
+    s._clean()
+
+    # Annotation shapes reach the board per node through `nav_table`.
+    for _ in range(3):
+        s.nav_forward()
+        assert s.dirty_vars <= {"selected_id", "fen", "transpositions", "notation_offset", "notation_lines", "notation_hidden_after"}
+        s._clean()
+    assert "board_options_effective" not in type(s).base_vars
@@ -0,0 +1,58 @@
+"""Startup cost of the built-in piece assets.
+
+Runs in a throwaway app directory. Rows: the first registration (links
+created), a repeat in the same process (page functions, recompiles), a new
+process finding the links already in place (restart / hot reload), and "old":
+`rx.asset` (stack inspection + content hash) for every file on every call.
+
+    uv run python packages/reflex-chessboard/benchmarks/bench_piece_assets.py
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from collections.abc import Callable
+
+import reflex_chessboard
+from reflex_chessboard import (
+    list_builtin_piece_sets,
+    register_builtin_piece_assets,
+)
+from reflex_chessboard.piece_assets import load_piece_manifest
+
+
+def _ms(fn: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1e3
+
+
+def main() -> None:
+    os.environ.pop("REFLEX_BACKEND_ONLY", None)
+    rows: list[tuple[str, float]] = []
+    with tempfile.TemporaryDirectory() as app_dir:
+        os.chdir(app_dir)
+        rows.append(("manifest load", _ms(load_piece_manifest)))
+        rows.append(("list_builtin_piece_sets", _ms(list_builtin_piece_sets)))
+        rows.append(("register: first", _ms(register_builtin_piece_assets)))
+        rows.append(("register: same process", _ms(register_builtin_piece_assets)))
+        reflex_chessboard._REGISTERED.clear()
+        rows.append(("register: new process", _ms(register_builtin_piece_assets)))
+        # Old behaviour: no memo, no link check, `rx.asset` for every file.
+        reflex_chessboard._REGISTERED.clear()
+        reflex_chessboard._already_linked = lambda *_: False
+        rows.append(("old register (every call)", _ms(register_builtin_piece_assets)))
+    source = (
+        "manifest.json"
+        if load_piece_manifest().from_file
+        else "scanned (source checkout)"
+    )
+    print(f"manifest: {source}")
+    for name, ms in rows:
+        print(f"{name:<28} {ms:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,29 @@ from collections.abc import Iterable
 from pathlib import Path
 
 from .chessboard import Chessboard, chessboard
+from .piece_assets import (
+    build_piece_bundle,
+    builtin_pieces_dir,
+    check_piece_sets,
+    file_digest,
+    load_piece_manifest,
+    write_piece_bundles,
+)
 
 __all__ = [
     "Chessboard",
     "chessboard",
     "builtin_pieces_base_url",
     "builtin_piece_options",
+    "builtin_piece_bundle_url",
     "list_builtin_piece_sets",
     "register_builtin_piece_assets",
+    "write_piece_bundles",
 ]
 
+# (app assets dir, set name) already registered by this process.
+_REGISTERED: set[tuple[str, str]] = set()
+
 
 def builtin_pieces_base_url() -> str:
     """Base URL for built-in SVG piece assets shipped with this package.
@@ -27,39 +40,59 @@ def builtin_pieces_base_url() -> str:
 
 
 def list_builtin_piece_sets() -> list[str]:
-    """List built-in piece set names shipped with the package."""
-    from importlib import resources
+    """List built-in piece set names shipped with the package (from the manifest)."""
+    return sorted(load_piece_manifest().sets)
+
 
-    pieces = resources.files("reflex_chessboard").joinpath("pieces")
-    if not pieces.is_dir():
-        return []
-    return sorted([p.name for p in pieces.iterdir() if p.is_dir()])
+def builtin_piece_bundle_url(set_name: str) -> str:
+    """URL of the content-hashed data-URI bundle of a built-in set.
 
+    The file is written by `register_builtin_piece_assets(bundles=True)`.
+    """
+    filename = load_piece_manifest().bundles.get(set_name)
+    if filename is None:
+        filename = build_piece_bundle(set_name).filename  # raises for unknown sets
+    return f"{builtin_pieces_base_url()}/{filename}"
 
-def builtin_piece_options(set_name: str) -> dict[str, str]:
+
+def builtin_piece_options(set_name: str, *, bundle: bool = False) -> dict[str, str]:
     """Convenience helper to build `options` for a built-in piece set.
 
+    With `bundle=True` the board loads the whole set from one cached JSON bundle
+    of data URIs (`pieceBundleUrl`) instead of twelve SVG requests; register
+    the assets with `register_builtin_piece_assets(bundles=True)`.
+
     Example:
         options = {
             **builtin_piece_options("merida"),
             "allowDragging": True,
         }
     """
-    return {
+    options = {
         "pieceSet": f"assets/{set_name}",
         "piecesBaseUrl": builtin_pieces_base_url(),
     }
+    if bundle:
+        options["pieceBundleUrl"] = builtin_piece_bundle_url(set_name)
+    return options
 
 
-def register_builtin_piece_assets(sets: Iterable[str] | None = None) -> None:
+def register_builtin_piece_assets(
+    sets: Iterable[str] | None = None, *, bundles: bool = False
+) -> None:
     """Expose built-in piece SVGs as shared assets for the current Reflex app.
 
     Call this at app import/compile time (e.g., in your app module or `rxconfig.py`)
     if you want to use built-in sets via:
       - options: { "pieceSet": "assets/<name>", "piecesBaseUrl": builtin_pieces_base_url() }
-    """
-    from importlib import resources
 
+    `bundles=True` also writes the per-set data-URI bundles next to them
+    (see `builtin_piece_options(..., bundle=True)`).
+
+    Idempotent: files already linked (or copied) with matching content are
+    skipped, and a set registered once by this process is not looked at again,
+    so calling it from page functions or on hot reload is cheap.
+    """
     import reflex as rx
 
     backend_only = os.environ.get("REFLEX_BACKEND_ONLY") == "1"
@@ -67,23 +100,8 @@ def register_builtin_piece_assets(sets: Iterable[str] | None = None) -> None:
         # No frontend compilation; nothing to symlink.
         return
 
-    available = set(list_builtin_piece_sets())
-    if sets is None:
-        wanted = set(available)
-    else:
-        wanted = set(sets)
-        unknown = sorted(wanted - available)
-        if unknown:
-            msg = (
-                "Unknown built-in piece set(s): "
-                + ", ".join(unknown)
-                + ". Available: "
-                + ", ".join(sorted(available))
-            )
-            raise ValueError(msg)
-
-    if not wanted:
-        return
+    manifest = load_piece_manifest()
+    wanted = check_piece_sets(manifest.sets if sets is None else sets, manifest.sets)
 
     # Ensure the destination external assets directory exists.
     # This avoids confusing errors in some integration setups where the app's
@@ -91,18 +109,26 @@ def register_builtin_piece_assets(sets: Iterable[str] | None = None) -> None:
     dest_root = Path.cwd() / "assets" / "external" / "reflex_chessboard" / "pieces"
     dest_root.mkdir(parents=True, exist_ok=True)
 
-    pieces_dir = resources.files("reflex_chessboard").joinpath("pieces")
-    for set_name in sorted(wanted):
-        set_dir = pieces_dir.joinpath(set_name)
-        if not set_dir.is_dir():
+    if bundles:
+        write_piece_bundles(dest_root, wanted)
+
+    app_key = str(dest_root)
+    pieces_dir = builtin_pieces_dir()
+    for set_name in wanted:
+        if (app_key, set_name) in _REGISTERED:
             continue
-        for svg in sorted(set_dir.iterdir()):
-            if not svg.is_file() or not svg.name.lower().endswith(".svg"):
+        # rx.asset only creates the module's folder, not `pieces/<set>/`.
+        (dest_root / set_name).mkdir(exist_ok=True)
+        # Precompressed siblings (`.svg.gz` / `.svg.br`) are listed for built wheels only;
+        # static servers with gzip_static / brotli_static pick them up.
+        for name, digest in manifest.sets[set_name].items():
+            src = pieces_dir / set_name / name
+            if _already_linked(dest_root / set_name / name, src, digest):
                 continue
             # Use shared assets. `path` is relative to this __init__.py directory,
             # so it must match the on-disk layout in the installed package.
             try:
-                rx.asset(f"pieces/{set_name}/{svg.name}", shared=True)
+                rx.asset(f"pieces/{set_name}/{name}", shared=True)
             except FileNotFoundError as e:
                 # Most common cause: user installed an older wheel without SVG package-data.
                 raise FileNotFoundError(
@@ -110,4 +136,16 @@ def register_builtin_piece_assets(sets: Iterable[str] | None = None) -> None:
                     "Make sure you're using a version of `reflex-chessboard` that ships "
                     "SVG assets, or reinstall/upgrade the package. "
                     f"Missing file: {e}"
-                ) from e
\ No newline at end of file
+                ) from e
+        _REGISTERED.add((app_key, set_name))
+
+
+def _already_linked(dest: Path, src: Path, digest: str) -> bool:
+    # rx.asset hashes the file and inspects the call stack on every call;
+    # skip it when the app already has this file.
+    try:
+        if dest.is_symlink():
+            return dest.resolve() == src.resolve()
+        return dest.is_file() and file_digest(dest) == digest
+    except OSError:
+        return False
@@ -16,8 +16,18 @@ class Chessboard(rx.Component):
 
     # Props (Python -> React).
     fen: str = "start"
+    # Static config: theme, piece set, size and other react-chessboard options.
     options: dict[str, Any] | None = None
 
+    # Fast-changing decorations, diffed separately from `options` so per-move updates
+    # never re-run theme / piece-set setup. Added on top of `options` arrows/squareStyles.
+    arrows: list[dict[str, Any]] | None = None  # [{"startSquare", "endSquare", "color"}]
+    square_styles: dict[str, dict[str, Any]] | None = None  # {"e4": {...css}}
+    last_move: dict[str, str] | None = None  # {"from": "e2", "to": "e4"}
+    # Optional: `seq` of the last `on_move` payload the server handled, accepted or not.
+    # With it the board tells a rejected move from the echo of an earlier one.
+    move_ack: int | None = None
+
     # Events (React -> Python). Reflex will expose this to JS as `onMove`.
     # Provide an ArgsSpec so handlers can accept a payload dict, e.g. `def on_move(self, payload: dict): ...`
     on_move: Annotated[rx.EventHandler, lambda payload: [payload]]
@@ -29,6 +39,15 @@ class Chessboard(rx.Component):
     # Optional: notify server about responsive board size changes (container resize).
     on_resize: Annotated[rx.EventHandler, lambda payload: [payload]] = None  # type: ignore[assignment]
 
+    # Optional client-side navigation over a game tree (see `reflex_chess_viewer.build_nav_table`):
+    # arrow keys / Home / End and notation clicks move the board without a server round-trip.
+    # `node_id` is the server-side selection; local moves are synced back through
+    # `on_navigate({"node_id": ...})`, debounced by `nav_sync_ms` (default 150, < 0 = never).
+    nav: dict[str, Any] | None = None
+    node_id: str | None = None
+    nav_sync_ms: int | None = None
+    on_navigate: Annotated[rx.EventHandler, lambda payload: [payload]] = None  # type: ignore[assignment]
+
     def add_imports(self):
         # Imports required for injected shim code.
         return {
@@ -50,6 +69,148 @@ class Chessboard(rx.Component):
         #
         # IMPORTANT: the symbol name MUST match `tag` so the compiled page can render it.
         return r"""
+// Shared with reflex-chess-notation (`SELECT_EVENT`): detail = { nodeId, source }.
+const REFLEX_CHESS_SELECT_EVENT = "reflex-chess:select";
+
+// Position part of a FEN (placement, side, castling, en passant): move clocks ignored.
+function reflexChessFenKey(fen) {
+  return String(fen || "").split(" ").slice(0, 4).join(" ");
+}
+
+// What a server position means for our moves still in flight (`pending`: [{ seq, key }] in
+// play order). Returns { reload, pending }: `reload` when the board must load the position.
+// With `ack` (the seq the server handled last) a move is known to be rejected when the
+// position is not the one it produced; without it the position of any pending move is its
+// echo (the board already shows it or something newer).
+function reflexChessResolveEcho(pending, key, localKey, ack) {
+  if (typeof ack === "number") {
+    const acked = pending.find((p) => p.seq === ack);
+    const rest = pending.filter((p) => p.seq > ack);
+    if (!rest.length) return { reload: key !== localKey, pending: [] };
+    if (acked && acked.key !== key) return { reload: true, pending: [] };
+    return { reload: false, pending: rest };
+  }
+  const echoed = pending.findIndex((p) => p.key === key);
+  if (echoed >= 0) return { reload: false, pending: pending.slice(echoed + 1) };
+  if (key === localKey) return { reload: false, pending };
+  return { reload: true, pending: [] };
+}
+
+// Server selection (`node_id` prop) vs our own selections still in flight (`pending`: ids
+// sent to the server, oldest first). Returns { echo, pending }: the echo of any pending
+// selection leaves the board where it is (it already shows that node or a newer one).
+function reflexChessResolveSelection(pending, nodeId) {
+  const echoed = pending.indexOf(nodeId);
+  if (echoed >= 0) return { echo: true, pending: pending.slice(echoed + 1) };
+  return { echo: false, pending: [] };
+}
+
+// Node ids of a nav table; rebuilt from `root` + `parent` when the table left them out
+// (builder path ids: children of "n:root" are "n:<i>", deeper ones "<parent>.<i>").
+function reflexChessNavIds(table) {
+  if (Array.isArray(table.ids)) return table.ids;
+  const parent = table.parent;
+  const ids = new Array(parent.length);
+  const kids = new Array(parent.length).fill(0);
+  for (let i = 0; i < parent.length; i++) {
+    const p = parent[i];
+    if (p < 0) {
+      ids[i] = table.root;
+      continue;
+    }
+    ids[i] = (ids[p] === "n:root" ? "n:" : `${ids[p]}.`) + kids[p]++;
+  }
+  return ids;
+}
+
+const REFLEX_CHESS_PIECE_KEYS = ["wK", "wQ", "wR", "wB", "wN", "wP", "bK", "bQ", "bR", "bB", "bN", "bP"];
+const REFLEX_CHESS_UNICODE_GLYPHS = {
+  wK: "♔", wQ: "♕", wR: "♖", wB: "♗", wN: "♘", wP: "♙",
+  bK: "♚", bQ: "♛", bR: "♜", bB: "♝", bN: "♞", bP: "♟",
+};
+
+function reflexChessUnicodePiece(key) {
+  const ch = REFLEX_CHESS_UNICODE_GLYPHS[key] || "?";
+  return (props) => {
+    // Text outline for readability on different square colors.
+    const style = {
+      width: "100%",
+      height: "100%",
+      display: "flex",
+      alignItems: "center",
+      justifyContent: "center",
+      lineHeight: 1,
+      fontSize: "34px",
+      userSelect: "none",
+      // mimic outline similar to SVG pieces
+      textShadow: "0 0 2px rgba(0,0,0,0.85)",
+      ...(props?.svgStyle || {}),
+    };
+    return jsx("div", { style, children: ch });
+  };
+}
+
+function reflexChessImgPiece(src, key) {
+  return (props) => {
+    const style = {
+      width: "100%",
+      height: "100%",
+      display: "block",
+      userSelect: "none",
+      ...(props?.svgStyle || {}),
+    };
+    return jsx("img", { src, style, draggable: false, alt: key });
+  };
+}
+
+// Piece renderer maps shared by every board on the page, keyed by (pieceSet, piecesBaseUrl).
+// Component identities stay stable across renders, so React never remounts the pieces.
+const reflexChessPieceMaps = new Map();
+
+function reflexChessPieces(pieceSet, baseUrl) {
+  const unicode = pieceSet === "unicode";
+  const base = unicode ? "" : String(baseUrl || "/pieces").replace(/\/+$/, "");
+  const setName = unicode ? "unicode" : String(pieceSet || "").replace(/^\/+|\/+$/g, "");
+  const cacheKey = `${base}|${setName}`;
+  let pieces = reflexChessPieceMaps.get(cacheKey);
+  if (!pieces) {
+    pieces = {};
+    for (const k of REFLEX_CHESS_PIECE_KEYS) {
+      pieces[k] = unicode ? reflexChessUnicodePiece(k) : reflexChessImgPiece(`${base}/${setName}/${k}.svg`, k);
+    }
+    reflexChessPieceMaps.set(cacheKey, pieces);
+  }
+  return pieces;
+}
+
+// Data-URI piece bundles (`options.pieceBundleUrl`, `{wK: "data:image/svg+xml,...", ...}`):
+// fetched once per URL for the whole page, then shared like the maps above.
+const reflexChessPieceBundles = new Map();
+const reflexChessBlankPieces = Object.fromEntries(REFLEX_CHESS_PIECE_KEYS.map((k) => [k, () => null]));
+
+function reflexChessLoadPieceBundle(url) {
+  let entry = reflexChessPieceBundles.get(url);
+  if (!entry) {
+    entry = { pieces: null, failed: false, promise: null };
+    entry.promise = fetch(url)
+      .then((res) => {
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        return res.json();
+      })
+      .then((uris) => {
+        const pieces = {};
+        for (const k of REFLEX_CHESS_PIECE_KEYS) pieces[k] = reflexChessImgPiece(uris[k] || "", k);
+        entry.pieces = pieces;
+      })
+      .catch((e) => {
+        entry.failed = true;
+        console.warn("[reflex-chessboard] piece bundle failed, using separate SVGs:", url, e);
+      });
+    reflexChessPieceBundles.set(url, entry);
+  }
+  return entry;
+}
+
 const ReflexChessboardShim = ClientSide(async () => {
   const [reactChessboardMod, chessJsMod] = await Promise.all([
     import("react-chessboard"),
@@ -59,6 +220,7 @@ const ReflexChessboardShim = ClientSide(async () => {
   // Handle both ESM/CJS export shapes.
   const ChessboardComp = reactChessboardMod?.Chessboard ?? reactChessboardMod?.default ?? reactChessboardMod;
   const defaultPieces = reactChessboardMod?.defaultPieces;
+  const fenToPosition = reactChessboardMod?.fenStringToPositionObject;
   const ChessCtor =
     chessJsMod?.Chess ??
     chessJsMod?.default?.Chess ??
@@ -66,20 +228,61 @@ const ReflexChessboardShim = ClientSide(async () => {
     chessJsMod;
 
   return function ReflexChessboardShimInner(props) {
-    const { fen, options, onMove, onArrowsChange, onResize } = props;
+    const { fen, moveAck, options, onMove, onArrowsChange, onResize, nav, nodeId, navSyncMs, onNavigate } = props;
+
+    // Fast-changing props: Reflex re-sends a var with a new reference on every update,
+    // so key them by content to keep memoized options stable when nothing changed.
+    const useStable = (value) => {
+      const key = JSON.stringify(value ?? null);
+      // eslint-disable-next-line react-hooks/exhaustive-deps
+      return useMemo(() => value ?? null, [key]);
+    };
+    const arrowsProp = useStable(props.arrows);
+    const squareStylesProp = useStable(props.squareStyles);
+    const lastMoveProp = useStable(props.lastMove);
+    const responsive = !!(options && options.responsive);
+    const enableClickToMove = (options && options.enableClickToMove !== undefined)
+      ? !!options.enableClickToMove
+      : true;
 
     const reactId = useId();
     const debug = (options && options.debug) ? true : false;
     const chessRef = useRef(null);
     const startFenRef = useRef(null);
     const [localFen, setLocalFen] = useState(fen || "start");
+    const localFenRef = useRef(localFen);
+    localFenRef.current = localFen;
+    // FEN currently loaded into chess.js: loaded lazily, only when a move needs validating.
+    const chessFenRef = useRef(null);
+    // Our moves not yet echoed / acknowledged by the server: [{ seq, key }] (bounded).
+    const pendingMovesRef = useRef([]);
+    const moveSeqRef = useRef(0);
+    const positionCacheRef = useRef(new Map());
     const [selectedSquare, setSelectedSquare] = useState(null);
     const [lastMove, setLastMove] = useState({ from: null, to: null });
     const containerRef = useRef(null);
-    const [responsiveSize, setResponsiveSize] = useState(null);
+    // Responsive mode: `liveSize` follows the container every animation frame (in place);
+    // `remountEpoch` bumps once per settled resize to refresh react-chessboard's drag math.
+    const [liveSize, setLiveSize] = useState(null);
+    const [remountEpoch, setRemountEpoch] = useState(0);
+    const pieceBundleUrl = (options && options.pieceBundleUrl) ? String(options.pieceBundleUrl) : null;
+    const [pieceBundleTick, setPieceBundleTick] = useState(0);
     const lastSentSizeRef = useRef(null);
-    const resizeDebounceRef = useRef(null);
+    const resizeSettleRef = useRef(null);
+    const resizeFrameRef = useRef(null);
     const lastSentArrowsRef = useRef(null);
+    const onResizeRef = useRef(onResize);
+    onResizeRef.current = onResize;
+    const navEnabled = !!(nav && Array.isArray(nav.parent) && nav.parent.length > 0);
+    const [navIdx, setNavIdx] = useState(-1);
+    const navIdxRef = useRef(-1);
+    const navRef = useRef(nav);
+    const nodeIdRef = useRef(nodeId);
+    // Selections sent to the server (keyboard sync, notation clicks) not yet echoed back.
+    const navPendingRef = useRef([]);
+    const navSyncTimerRef = useRef(null);
+    navRef.current = nav;
+    nodeIdRef.current = nodeId;
 
     // Initialize chess.js once.
     if (!chessRef.current) {
@@ -89,24 +292,48 @@ const ReflexChessboardShim = ClientSide(async () => {
       } catch (_e) {
         startFenRef.current = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1";
       }
+      chessFenRef.current = "start";
       if (fen && fen !== "start") {
         try {
           chessRef.current.load(fen);
+          chessFenRef.current = fen;
         } catch {
           chessRef.current.reset();
         }
       }
     }
 
-    // Sync server fen -> local state.
+    // Bring chess.js to the shown position (no-op unless navigation moved it on).
+    function syncChess() {
+      const target = localFenRef.current;
+      if (chessFenRef.current === target) return;
+      try {
+        if (target === "start") chessRef.current.reset();
+        else chessRef.current.load(target);
+        chessFenRef.current = target;
+      } catch (_e) {
+        // keep the previous chess.js position
+      }
+    }
+
+    // Sync server fen -> local state (with a nav table the position follows the node instead).
     useEffect(() => {
-      if (!fen) return;
+      if (!fen || navEnabled) return;
       // Normalize incoming "start" -> start FEN to keep react-chessboard happy.
       const normalized = (fen === "start") ? (startFenRef.current || "start") : fen;
-      if (normalized === localFen) return;
+      // Echoes of our own moves: chess.js and the board already show them (or something newer).
+      const { reload, pending } = reflexChessResolveEcho(
+        pendingMovesRef.current,
+        reflexChessFenKey(normalized),
+        reflexChessFenKey(localFenRef.current),
+        moveAck,
+      );
+      pendingMovesRef.current = pending;
+      if (!reload) return;
       try {
         if (fen === "start") chessRef.current.reset();
         else chessRef.current.load(fen);
+        chessFenRef.current = normalized;
         setLocalFen(normalized);
         setSelectedSquare(null);
         setLastMove({ from: null, to: null });
@@ -114,7 +341,133 @@ const ReflexChessboardShim = ClientSide(async () => {
         // ignore invalid fen
       }
       // eslint-disable-next-line react-hooks/exhaustive-deps
-    }, [fen]);
+    }, [fen, moveAck]);
+
+    // Server-provided last move (e.g. the move that led to the shown position).
+    useEffect(() => {
+      if (!lastMoveProp) return;
+      setLastMove({ from: lastMoveProp.from ?? null, to: lastMoveProp.to ?? null });
+    }, [lastMoveProp]);
+
+    const navIdList = useMemo(() => (navEnabled ? reflexChessNavIds(nav) : []), [nav]);
+    const navIdsRef = useRef(navIdList);
+    navIdsRef.current = navIdList;
+    const navPosition = useMemo(() => {
+      const pos = new Map();
+      navIdList.forEach((id, i) => pos.set(id, i));
+      return pos;
+    }, [navIdList]);
+
+    const rememberSelection = (id) => {
+      const pending = navPendingRef.current;
+      pending.push(id);
+      if (pending.length > 32) pending.shift();
+    };
+
+    const scheduleNavSync = (id) => {
+      if (!onNavigate) return;
+      if (navSyncTimerRef.current) clearTimeout(navSyncTimerRef.current);
+      const ms = (typeof navSyncMs === "number") ? navSyncMs : 150;
+      if (ms < 0) return;
+      navSyncTimerRef.current = setTimeout(() => {
+        navSyncTimerRef.current = null;
+        if (id === nodeIdRef.current) return;
+        rememberSelection(id);
+        onNavigate({ node_id: id });
+      }, ms);
+    };
+
+    // Move to table row `idx`. source: "server" | "notation" | "keyboard".
+    const navGoTo = (idx, source) => {
+      const table = navRef.current;
+      if (!table || !Array.isArray(table.fens) || idx < 0 || idx >= table.fens.length) return;
+      if (idx === navIdxRef.current) return;
+      navIdxRef.current = idx;
+      setNavIdx(idx);
+      // chess.js catches up lazily (`syncChess`) if the user makes a move here.
+      const nextFen = table.fens[idx];
+      localFenRef.current = nextFen;
+      setLocalFen(nextFen);
+      setSelectedSquare(null);
+      const uci = table.moves?.[idx];
+      setLastMove(uci ? { from: uci.slice(0, 2), to: uci.slice(2, 4) } : { from: null, to: null });
+      if (source === "keyboard") {
+        const id = navIdsRef.current[idx];
+        window.dispatchEvent(new CustomEvent(REFLEX_CHESS_SELECT_EVENT, { detail: { nodeId: id, source: "board" } }));
+        scheduleNavSync(id);
+      }
+    };
+    const navGoToRef = useRef(navGoTo);
+    navGoToRef.current = navGoTo;
+
+    // New game: forget the local position.
+    useEffect(() => {
+      navIdxRef.current = -1;
+      navPendingRef.current = [];
+      setNavIdx(-1);
+    }, [nav]);
+
+    // Server-side selection -> local position (skipping echoes of our own sync).
+    useEffect(() => {
+      if (!navEnabled || !nodeId) return;
+      const { echo, pending } = reflexChessResolveSelection(navPendingRef.current, nodeId);
+      navPendingRef.current = pending;
+      if (echo) {
+        const localId = navIdList[navIdxRef.current];
+        if (localId !== undefined && localId !== nodeId) {
+          // Moved on since the sync: put the notation highlight back on the local node.
+          window.dispatchEvent(new CustomEvent(REFLEX_CHESS_SELECT_EVENT, { detail: { nodeId: localId, source: "board" } }));
+        }
+        return;
+      }
+      const idx = navPosition.get(nodeId);
+      if (idx !== undefined) navGoToRef.current(idx, "server");
+      // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, [nodeId, navPosition]);
+
+    // Notation clicks (the notation notifies the server itself).
+    useEffect(() => {
+      if (!navEnabled) return;
+      const onSelect = (e) => {
+        if (e?.detail?.source !== "notation") return;
+        const id = e.detail.nodeId;
+        const idx = navPosition.get(id);
+        if (idx === undefined) return;
+        // The notation sends it to the server right away: its echo must not move the board.
+        if (id !== nodeIdRef.current) rememberSelection(id);
+        navGoToRef.current(idx, "notation");
+      };
+      window.addEventListener(REFLEX_CHESS_SELECT_EVENT, onSelect);
+      return () => window.removeEventListener(REFLEX_CHESS_SELECT_EVENT, onSelect);
+    }, [navEnabled, navPosition]);
+
+    // Keyboard: Left/Right = parent/first child, Home/End = start/end of the mainline.
+    const keyboardNavigation = navEnabled && !(options && options.keyboardNavigation === false);
+    useEffect(() => {
+      if (!keyboardNavigation) return;
+      const onKeyDown = (e) => {
+        if (e.defaultPrevented || e.altKey || e.ctrlKey || e.metaKey) return;
+        const t = e.target;
+        const tag = t?.tagName;
+        if (t?.isContentEditable || tag === "INPUT" || tag === "TEXTAREA" || tag === "SELECT") return;
+        const table = navRef.current;
+        const cur = navIdxRef.current < 0 ? 0 : navIdxRef.current;
+        let idx;
+        if (e.key === "ArrowLeft") idx = table.parent[cur];
+        else if (e.key === "ArrowRight") idx = table.child[cur];
+        else if (e.key === "Home") idx = 0;
+        else if (e.key === "End") idx = table.end;
+        else return;
+        e.preventDefault();
+        navGoToRef.current(idx, "keyboard");
+      };
+      window.addEventListener("keydown", onKeyDown);
+      return () => window.removeEventListener("keydown", onKeyDown);
+    }, [keyboardNavigation]);
+
+    useEffect(() => () => {
+      if (navSyncTimerRef.current) clearTimeout(navSyncTimerRef.current);
+    }, []);
 
     useEffect(() => {
       if (debug) {
@@ -124,63 +477,91 @@ const ReflexChessboardShim = ClientSide(async () => {
     }, []);
 
     // Optional: make the board responsive to its container size (useful for resizable demo containers).
+    // Keyed on `responsive` only, so option/decoration updates don't re-attach the observer.
     useEffect(() => {
-      const enabled = !!(options && options.responsive);
-      if (!enabled) return;
+      if (!responsive) return;
 
       const el = containerRef.current;
       if (!el) return;
 
-      const update = () => {
+      const settleMs = (typeof options?.resizeSettleMs === "number") ? options.resizeSettleMs : 150;
+      let measured = null;
+
+      const measure = () => {
         // Measure the host container (parent) to avoid feedback loops:
         // our inner div is sized to 100% and therefore reflects the parent's *content box*,
         // which can be smaller than the CSS width due to borders. If we send that back to
         // Python and set width to it, we shrink by the border size repeatedly.
         const host = el.parentElement || el;
         const rect = host.getBoundingClientRect?.();
-        if (!rect) return;
+        if (!rect) return null;
         const w = Math.round(rect.width);
         const h = Math.round(rect.height);
-        const sizeForBoard = Math.floor(Math.min(w, h));
-        if (sizeForBoard > 0) {
-          setResponsiveSize(sizeForBoard);
-
-          // If the user provided an onResize handler, notify server (debounced) so
-          // Python state can reflect the resized container.
-          if (onResize) {
-            if (resizeDebounceRef.current) clearTimeout(resizeDebounceRef.current);
-            resizeDebounceRef.current = setTimeout(() => {
-              // In our demo the user resizes horizontally, so use width as the canonical size.
-              if (lastSentSizeRef.current !== w) {
-                lastSentSizeRef.current = w;
-                onResize({ size: w });
-              }
-            }, 120);
-          }
+        const size = Math.floor(Math.min(w, h));
+        return size > 0 ? { w, size } : null;
+      };
+
+      const settle = (w) => {
+        // One remount per resize gesture, plus the (optional) server notification.
+        setRemountEpoch((n) => n + 1);
+        // In our demo the user resizes horizontally, so use width as the canonical size.
+        if (onResizeRef.current && lastSentSizeRef.current !== w) {
+          lastSentSizeRef.current = w;
+          onResizeRef.current({ size: w });
         }
       };
 
-      update();
+      // At most one measurement per frame, however often the observer fires.
+      const onFrame = () => {
+        resizeFrameRef.current = null;
+        const m = measure();
+        if (!m || m.size === measured) return;
+        measured = m.size;
+        setLiveSize(m.size);
+        if (resizeSettleRef.current) clearTimeout(resizeSettleRef.current);
+        resizeSettleRef.current = setTimeout(() => settle(m.w), settleMs);
+      };
+      const schedule = () => {
+        if (resizeFrameRef.current === null) resizeFrameRef.current = requestAnimationFrame(onFrame);
+      };
+
+      // Initial size: no remount, but tell the server like before.
+      const first = measure();
+      if (first) {
+        measured = first.size;
+        setLiveSize(first.size);
+        if (onResizeRef.current) {
+          lastSentSizeRef.current = first.w;
+          onResizeRef.current({ size: first.w });
+        }
+      }
+
+      const cleanup = () => {
+        if (resizeFrameRef.current !== null) cancelAnimationFrame(resizeFrameRef.current);
+        resizeFrameRef.current = null;
+        if (resizeSettleRef.current) clearTimeout(resizeSettleRef.current);
+      };
 
       // Prefer ResizeObserver when available.
       if (typeof ResizeObserver !== "undefined") {
-        const ro = new ResizeObserver(() => update());
+        const ro = new ResizeObserver(schedule);
         ro.observe(el);
         return () => {
           ro.disconnect();
-          if (resizeDebounceRef.current) clearTimeout(resizeDebounceRef.current);
+          cleanup();
         };
       }
 
-      window.addEventListener("resize", update);
+      window.addEventListener("resize", schedule);
       return () => {
-        window.removeEventListener("resize", update);
-        if (resizeDebounceRef.current) clearTimeout(resizeDebounceRef.current);
+        window.removeEventListener("resize", schedule);
+        cleanup();
       };
       // eslint-disable-next-line react-hooks/exhaustive-deps
-    }, [options]);
+    }, [responsive]);
 
     function inferPromotion(sourceSquare, targetSquare) {
+      syncChess();
       try {
         const moving = chessRef.current?.get?.(sourceSquare);
         const isPawn = moving?.type === "p";
@@ -194,6 +575,7 @@ const ReflexChessboardShim = ClientSide(async () => {
     }
 
     function applyMove(from, to, pieceTypeForPayload) {
+      syncChess();
       const promotion = inferPromotion(from, to);
       let result = null;
       try {
@@ -215,6 +597,12 @@ const ReflexChessboardShim = ClientSide(async () => {
       if (!result) return { ok: false };
 
       const newFen = chessRef.current.fen();
+      chessFenRef.current = newFen;
+      localFenRef.current = newFen;
+      // Remember it so the server's echo of this move doesn't reload chess.js.
+      const seq = ++moveSeqRef.current;
+      pendingMovesRef.current.push({ seq, key: reflexChessFenKey(newFen) });
+      if (pendingMovesRef.current.length > 32) pendingMovesRef.current.shift();
       setLocalFen(newFen);
       setSelectedSquare(null);
       setLastMove({ from, to });
@@ -227,6 +615,7 @@ const ReflexChessboardShim = ClientSide(async () => {
           promotion: promotion ?? null,
           fen: newFen,
           san: result.san ?? null,
+          seq,
         });
       }
 
@@ -269,6 +658,7 @@ const ReflexChessboardShim = ClientSide(async () => {
     }
 
     function squareHasPiece(square) {
+      syncChess();
       try {
         return !!chessRef.current?.get?.(square);
       } catch (_e) {
@@ -300,20 +690,14 @@ const ReflexChessboardShim = ClientSide(async () => {
     // Click-to-move (client-side) using chess.js for instant validation.
     // NOTE: In some DnD setups, `click` can be swallowed; we also wire `onSquareMouseDown`.
     const onSquareClick = useCallback((arg) => {
-      const enableClickToMove = (options && options.enableClickToMove !== undefined)
-        ? !!options.enableClickToMove
-        : true;
       if (!enableClickToMove) return;
 
       const square = normalizeClickedSquare(arg, null);
       const pieceFromEvent = (typeof arg === "object" && arg) ? (arg.piece ?? null) : null;
       handleClickToMove(square, pieceFromEvent);
-    }, [options, selectedSquare]);
+    }, [enableClickToMove, selectedSquare]);
 
     const onSquareMouseDown = useCallback((arg, e) => {
-      const enableClickToMove = (options && options.enableClickToMove !== undefined)
-        ? !!options.enableClickToMove
-        : true;
       if (!enableClickToMove) return;
       // Only left button.
       if (e && e.button !== undefined && e.button !== 0) return;
@@ -321,19 +705,16 @@ const ReflexChessboardShim = ClientSide(async () => {
       const square = normalizeClickedSquare(arg, null);
       const pieceFromEvent = (typeof arg === "object" && arg) ? (arg.piece ?? null) : null;
       handleClickToMove(square, pieceFromEvent);
-    }, [options, selectedSquare]);
+    }, [enableClickToMove, selectedSquare]);
 
     const onPieceClick = useCallback((args) => {
       // react-chessboard calls onPieceClick({ isSparePiece, piece: { pieceType }, square })
-      const enableClickToMove = (options && options.enableClickToMove !== undefined)
-        ? !!options.enableClickToMove
-        : true;
       if (!enableClickToMove) return;
 
       const sq = normalizeClickedSquare(args, null);
       if (!sq) return;
       handleClickToMove(sq, true);
-    }, [options, selectedSquare]);
+    }, [enableClickToMove, selectedSquare]);
 
     const onArrowsChangeInternal = useCallback((args) => {
       if (!onArrowsChange) return;
@@ -345,56 +726,8 @@ const ReflexChessboardShim = ClientSide(async () => {
       onArrowsChange({ arrows });
     }, [onArrowsChange]);
 
-    function makeUnicodePieces() {
-      const map = {
-        wK: "♔", wQ: "♕", wR: "♖", wB: "♗", wN: "♘", wP: "♙",
-        bK: "♚", bQ: "♛", bR: "♜", bB: "♝", bN: "♞", bP: "♟",
-      };
-      const mk = (key) => (props) => {
-        const ch = map[key] || "?";
-        // Text outline for readability on different square colors.
-        const style = {
-          width: "100%",
-          height: "100%",
-          display: "flex",
-          alignItems: "center",
-          justifyContent: "center",
-          lineHeight: 1,
-          fontSize: "34px",
-          userSelect: "none",
-          // mimic outline similar to SVG pieces
-          textShadow: "0 0 2px rgba(0,0,0,0.85)",
-          ...(props?.svgStyle || {}),
-        };
-        return jsx("div", { style, children: ch });
-      };
-      return {
-        wK: mk("wK"), wQ: mk("wQ"), wR: mk("wR"), wB: mk("wB"), wN: mk("wN"), wP: mk("wP"),
-        bK: mk("bK"), bQ: mk("bQ"), bR: mk("bR"), bB: mk("bB"), bN: mk("bN"), bP: mk("bP"),
-      };
-    }
-
-    function makeSvgAssetPieces(baseUrl, setName) {
-      const pieceKeys = ["wK","wQ","wR","wB","wN","wP","bK","bQ","bR","bB","bN","bP"];
-      const normalizeBase = (baseUrl || "/pieces").replace(/\/+$/, "");
-      const normalizeSet = String(setName || "").replace(/^\/+|\/+$/g, "");
-      const mk = (key) => (props) => {
-        const src = `${normalizeBase}/${normalizeSet}/${key}.svg`;
-        const style = {
-          width: "100%",
-          height: "100%",
-          display: "block",
-          userSelect: "none",
-          ...(props?.svgStyle || {}),
-        };
-        return jsx("img", { src, style, draggable: false, alt: key });
-      };
-      const out = {};
-      for (const k of pieceKeys) out[k] = mk(k);
-      return out;
-    }
-
-    const mergedOptions = useMemo(() => {
+    // Static config (theme, piece set, size): re-runs only when `options` changes.
+    const baseOptions = useMemo(() => {
       const id = (options && options.id) ? options.id : `reflex-chessboard-${reactId}`;
       const boardTheme = options?.boardTheme ?? "default";
       const pieceSetRaw = options?.pieceSet ?? "merida";
@@ -404,8 +737,7 @@ const ReflexChessboardShim = ClientSide(async () => {
       const piecesBaseUrl = options?.piecesBaseUrl ?? (isAssetPieceSet ? "/external/reflex_chessboard/pieces" : "/pieces");
       const pieceSet = isAssetPieceSet ? pieceSetRaw.slice("assets/".length) : pieceSetRaw;
       let boardSize = options?.boardSize; // number(px) or string (e.g. "420px")
-      const responsive = !!options?.responsive;
-      // In responsive mode we size via container; we only use responsiveSize to force a remount (see `boardKey`).
+      // In responsive mode the size comes from the container (`liveSize`, applied per move layer).
       if (responsive) {
         boardSize = undefined;
       }
@@ -420,17 +752,21 @@ const ReflexChessboardShim = ClientSide(async () => {
       }
 
       // Piece set defaults.
-      if (pieceSet === "unicode") {
-        themeDefaults.pieces = makeUnicodePieces();
+      const bundle = pieceBundleUrl ? reflexChessPieceBundles.get(pieceBundleUrl) : undefined;
+      if (pieceBundleUrl && !bundle?.failed) {
+        // Blank squares for the moment the (usually cached) bundle is loading.
+        themeDefaults.pieces = bundle?.pieces || reflexChessBlankPieces;
+      } else if (pieceSet === "unicode") {
+        themeDefaults.pieces = reflexChessPieces("unicode");
       } else if (isAssetPieceSet && pieceSet) {
         // Load from app static assets, e.g. /pieces/merida/wK.svg
-        themeDefaults.pieces = makeSvgAssetPieces(piecesBaseUrl, pieceSet);
+        themeDefaults.pieces = reflexChessPieces(pieceSet, piecesBaseUrl);
       } else if (defaultPieces) {
         // "merida" / default: use library-provided SVG set (also avoids licensing issues on our side).
         themeDefaults.pieces = defaultPieces;
       }
 
-      const themedOptions = { ...themeDefaults, ...(options || {}) };
+      const themedOptions = { ...themeDefaults, ...(options || {}), id };
       // Optional fixed size control: set boardStyle width/height (board is 100% by default).
       if (boardSize !== undefined && boardSize !== null) {
         const sizeValue = (typeof boardSize === "number") ? `${boardSize}px` : `${boardSize}`;
@@ -440,11 +776,62 @@ const ReflexChessboardShim = ClientSide(async () => {
           height: sizeValue,
         };
       }
-      const baseSquareStyles = (options && options.squareStyles) ? options.squareStyles : {};
-      const enableBuiltInHighlights = (options && options.enableBuiltInHighlights !== undefined)
-        ? !!options.enableBuiltInHighlights
+      return themedOptions;
+    }, [options, reactId, pieceBundleUrl, pieceBundleTick]);
+
+    useEffect(() => {
+      if (!pieceBundleUrl) return;
+      const entry = reflexChessLoadPieceBundle(pieceBundleUrl);
+      if (entry.pieces || entry.failed) return;
+      let alive = true;
+      entry.promise.then(() => {
+        if (alive) setPieceBundleTick((n) => n + 1);
+      });
+      return () => {
+        alive = false;
+      };
+    }, [pieceBundleUrl]);
+
+    // Optional LRU of parsed positions (`options.positionCacheSize`, default 0 = off): back/forward
+    // over the same positions hands react-chessboard a ready position object instead of a FEN.
+    const positionCacheSize = (typeof options?.positionCacheSize === "number") ? options.positionCacheSize : 0;
+    function boardPosition(fenStr) {
+      if (positionCacheSize <= 0 || typeof fenToPosition !== "function") return fenStr;
+      const cache = positionCacheRef.current;
+      const key = String(fenStr).split(" ")[0];
+      let pos = cache.get(key);
+      if (pos !== undefined) {
+        cache.delete(key);
+        cache.set(key, pos);
+        return pos;
+      }
+      try {
+        pos = fenToPosition(fenStr, 8, 8);
+      } catch (_e) {
+        return fenStr;
+      }
+      cache.set(key, pos);
+      while (cache.size > positionCacheSize) cache.delete(cache.keys().next().value);
+      return pos;
+    }
+
+    // Per-move decorations: props + nav shapes + built-in highlights, merged on top of `baseOptions`.
+    const mergedOptions = useMemo(() => {
+      // Client-side navigation: annotation shapes of the current node go on top of the props.
+      const navShapes = (navEnabled && navIdx >= 0) ? (nav.shapes?.[String(navIdx)] || null) : null;
+      const allArrows = [
+        ...(baseOptions.arrows || []),
+        ...(arrowsProp || []),
+        ...((navShapes && navShapes.arrows) || []),
+      ];
+      const highlightStyles = {
+        ...(baseOptions.squareStyles || {}),
+        ...(squareStylesProp || {}),
+        ...((navShapes && navShapes.squareStyles) || {}),
+      };
+      const enableBuiltInHighlights = (baseOptions.enableBuiltInHighlights !== undefined)
+        ? !!baseOptions.enableBuiltInHighlights
         : true;
-      const highlightStyles = { ...baseSquareStyles };
 
       if (enableBuiltInHighlights) {
         // Highlight selected square.
@@ -470,24 +857,31 @@ const ReflexChessboardShim = ClientSide(async () => {
         }
       }
 
+      // Responsive: follow the container in place (no remount while resizing).
+      const boardStyle = (responsive && liveSize)
+        ? { ...(baseOptions.boardStyle || {}), width: `${liveSize}px`, height: `${liveSize}px` }
+        : baseOptions.boardStyle;
+
       return {
-        ...themedOptions,
-        id,
+        ...baseOptions,
+        boardStyle,
         // react-chessboard expects a FEN string or position object; avoid "start" sentinel.
-        position: (localFen === "start") ? (startFenRef.current || localFen) : localFen,
+        position: boardPosition((localFen === "start") ? (startFenRef.current || localFen) : localFen),
         onPieceDrop: onPieceDrop,
         onSquareClick: onSquareClick,
         onSquareMouseDown: onSquareMouseDown,
         onPieceClick: onPieceClick,
+        arrows: allArrows,
         squareStyles: highlightStyles,
         onArrowsChange: onArrowsChangeInternal,
       };
-    }, [options, localFen, reactId, selectedSquare, lastMove, onSquareClick, onSquareMouseDown, onPieceClick, onArrowsChangeInternal, responsiveSize]);
+    }, [baseOptions, responsive, liveSize, arrowsProp, squareStylesProp, localFen, positionCacheSize, selectedSquare, lastMove, onSquareClick, onSquareMouseDown, onPieceClick, onArrowsChangeInternal, nav, navIdx]);
 
     // IMPORTANT: react-chessboard's drag math relies on measured board dimensions.
-    // On resize, it may keep stale measurements; remounting forces a fresh measurement.
-    const boardKey = (options && options.responsive)
-      ? `${mergedOptions.id}-${responsiveSize || 0}`
+    // On resize, it may keep stale measurements; remounting forces a fresh measurement,
+    // but only once the resize has settled (see `remountEpoch`), not on every frame.
+    const boardKey = responsive
+      ? `${mergedOptions.id}-${remountEpoch}`
       : mergedOptions.id;
 
     return jsx("div", {
@@ -0,0 +1,370 @@
+"""Build-time processing of the built-in SVG piece sets.
+
+- `optimize_svg`: strips editor metadata and rounds coordinates; the package
+  build (`setup.py`) runs it over `pieces/*/*.svg` in the wheel and writes
+  `.svg.gz` / `.svg.br` siblings (`build_piece_assets`; `.br` needs `brotli`).
+- `manifest.json` (written by the same build step) lists every set, file and
+  content digest, so app startup reads one file instead of walking the package.
+- A bundle is one JSON file per set, `{"wK": "data:image/svg+xml,...", ...}`,
+  named after its content hash (`<set>.<hash>.json`) so it can be cached
+  forever: a board using it paints all twelve pieces after a single request.
+
+    python -m reflex_chessboard.piece_assets bundle [out_dir]
+    python -m reflex_chessboard.piece_assets build <pieces_dir>
+    python -m reflex_chessboard.piece_assets report
+
+`bundle` defaults to the app's shared assets directory, where
+`register_builtin_piece_assets(bundles=True)` puts the bundles too; `report`
+prints per-set sizes (as authored / optimized / gzip / brotli).
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import shutil
+import tempfile
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cache
+from importlib import resources
+from pathlib import Path
+from urllib.parse import quote
+
+try:
+    import brotli
+except ImportError:  # optional: only `.br` siblings need it
+    brotli = None
+
+PIECE_KEYS = ("wK", "wQ", "wR", "wB", "wN", "wP", "bK", "bQ", "bR", "bB", "bN", "bP")
+PRECOMPRESSED_SUFFIXES = (".gz", ".br")
+MANIFEST_NAME = "manifest.json"
+_PIECE_FILE_SUFFIXES = (".svg", *(".svg" + s for s in PRECOMPRESSED_SUFFIXES))
+
+_XML_DECL = re.compile(r"<\?xml[^>]*\?>")
+_DOCTYPE = re.compile(r"<!DOCTYPE[^>]*>")
+_COMMENT = re.compile(r"<!--.*?-->", re.S)
+_BETWEEN_TAGS = re.compile(r">\s+<")
+# Editor / authoring data that doesn't affect rendering.
+_META_ELEMENT = re.compile(
+    r"<(metadata|title|desc|sodipodi:[\w-]+|inkscape:[\w-]+)\b[^>]*?(?:/>|>.*?</\1\s*>)",
+    re.S,
+)
+_EDITOR_ATTR = re.compile(r'\s(?:sodipodi|inkscape):[\w-]+="[^"]*"')
+# Rendering hints for content types a file may not have (`<text>`, `<image>`).
+_UNUSED_HINTS = (
+    ("<text", re.compile(r'\stext-rendering="[^"]*"')),
+    ("<image", re.compile(r'\simage-rendering="[^"]*"')),
+)
+_XMLNS_PREFIX = re.compile(r'\sxmlns:([\w-]+)="[^"]*"')
+_ATTR = re.compile(r'(\s)([\w:-]+)="([^"]*)"')
+_DECIMAL = re.compile(r"-?\d*\.\d+(?![\d.]*[eE])")
+# Attributes holding plain coordinates/lengths; transforms keep full precision
+# (their scale factors multiply any rounding error).
+_ROUNDED_ATTRS = frozenset(
+    "d points x y x1 x2 y1 y2 cx cy r rx ry fx fy width height stroke-width "
+    "offset stdDeviation opacity fill-opacity stroke-opacity stop-opacity".split()
+)
+# Characters left as is in an SVG data URI; `"`, `#`, `%`, `<`, `>` and non-ASCII are escaped.
+_URI_SAFE = " !$&'()*+,-./:;=?@[]^_`{|}~"
+
+
+@dataclass(frozen=True, slots=True)
+class PieceBundle:
+    set_name: str
+    digest: str  # first 12 hex digits of the sha256 of `data`
+    data: bytes  # UTF-8 JSON: piece key -> SVG data URI
+
+    @property
+    def filename(self) -> str:
+        return f"{self.set_name}.{self.digest}.json"
+
+
+@dataclass(frozen=True, slots=True)
+class PieceManifest:
+    """Built-in sets: set -> {file name -> `file_digest`}, set -> bundle file name."""
+
+    sets: dict[str, dict[str, str]]
+    bundles: dict[str, str]
+    from_file: bool  # False: scanned from the package directory (source checkout)
+
+    def to_json(self) -> bytes:
+        data = {"version": 1, "sets": self.sets, "bundles": self.bundles}
+        return json.dumps(data, indent=1, sort_keys=True).encode("utf-8")
+
+
+def builtin_pieces_dir() -> Path:
+    """On-disk directory holding the built-in sets (`pieces/<set>/<wK|...>.svg`)."""
+    return Path(str(resources.files("reflex_chessboard").joinpath("pieces")))
+
+
+def check_piece_sets(sets: Iterable[str], available: Iterable[str]) -> list[str]:
+    """Sorted `sets`; ValueError naming the ones that are not built in."""
+    wanted = set(sets)
+    known = set(available)
+    unknown = sorted(wanted - known)
+    if unknown:
+        raise ValueError(
+            "Unknown built-in piece set(s): "
+            + ", ".join(unknown)
+            + ". Available: "
+            + ", ".join(sorted(known))
+        )
+    return sorted(wanted)
+
+
+@dataclass(frozen=True, slots=True)
+class PieceSetSize:
+    """Byte totals of a set's twelve SVGs (`brotli` is None without the module)."""
+
+    set_name: str
+    files: int
+    authored: int
+    optimized: int
+    gzip: int
+    brotli: int | None
+
+
+def minify_svg(text: str) -> str:
+    """Drop the XML declaration, comments and whitespace between tags."""
+    text = _COMMENT.sub("", _XML_DECL.sub("", text))
+    return _BETWEEN_TAGS.sub("><", text).strip()
+
+
+def optimize_svg(text: str, *, precision: int = 3) -> str:
+    """`minify_svg` + no editor metadata or unused rendering hints + coordinates
+    rounded to `precision` decimals.
+
+    Idempotent, so already optimized files (the wheel) give the same output
+    (and the same bundle hash) as the sources.
+    """
+    text = _META_ELEMENT.sub("", _DOCTYPE.sub("", minify_svg(text)))
+    text = _EDITOR_ATTR.sub("", text)
+    for element, hint in _UNUSED_HINTS:
+        if element not in text:
+            text = hint.sub("", text)
+    text = _XMLNS_PREFIX.sub(
+        lambda m: m.group(0) if f"{m.group(1)}:" in text else "", text
+    )
+
+    def round_number(m: re.Match[str]) -> str:
+        num = m.group(0)
+        if len(num) - num.index(".") - 1 <= precision:
+            return num
+        out = f"{round(float(num), precision):.{precision}f}".rstrip("0").rstrip(".")
+        if "0." not in num and out.lstrip("-").startswith("0."):
+            out = out.replace("0.", ".", 1)  # keep the source's `.5` style
+        if "." not in out and m.string[m.end() : m.end() + 1] == ".":
+            out += " "  # `1.9999.5` -> `2 .5`, not `2.5`
+        return out
+
+    def round_attr(m: re.Match[str]) -> str:
+        if m.group(2) not in _ROUNDED_ATTRS:
+            return m.group(0)
+        return f'{m.group(1)}{m.group(2)}="{_DECIMAL.sub(round_number, m.group(3))}"'
+
+    return _BETWEEN_TAGS.sub("><", _ATTR.sub(round_attr, text)).strip()
+
+
+def svg_data_uri(svg: str) -> str:
+    """Percent-encoded `data:image/svg+xml` URI (smaller than base64 for SVG)."""
+    if "'" not in svg:
+        svg = svg.replace('"', "'")  # `'` needs no escaping
+    return "data:image/svg+xml," + quote(svg, safe=_URI_SAFE)
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def scan_piece_manifest(
+    pieces_dir: str | Path, *, with_bundles: bool = False
+) -> PieceManifest:
+    """Manifest of a pieces tree, from its directories and file contents.
+
+    Bundle names cost a full optimize pass, so they are only listed `with_bundles`.
+    """
+    sets: dict[str, dict[str, str]] = {}
+    bundles: dict[str, str] = {}
+    for set_dir in sorted(p for p in Path(pieces_dir).iterdir() if p.is_dir()):
+        sets[set_dir.name] = {
+            f.name: file_digest(f)
+            for f in sorted(set_dir.iterdir())
+            if f.is_file() and f.name.lower().endswith(_PIECE_FILE_SUFFIXES)
+        }
+        if with_bundles and all(f"{k}.svg" in sets[set_dir.name] for k in PIECE_KEYS):
+            bundles[set_dir.name] = _bundle_from_dir(set_dir).filename
+    return PieceManifest(sets=sets, bundles=bundles, from_file=False)
+
+
+@cache
+def load_piece_manifest() -> PieceManifest:
+    """The built-in sets' manifest, read once per process.
+
+    Built wheels ship `pieces/manifest.json`; a source checkout has none and
+    is scanned instead (no bundle names: those are computed on demand).
+    """
+    path = builtin_pieces_dir() / MANIFEST_NAME
+    if path.is_file():
+        data = json.loads(path.read_bytes())
+        return PieceManifest(sets=data["sets"], bundles=data["bundles"], from_file=True)
+    return scan_piece_manifest(builtin_pieces_dir())
+
+
+@cache
+def build_piece_bundle(set_name: str) -> PieceBundle:
+    """Bundle of a built-in set. Package files don't change at runtime, so it is memoized."""
+    set_dir = builtin_pieces_dir() / set_name
+    if not set_dir.is_dir():
+        check_piece_sets([set_name], load_piece_manifest().sets)
+    return _bundle_from_dir(set_dir)
+
+
+def _bundle_from_dir(set_dir: Path) -> PieceBundle:
+    set_name = set_dir.name
+    pieces: dict[str, str] = {}
+    for key in PIECE_KEYS:
+        svg = set_dir / f"{key}.svg"
+        if not svg.is_file():
+            raise FileNotFoundError(
+                f"Built-in piece set {set_name!r} is missing {svg.name}"
+            )
+        pieces[key] = svg_data_uri(optimize_svg(svg.read_text(encoding="utf-8")))
+    data = json.dumps(pieces, separators=(",", ":")).encode("utf-8")
+    return PieceBundle(
+        set_name=set_name, digest=hashlib.sha256(data).hexdigest()[:12], data=data
+    )
+
+
+def write_piece_bundles(out_dir: str | Path, sets: Iterable[str]) -> list[Path]:
+    """Write `<set>.<hash>.json` for each set into `out_dir`.
+
+    Files already present are left alone: the name is the content hash.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    written: list[Path] = []
+    for set_name in sets:
+        bundle = build_piece_bundle(set_name)
+        path = out / bundle.filename
+        if not path.is_file():
+            path.write_bytes(bundle.data)
+        written.append(path)
+    return written
+
+
+def build_piece_assets(
+    pieces_dir: str | Path, *, precision: int = 3
+) -> list[PieceSetSize]:
+    """Optimize `pieces_dir/<set>/*.svg` in place and write `.gz` / `.br` siblings.
+
+    Meant for a build tree (the wheel's copy), not the sources. Files are only
+    rewritten when their content changes; gzip output is reproducible (mtime 0).
+    """
+    sizes: list[PieceSetSize] = []
+    for set_dir in sorted(p for p in Path(pieces_dir).iterdir() if p.is_dir()):
+        files = authored = optimized = gz_total = br_total = 0
+        for svg in sorted(set_dir.glob("*.svg")):
+            raw = svg.read_bytes()
+            data = optimize_svg(raw.decode("utf-8"), precision=precision).encode(
+                "utf-8"
+            )
+            _write_if_changed(svg, data)
+            gz = gzip.compress(data, compresslevel=9, mtime=0)
+            _write_if_changed(svg.with_name(svg.name + ".gz"), gz)
+            if brotli is not None:
+                br = brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+                _write_if_changed(svg.with_name(svg.name + ".br"), br)
+                br_total += len(br)
+            files += 1
+            authored += len(raw)
+            optimized += len(data)
+            gz_total += len(gz)
+        sizes.append(
+            PieceSetSize(
+                set_name=set_dir.name,
+                files=files,
+                authored=authored,
+                optimized=optimized,
+                gzip=gz_total,
+                brotli=br_total if brotli is not None else None,
+            )
+        )
+    return sizes
+
+
+def piece_size_report(sizes: Iterable[PieceSetSize]) -> str:
+    """Plain-text table of `build_piece_assets` results."""
+    rows = [("set", "files", "authored", "optimized", "gzip", "brotli")]
+    for s in sizes:
+        br = "-" if s.brotli is None else f"{s.brotli} ({s.brotli / s.authored:.0%})"
+        rows.append(
+            (
+                s.set_name,
+                str(s.files),
+                str(s.authored),
+                f"{s.optimized} ({s.optimized / s.authored:.0%})",
+                f"{s.gzip} ({s.gzip / s.authored:.0%})",
+                br,
+            )
+        )
+    widths = [max(len(r[i]) for r in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(
+            c.ljust(w) if i == 0 else c.rjust(w)
+            for i, (c, w) in enumerate(zip(r, widths, strict=True))
+        )
+        for r in rows
+    )
+
+
+def write_piece_manifest(pieces_dir: str | Path) -> Path:
+    """Write `manifest.json` for a (built) pieces tree; run after `build_piece_assets`."""
+    path = Path(pieces_dir) / MANIFEST_NAME
+    _write_if_changed(
+        path, scan_piece_manifest(pieces_dir, with_bundles=True).to_json()
+    )
+    return path
+
+
+def _write_if_changed(path: Path, data: bytes) -> None:
+    if not path.is_file() or path.read_bytes() != data:
+        path.write_bytes(data)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m reflex_chessboard.piece_assets")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_bundle = sub.add_parser("bundle", help="write <set>.<hash>.json bundles")
+    p_bundle.add_argument(
+        "out_dir",
+        nargs="?",
+        default=Path.cwd() / "assets" / "external" / "reflex_chessboard" / "pieces",
+    )
+    p_build = sub.add_parser(
+        "build",
+        help="optimize SVGs in place + .gz/.br siblings + manifest (build trees only)",
+    )
+    p_build.add_argument("pieces_dir")
+    sub.add_parser("report", help="size report of the built-in sets (nothing written)")
+    args = parser.parse_args(argv)
+
+    if args.command == "bundle":
+        sets = sorted(p.name for p in builtin_pieces_dir().iterdir() if p.is_dir())
+        for path in write_piece_bundles(args.out_dir, sets):
+            print(f"{path}  {path.stat().st_size} bytes")
+    elif args.command == "build":
+        print(piece_size_report(build_piece_assets(args.pieces_dir)))
+        write_piece_manifest(args.pieces_dir)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            shutil.copytree(builtin_pieces_dir(), tmp, dirs_exist_ok=True)
+            print(piece_size_report(build_piece_assets(tmp)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+"""Build hook: optimize and precompress the built-in piece SVGs in the wheel
+and write their manifest (`pieces/manifest.json`).
+
+Project metadata lives in pyproject.toml; this only extends `build_py`.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+from setuptools import setup
+from setuptools.command.build_py import build_py
+
+
+def _piece_assets():
+    # Load the module by path: importing the package would pull in reflex.
+    path = (
+        Path(__file__).parent
+        / "custom_components"
+        / "reflex_chessboard"
+        / "piece_assets.py"
+    )
+    spec = importlib.util.spec_from_file_location(
+        "_reflex_chessboard_piece_assets", path
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses look the module up while decorating
+    spec.loader.exec_module(module)
+    return module
+
+
+class BuildPyWithPieceAssets(build_py):
+    def run(self) -> None:
+        super().run()
+        if self.editable_mode:
+            return  # never rewrite the source tree
+        pieces = Path(self.build_lib) / "reflex_chessboard" / "pieces"
+        if pieces.is_dir():
+            assets = _piece_assets()
+            print(assets.piece_size_report(assets.build_piece_assets(pieces)))
+            assets.write_piece_manifest(pieces)
+
+
+setup(cmdclass={"build_py": BuildPyWithPieceAssets})
@@ -1,4 +1,10 @@
+import json
 import os
+import re
+import shutil
+import subprocess
+
+import pytest
 
 
 def test_package_imports_and_component_contract():
@@ -30,6 +36,119 @@ def test_component_exposes_optional_events():
     assert hasattr(Chessboard, "on_resize")
 
 
+def test_decorations_are_separate_props():
+    os.environ["REFLEX_BACKEND_ONLY"] = "1"
+
+    from reflex_chessboard import chessboard
+
+    board = chessboard(
+        options={"boardTheme": "gray"},
+        arrows=[{"startSquare": "e2", "endSquare": "e4", "color": "green"}],
+        square_styles={"e4": {"backgroundColor": "red"}},
+        last_move={"from": "e2", "to": "e4"},
+    )
+    props = " ".join(board.render()["props"])
+    for name in ("options:", "arrows:", "squareStyles:", "lastMove:"):
+        assert name in props
+
+
+def test_shim_skips_reloading_echoed_positions():
+    os.environ["REFLEX_BACKEND_ONLY"] = "1"
+
+    from reflex_chessboard import Chessboard
+
+    code = Chessboard._get_custom_code(Chessboard)
+    assert "function reflexChessFenKey(" in code
+    assert "pendingMovesRef" in code
+    assert "positionCacheSize" in code
+
+
+def _run_shim(names, script):
+    """Run `script` under node with the named module-level shim functions defined."""
+    os.environ["REFLEX_BACKEND_ONLY"] = "1"
+
+    from reflex_chessboard import Chessboard
+
+    code = Chessboard._get_custom_code(Chessboard)
+    helpers = "\n".join(
+        re.search(rf"^function {name}\(.*?^}}$", code, re.S | re.M).group(0) for name in names
+    )
+    out = subprocess.run(["node", "-e", helpers + "\n" + script], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+A = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+B = "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2"
+OTHER = "8/8/8/8/8/8/8/K6k w - - 0 1"
+
+# The user played A (seq 1) then B (seq 2); the server then sends each (fen, ack) in turn.
+_REPLAY = """
+const k = reflexChessFenKey;
+const replay = (updates) => {
+  let pending = [{ seq: 1, key: k(A) }, { seq: 2, key: k(B) }];
+  let local = B;
+  return updates.map(([fen, ack]) => {
+    const r = reflexChessResolveEcho(pending, k(fen), k(local), ack);
+    pending = r.pending;
+    if (r.reload) local = fen;
+    return [r.reload, pending.length];
+  });
+};
+"""
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+@pytest.mark.parametrize(
+    ("updates", "expected"),
+    [
+        # In-order echoes of both moves: no reload, no bounce back to A.
+        ([(A, None), (B, None)], [[False, 1], [False, 0]]),
+        ([(A, 1), (B, 2)], [[False, 1], [False, 0]]),
+        # Only the last echo arrives (the server batched both moves).
+        ([(B.replace(" 0 2", " 5 9"), None)], [[False, 0]]),
+        # B rejected: the ack says the server handled it and still shows A.
+        ([(A, 1), (A, 2)], [[False, 1], [True, 0]]),
+        # A position that is not ours: reload and forget the pending moves.
+        ([(OTHER, None)], [[True, 0]]),
+        ([(OTHER, 1)], [[True, 0]]),
+    ],
+)
+def test_shim_resolves_echoes_of_pending_moves(updates, expected):
+    script = f"const A = {json.dumps(A)}, B = {json.dumps(B)};" + _REPLAY
+    script += f"console.log(JSON.stringify(replay({json.dumps(updates)})));"
+    assert _run_shim(("reflexChessFenKey", "reflexChessResolveEcho"), script) == expected
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+def test_shim_ignores_stale_echoes_of_local_selections():
+    # Clicks on A then B in the notation; the server echoes A, then B, then selects C itself.
+    script = """
+    let pending = [];
+    let shown = "B";
+    const log = [];
+    for (const id of ["A", "B"]) pending.push(id);
+    for (const id of ["A", "B", "C"]) {
+      const r = reflexChessResolveSelection(pending, id);
+      pending = r.pending;
+      if (!r.echo) shown = id;
+      log.push([id, shown, pending.length]);
+    }
+    console.log(JSON.stringify(log));
+    """
+    assert _run_shim(("reflexChessResolveSelection",), script) == [["A", "B", 1], ["B", "B", 0], ["C", "C", 0]]
+
+
+def test_piece_renderers_are_shared_at_module_level():
+    os.environ["REFLEX_BACKEND_ONLY"] = "1"
+
+    from reflex_chessboard import Chessboard
+
+    code = Chessboard._get_custom_code(Chessboard)
+    shim = code.index("const ReflexChessboardShim")
+    assert -1 < code.index("const reflexChessPieceMaps = new Map();") < shim
+    assert "makeUnicodePieces" not in code
+
+
 def test_builtin_piece_sets_api():
     os.environ["REFLEX_BACKEND_ONLY"] = "1"
 
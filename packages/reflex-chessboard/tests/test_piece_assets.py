@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+
+def test_piece_bundle_is_content_hashed_data_uris(tmp_path):
+    os.environ["REFLEX_BACKEND_ONLY"] = "1"
+
+    from reflex_chessboard import builtin_piece_options, write_piece_bundles
+    from reflex_chessboard.piece_assets import PIECE_KEYS, build_piece_bundle
+
+    bundle = build_piece_bundle("merida")
+    pieces = json.loads(bundle.data)
+    assert tuple(pieces) == PIECE_KEYS
+    assert all(uri.startswith("data:image/svg+xml,%3Csvg") for uri in pieces.values())
+    assert (
+        bundle.filename == f"merida.{hashlib.sha256(bundle.data).hexdigest()[:12]}.json"
+    )
+
+    (path,) = write_piece_bundles(tmp_path, ["merida"])
+    assert path.name == bundle.filename and path.read_bytes() == bundle.data
+    assert write_piece_bundles(tmp_path, ["merida"]) == [path]
+
+    options = builtin_piece_options("merida", bundle=True)
+    assert options["pieceBundleUrl"].endswith("/" + bundle.filename)
+    assert "pieceBundleUrl" not in builtin_piece_options("merida")
+
+
+def test_piece_bundle_rejects_unknown_sets():
+    os.environ["REFLEX_BACKEND_ONLY"] = "1"
+
+    from reflex_chessboard.piece_assets import build_piece_bundle
+
+    with pytest.raises(ValueError, match="Unknown built-in piece set"):
+        build_piece_bundle("nope")
+
+
+def test_optimize_svg_strips_metadata_and_is_idempotent():
+    os.environ["REFLEX_BACKEND_ONLY"] = "1"
+
+    from reflex_chessboard.piece_assets import optimize_svg
+
+    src = (
+        '<?xml version="1.0"?>\n<!-- editor -->\n'
+        '<svg xmlns="http://www.w3.org/2000/svg" xmlns:inkscape="http://i" '
+        'text-rendering="geometricPrecision" inkscape:version="1">\n'
+        "  <metadata><rdf:RDF/></metadata>\n"
+        '  <path d="M1.99999.5L3.123456-.123456z" transform="matrix(1.23456 0 0 1 0 0)"/>\n'
+        "</svg>"
+    )
+    out = optimize_svg(src)
+    assert out == (
+        '<svg xmlns="http://www.w3.org/2000/svg">'
+        '<path d="M2 .5L3.123-.123z" transform="matrix(1.23456 0 0 1 0 0)"/></svg>'
+    )
+    assert optimize_svg(out) == out
+
+
+def test_build_piece_assets_writes_precompressed_siblings(tmp_path):
+    os.environ["REFLEX_BACKEND_ONLY"] = "1"
+
+    import gzip
+    import shutil
+
+    from reflex_chessboard.piece_assets import (
+        build_piece_assets,
+        builtin_pieces_dir,
+        piece_size_report,
+    )
+
+    shutil.copytree(builtin_pieces_dir() / "cburnett", tmp_path / "cburnett")
+    (size,) = build_piece_assets(tmp_path)
+    svg = tmp_path / "cburnett" / "wK.svg"
+    assert (
+        gzip.decompress((tmp_path / "cburnett" / "wK.svg.gz").read_bytes())
+        == svg.read_bytes()
+    )
+    assert (size.set_name, size.files) == ("cburnett", 12)
+    assert size.gzip < size.optimized <= size.authored
+    assert "cburnett" in piece_size_report([size])
+
+
+def test_manifest_lists_sets_files_and_bundles(tmp_path):
+    os.environ["REFLEX_BACKEND_ONLY"] = "1"
+
+    import shutil
+
+    from reflex_chessboard import list_builtin_piece_sets
+    from reflex_chessboard.piece_assets import (
+        build_piece_bundle,
+        builtin_pieces_dir,
+        file_digest,
+        load_piece_manifest,
+        write_piece_manifest,
+    )
+
+    assert list_builtin_piece_sets() == sorted(load_piece_manifest().sets)
+
+    shutil.copytree(builtin_pieces_dir() / "merida", tmp_path / "merida")
+    data = json.loads(write_piece_manifest(tmp_path).read_bytes())
+    files = data["sets"]["merida"]
+    assert len(files) == 12
+    assert files["wK.svg"] == file_digest(tmp_path / "merida" / "wK.svg")
+    assert data["bundles"] == {"merida": build_piece_bundle("merida").filename}
+
+
+def test_registration_skips_files_the_app_already_has(tmp_path):
+    os.environ["REFLEX_BACKEND_ONLY"] = "1"
+
+    from reflex_chessboard import _already_linked
+    from reflex_chessboard.piece_assets import builtin_pieces_dir, file_digest
+
+    src = builtin_pieces_dir() / "merida" / "wK.svg"
+    digest = file_digest(src)
+    link, copy = tmp_path / "link.svg", tmp_path / "copy.svg"
+    link.symlink_to(src)
+    copy.write_bytes(src.read_bytes())
+    assert _already_linked(link, src, digest)
+    assert _already_linked(copy, src, digest)
+    copy.write_bytes(b"<svg/>")
+    assert not _already_linked(copy, src, digest)
+    assert not _already_linked(tmp_path / "missing.svg", src, digest)